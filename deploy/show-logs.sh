@@ -2,6 +2,7 @@ journalctl --follow -o cat  -u backend.service \
                             -u bot.service \
                             -u quiz.service \
                             -u huey.service \
+                            -u huey-cpu.service \
                             -u nginx \
                             -u ngrok.service \
                             -u redis.service \
@@ -12,7 +12,7 @@ import {
 import { handleErrors } from "./errors";
 import { toast } from "react-toastify";
 import { toastParams } from "./auth";
-import { CreateApi, DeleteApi, DetailApi, ListApi, mix, TokenMixin, UpdateApi } from './shared';
+import { CreateApi, DeleteApi, DetailApi, ListApi, mix, pollJob, TokenMixin, UpdateApi } from './shared';
 
 
 class CronsApi extends mix(CreateApi, DeleteApi, DetailApi, ListApi, TokenMixin, UpdateApi) {
@@ -43,9 +43,10 @@ class CronsApi extends mix(CreateApi, DeleteApi, DetailApi, ListApi, TokenMixin,
     dispatch(setLoading(true));
     ngrokAxios
       .put(`crons/${cronId}/run/`, {}, { headers: { Authorization: token } })
-      .then(() => {
-        toast.success(`"${cronCommand}" executed successfully!`, toastParams)
+      .then(response => {
+        toast.info(`"${cronCommand}" started`, toastParams)
         dispatch(setLoading(false))
+        pollJob(ngrokAxios, token, response.data.job_id, cronCommand)
       })
       .catch((err) => {
         if (err.response?.status === 404)
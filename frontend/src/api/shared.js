@@ -151,17 +151,41 @@ export const ListApi = Base => class extends Base {
   };
 }
 
+const JOB_POLL_INTERVAL = 2000 // ms
+const JOB_OUTPUT_LINES = 10 // shown when the job ends
+
+// Polls a queued command job until it ends - each poll only gets the output
+// written since the previous one - then shows how it ended
+export const pollJob = (client, token, jobId, item, offset = 0, output = []) =>
+  client
+    .get(`commands/jobs/${jobId}/?offset=${offset}`, { headers: { Authorization: token } })
+    .then(({ data }) => {
+      const lines = [...output, ...data.output].slice(-JOB_OUTPUT_LINES)
+      const params = { ...toastParams, style: { whiteSpace: "pre-line" } }
+      const tail = lines.length ? `\n${lines.join("\n")}` : ""
+      if (data.status === "complete")
+        return toast.success(`"${item}" completed${tail}`, params)
+      if (data.status === "error")
+        return toast.error(`"${item}" failed: ${data.error}${tail}`, params)
+      setTimeout(
+        () => pollJob(client, token, jobId, item, data.offset, lines),
+        JOB_POLL_INTERVAL,
+      )
+    })
+    .catch(() => toast.error(`Could not get the status of "${item}"`, toastParams))
+
 export const RunApi = Base => class extends Base {
   run = (id, data, verbose = null) => dispatch => {
     dispatch(this.constructor.methods.setLoading());
     const axios = getAxios("run", this.constructor.ngrokAxios)
     axios
       .put(`${this.constructor.baseUrl}/${id}/run/`, data, { headers: { Authorization: this.token } })
-      .then(() => {
+      .then(response => {
         const item = verbose || id
-        toast.success(`"${item}" executed successfully!`, toastParams)
+        toast.info(`"${item}" started`, toastParams)
         dispatch(this.constructor.methods.setLoading(false))
         dispatch(this.constructor.methods.setErrors(null))
+        pollJob(axios, this.token, response.data.job_id, item)
       })
       .catch((err) => handleErrors(err, dispatch, this.constructor.methods.setErrors, this.constructor.methods.setLoading))
   };
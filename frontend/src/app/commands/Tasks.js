@@ -73,7 +73,10 @@ const Tasks = () =>  {
                         ? results.map(
                           (task, i) => <tr
                             key={i}
-                            onClick={() => dispatch(selectItem(task.id))}
+                            onClick={() => {
+                              dispatch(selectItem(task.id))
+                              dispatch(TasksApi.getItem(token, task.name, task.id))
+                            }}
                             className="cursor-pointer"
                           >
                             <td>{i + 1}</td>
@@ -90,8 +93,8 @@ const Tasks = () =>  {
                                     {task.history[0].status ? capitalize(task.history[0].status) : "-"}
                                   </td>
                                   <td>{new Date(task.history?.[0]?.timestamp).toLocaleString()}</td>
-                                  <td>{task.history.length}</td>
-                                  <td>{task.errors?.length}</td>
+                                  <td>{task.history_count ?? task.history.length}</td>
+                                  <td>{task.errors_count ?? task.errors?.length}</td>
                                 </>
                                 : <td colSpan={4} className="text-center">Didn&apos;t run</td>
                             }
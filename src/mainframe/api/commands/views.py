@@ -1,107 +1,59 @@
-import itertools
-import logging
-import operator
-
-from django.core.exceptions import ImproperlyConfigured
-from django.core.management import (
-    BaseCommand,
-    CommandError,
-    call_command,
-    get_commands,
-    load_command_class,
-)
+from django.core.management import CommandError
 from django.http import JsonResponse
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAdminUser
 
-from mainframe.core.exceptions import MainframeError
+from mainframe.core.commands import get_command_catalog, refresh_command_catalog
+from mainframe.core.jobs import create_job, get_job
+from mainframe.core.tasks import run_command_job
 from mainframe.crons.models import Cron
 from mainframe.crons.serializers import CronSerializer
 
-logger = logging.getLogger(__name__)
-
-
-def get_custom_arguments(app_name, command_name):
-    command_class = load_command_class(app_name, command_name)
-
-    parser = command_class.create_parser("manage.py", command_name)
-
-    base_command = BaseCommand()
-    base_parser = base_command.create_parser("manage.py", "base")
-    default_options = {action.dest for action in base_parser._actions}
-
-    return [
-        {
-            "choices": o.choices,
-            "default": o.default,
-            "dest": o.dest,
-            "help": o.help,
-            "nargs": o.nargs,
-            "option_strings": o.option_strings,
-            "required": o.required,
-            "type": o.type.__name__ if o.type else None,
-        }
-        for o in parser._actions
-        if o.dest not in default_options
-    ]
-
 
 class CommandsViewSet(viewsets.GenericViewSet):
     permission_classes = (IsAdminUser,)
 
     @staticmethod
     def list(request, *args, **kwargs):
-        def filter_out(item):
-            _, app = item
-            return not (
-                app in ["debug_toolbar", "huey.contrib.djhuey", "rest_framework"]
-                or "django" in app
-            )
+        data = {"results": get_command_catalog()}
+        return JsonResponse(data=data, status=status.HTTP_200_OK)
 
-        commands = sorted(
-            filter(filter_out, get_commands().items()), key=operator.itemgetter(1)
-        )
-        results = [
-            {
-                "app": app,
-                "commands": [
-                    {
-                        "name": cmd[0],
-                        "args": get_custom_arguments(app, cmd[0]),
-                    }
-                    for cmd in cmds
-                ],
-            }
-            for (app, cmds) in itertools.groupby(commands, key=operator.itemgetter(1))
-        ]
-        data = {"results": results}
+    @action(detail=False, methods=["put"])
+    def refresh(self, request, **kwargs):
+        """Reload the catalog, e.g. after a deploy added or changed commands"""
+        data = {"results": refresh_command_catalog()}
         return JsonResponse(data=data, status=status.HTTP_200_OK)
 
     @action(detail=True, methods=["put"])
     def run(self, request, pk, **kwargs):
+        """Queue the command and return its job id right away - see `job`"""
         cmd_args = request.data.get("args") or []
         cmd_kwargs = request.data.get("kwargs") or {}
         try:
-            call_command(pk, *cmd_args, **cmd_kwargs)
-        except (CommandError, MainframeError) as e:
+            job_id = create_job(pk, cmd_args, cmd_kwargs)
+        except CommandError as e:
             return JsonResponse(
                 data={"detail": str(e)},
                 status=status.HTTP_400_BAD_REQUEST,
             )
-        except (
-            AttributeError,
-            ImproperlyConfigured,
-            KeyError,
-            TypeError,
-            ValueError,
-        ) as e:
-            logger.exception(e)
+        run_command_job(job_id, pk, cmd_args, cmd_kwargs)
+        return JsonResponse(data={"job_id": job_id}, status=status.HTTP_202_ACCEPTED)
+
+    @action(detail=False, methods=["get"], url_path=r"jobs/(?P<job_id>[0-9a-f]{32})")
+    def job(self, request, job_id, **kwargs):
+        try:
+            offset = int(request.query_params.get("offset", 0))
+        except ValueError:
             return JsonResponse(
-                data={"detail": "Command failed. Check logs"},
+                data={"detail": "offset must be an integer"},
                 status=status.HTTP_400_BAD_REQUEST,
             )
-        return JsonResponse(data={}, status=status.HTTP_204_NO_CONTENT)
+        if not (job := get_job(job_id, offset)):
+            return JsonResponse(
+                data={"detail": "Not found"}, status=status.HTTP_404_NOT_FOUND
+            )
+        return JsonResponse(data=job, status=status.HTTP_200_OK)
 
     @action(detail=True, methods=["put"], url_path="delete-cron")
     def delete_cron(self, request, pk, **kwargs):
@@ -0,0 +1,63 @@
+import re
+
+from django.apps import apps
+from django.core.management import BaseCommand
+from huey.contrib.djhuey import HUEY
+
+from mainframe.api.huey_tasks.views import discover_tasks
+from mainframe.core.redis import get_redis_client
+
+TASK_ID = re.compile(rb"^[0-9a-f]{8}-([0-9a-f]{4}-){3}[0-9a-f]{12}$")
+REVOKED_TASK_PREFIX = b"rt:"
+
+
+def get_task_names():
+    """Registered tasks, including the cron and watcher ones which are only
+    registered inside the consumer"""
+    discover_tasks()
+    names = set(HUEY._registry._registry)
+    for label in ("crons.Cron", "watchers.Watcher"):
+        model = apps.get_model(label)
+        names.update(
+            f"{model.__module__}.{name}"
+            for name in model.objects.values_list("name", flat=True)
+        )
+    return names
+
+
+def find_orphans(client, task_names):
+    """Fields of the results hash nobody will read: results stored before
+    results got their own expiring keys and revocations of removed tasks"""
+    task_names = {name.encode() for name in task_names}
+    orphans = {"results": {}, "revocations": {}}
+    for key, value in client.hscan_iter(HUEY.storage.result_key):
+        if TASK_ID.match(key):
+            orphans["results"][key] = len(value)
+        elif (
+            key.startswith(REVOKED_TASK_PREFIX)
+            and key[len(REVOKED_TASK_PREFIX) :] not in task_names
+        ):
+            orphans["revocations"][key] = len(value)
+    return orphans
+
+
+class Command(BaseCommand):
+    help = "Report and purge orphaned Huey result keys"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true")
+
+    def handle(self, *_, **options):
+        client = get_redis_client()
+        orphans = find_orphans(client, get_task_names())
+        keys = [key for group in orphans.values() for key in group]
+        size = sum(size for group in orphans.values() for size in group.values())
+        self.stdout.write(
+            f"Orphaned: {len(orphans['results'])} results,"
+            f" {len(orphans['revocations'])} revocations ({size} bytes)"
+        )
+
+        if not keys or options["dry_run"]:
+            return
+        client.hdel(HUEY.storage.result_key, *keys)
+        self.stdout.write(self.style.SUCCESS(f"Purged {len(keys)} keys"))
@@ -0,0 +1,47 @@
+import logging
+
+from django.conf import settings
+from django.core.management import CommandError
+from django.utils.module_loading import autodiscover_modules
+from huey.consumer_options import ConsumerConfig
+from huey.contrib.djhuey import HUEY
+from huey.contrib.djhuey.management.commands.run_huey import (
+    Command as RunHueyCommand,
+)
+
+from mainframe.core.huey import DEFAULT_LANE
+
+
+class Command(RunHueyCommand):
+    help = "Run the queue consumer for one of the HUEY lanes"
+
+    def add_arguments(self, parser):
+        parser.add_argument("lane")
+        super().add_arguments(parser)
+
+    def handle(self, *args, **options):
+        lane = options.pop("lane")
+        if lane == DEFAULT_LANE or lane not in HUEY.lanes:
+            raise CommandError(f"Unknown lane: {lane}")
+
+        consumer_options = {
+            **settings.HUEY.get("consumer", {}),
+            **settings.HUEY["lanes"][lane],
+        }
+        for key, value in options.items():
+            if key in ConsumerConfig._fields and value is not None:
+                consumer_options[key] = value
+        consumer_options["verbose"] = options.get("huey_verbose")
+        # periodic tasks are enqueued by the default consumer and routed here
+        consumer_options["periodic"] = False
+
+        if not options.get("disable_autoload"):
+            autodiscover_modules("tasks")
+
+        config = ConsumerConfig(**consumer_options)
+        config.validate()
+        logger = logging.getLogger("huey")
+        if not logger.handlers:
+            config.setup_logger(logger)
+
+        HUEY.lanes[lane].create_consumer(**config.values).run()
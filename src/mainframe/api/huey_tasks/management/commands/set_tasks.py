@@ -3,17 +3,11 @@ import asyncio
 from django.core.management import BaseCommand
 
 from mainframe.clients.chat import send_telegram_message
-from mainframe.core.tasks import schedule_task
-from mainframe.crons.models import Cron
-from mainframe.watchers.models import Watcher
+from mainframe.core.tasks import reconcile_tasks
 
 
 def set_tasks():
-    for cron in Cron.objects.filter(is_active=True):
-        schedule_task(cron)
-
-    for watcher in Watcher.objects.filter(is_active=True):
-        schedule_task(watcher)
+    return reconcile_tasks()
 
 
 class Command(BaseCommand):
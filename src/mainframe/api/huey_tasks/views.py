@@ -1,4 +1,4 @@
-import json
+import functools
 from importlib import import_module
 from typing import Literal
 
@@ -10,16 +10,70 @@ from rest_framework.decorators import action
 from rest_framework.exceptions import NotFound
 from rest_framework.permissions import IsAdminUser
 
-from mainframe.core.tasks import get_redis_client
+from mainframe.clients.scraper import get_host_stats
+from mainframe.core.tasks import (
+    TASK_HISTORY_PAGE_SIZE,
+    delete_task_status,
+    get_redis_client,
+    get_task_metrics,
+    parse_task_status,
+    queue_task_status,
+)
 
 
-def is_revoked(task):
-    *module, task = task.split(".")
-    module = ".".join(module)
-    try:
-        return getattr(import_module(module), task).is_revoked()
-    except (AttributeError, ModuleNotFoundError, ValueError) as e:
-        return str(e)
+@functools.cache
+def discover_tasks():
+    autodiscover_modules("tasks")
+
+
+@functools.lru_cache(maxsize=1)
+def build_registry_snapshot(task_names):
+    periodic_tasks = {str(t).split()[0][:-1] for t in HUEY._registry.periodic_tasks}
+    return [
+        {
+            "app": t.split(".")[1],
+            "name": t.split(".")[-1],
+            "id": f"{t.split('.')[1]}.{t.split('.')[-1]}",
+            "is_periodic": t in periodic_tasks,
+            "task": t,
+        }
+        for t in sorted(task_names)
+    ]
+
+
+def get_registry_snapshot():
+    discover_tasks()
+    return build_registry_snapshot(frozenset(HUEY._registry._registry))
+
+
+def is_revoked(revocation, timestamp):
+    if revocation is None:
+        return False
+    revoke_until, revoke_once = HUEY.serializer.deserialize(revocation)
+    return revoke_once or revoke_until is None or revoke_until > timestamp
+
+
+def get_tasks_details(tasks, page=1, page_size=1):
+    """Fetch statuses and revocation flags for `tasks` in a single round trip"""
+    if not tasks:
+        return []
+
+    with get_redis_client().pipeline(transaction=False) as pipe:
+        pipe.hmget(HUEY.storage.result_key, [f"rt:{t['task']}" for t in tasks])
+        for t in tasks:
+            queue_task_status(pipe, t["name"], page, page_size)
+        replies = iter(pipe.execute())
+
+    timestamp = HUEY._get_timestamp()
+    revocations = next(replies)
+    return [
+        {
+            **{k: v for k, v in t.items() if k != "task"},
+            "is_revoked": is_revoked(revocation, timestamp),
+            **parse_task_status(replies),
+        }
+        for t, revocation in zip(tasks, revocations, strict=True)
+    ]
 
 
 def task_sorter(item):
@@ -35,7 +89,7 @@ class TasksViewSet(viewsets.ViewSet):
 
     @action(methods=["delete"], detail=True, url_path="delete-history")
     def delete_history(self, request, *args, **kwargs):
-        results = get_redis_client().delete(f"tasks.{kwargs['pk']}")
+        results = delete_task_status(kwargs["pk"])
         if results:
             return self.list(request)
         return JsonResponse(
@@ -44,51 +98,37 @@ class TasksViewSet(viewsets.ViewSet):
 
     @staticmethod
     def list(request):
-        client = get_redis_client()
-        autodiscover_modules("tasks")
-        periodic_tasks = [str(t).split()[0][:-1] for t in HUEY._registry.periodic_tasks]
+        tasks = get_tasks_details(get_registry_snapshot())
+        return JsonResponse(data={"results": sorted(tasks, key=task_sorter)})
+
+    @staticmethod
+    def retrieve(request, *args, **kwargs):
+        name = kwargs["pk"]
+        try:
+            page = int(request.GET.get("page", 1))
+            page_size = int(request.GET.get("page_size", TASK_HISTORY_PAGE_SIZE))
+        except ValueError as e:
+            return JsonResponse(
+                status=status.HTTP_400_BAD_REQUEST, data={"detail": str(e)}
+            )
+        tasks = [t for t in get_registry_snapshot() if t["name"] == name][:1]
+        if not tasks:
+            raise NotFound()
         return JsonResponse(
-            data={
-                "results": sorted(
-                    [
-                        {
-                            "app": t.split(".")[1],
-                            "name": t.split(".")[-1],
-                            "id": f"{t.split('.')[1]}.{t.split('.')[-1]}",
-                            "is_periodic": t in periodic_tasks,
-                            "is_revoked": is_revoked(t),
-                            **json.loads(
-                                client.get(f"tasks.{t.split('.')[-1]}") or "{}"
-                            ),
-                        }
-                        for t in HUEY._registry._registry
-                    ],
-                    key=task_sorter,
-                ),
-            }
+            data=get_tasks_details(tasks, page=page, page_size=page_size)[0],
+            safe=True,
         )
 
-    @staticmethod
-    def retrieve(*args, **kwargs):
+    @action(methods=["get"], detail=True)
+    def metrics(self, request, *args, **kwargs):
+        # not limited to the local registry: cron and watcher tasks are only
+        # registered inside the Huey consumer
         name = kwargs["pk"]
-        client = get_redis_client()
-        autodiscover_modules("tasks")
-        periodic_tasks = [str(t).split()[0][:-1] for t in HUEY._registry.periodic_tasks]
-        for t in HUEY._registry._registry:
-            app, task_name = t.split(".")[1], t.split(".")[-1]
-            if task_name == name:
-                return JsonResponse(
-                    data={
-                        "app": app,
-                        "name": name,
-                        "id": f"{app}.{name}",
-                        "is_periodic": t in periodic_tasks,
-                        "is_revoked": is_revoked(t),
-                        **json.loads(client.get(f"tasks.{name}") or "{}"),
-                    },
-                    safe=True,
-                )
-        raise NotFound()
+        return JsonResponse(data={"name": name, **get_task_metrics(name)})
+
+    @action(methods=["get"], detail=False)
+    def hosts(self, request, *args, **kwargs):
+        return JsonResponse(data={"results": get_host_stats()})
 
     @action(methods=["put"], detail=True)
     def revoke(self, request, *args, **kwargs):
@@ -6,17 +6,20 @@ from datetime import datetime
 from unicodedata import normalize
 from zoneinfo import ZoneInfo
 
-import aiohttp
 import environ
 from bs4 import BeautifulSoup
 from django.conf import settings
 from django.core.management import BaseCommand, CommandError
 from rest_framework import status
 
+from mainframe.clients import fanout
 from mainframe.clients.chat import send_telegram_message
 
 logger = logging.getLogger(__name__)
 
+F1_CACHE_TTL = 12 * 60 * 60
+F1_URL = "https://ergast.com/api/f1/current.json"
+
 
 class Command(BaseCommand):
     def add_arguments(self, parser):
@@ -67,17 +70,15 @@ def callback(args):
         return parse_flash_score(response, categories)
 
 
-async def fetch(session, sem, url, categories):
-    async with sem:
-        try:
-            async with session.get(url) as response:
-                if response.status != status.HTTP_200_OK:
-                    err = f"Unexpected status for {url} ({response.status})"
-                    raise CommandError(err)
-                return await response.text(), url, categories
-        except aiohttp.client_exceptions.ClientConnectorError as e:
-            logger.error(e)
-            return "", url, []
+def get_text(result: fanout.Result) -> str:
+    if result.error:
+        logger.error(result.error)
+        return ""
+    if result.status != status.HTTP_200_OK:
+        raise CommandError(
+            f"Unexpected status for {result.request.url} ({result.status})"
+        )
+    return result.text
 
 
 def fetch_all(categories):
@@ -87,7 +88,7 @@ def fetch_all(categories):
                 [
                     "https://m.flashscore.ro/",
                     "https://m.flashscore.ro/snooker/",
-                    "https://ergast.com/api/f1/current.json",
+                    F1_URL,
                 ],
                 categories,
             )
@@ -97,19 +98,20 @@ def fetch_all(categories):
     hello += "evenimentele de azi" if events else "nu sunt evenimente azi"
 
     footer = f"*Surse*\n https://flashscore.ro/ (termeni: {', '.join(categories)})"
-    footer += "\n https://ergast.com/api/f1/current.json"
+    footer += f"\n {F1_URL}"
     return f"*{hello}*{events}\n\n{footer}"
 
 
 async def fetch_many(urls, categories):
-    sem = asyncio.Semaphore(1000)
-    async with aiohttp.ClientSession() as session:
-        return map(
-            callback,
-            await asyncio.gather(
-                *[fetch(session, sem, url, categories) for url in urls]
-            ),
-        )
+    events = {}
+    requests = [
+        fanout.Request(url, cache_ttl=F1_CACHE_TTL if url == F1_URL else None)
+        for url in urls
+    ]
+    async for result in fanout.fetch_many(requests):
+        url = result.request.url
+        events[url] = callback((get_text(result), url, categories))
+    return [events[url] for url in urls]
 
 
 def get_match(contents):
@@ -14,6 +14,8 @@ from mainframe.clients.scraper import fetch
 
 logger = logging.getLogger(__name__)
 
+# the same outages page is fetched for every branch
+CACHE_TTL = 5 * 60
 TYPE_ACCIDENTAL = "Accidental"
 TYPE_PLANNED_15_DAYS = "Planned (15 days)"
 TYPE_PLANNED_TODAY = "Planned (today)"
@@ -117,7 +119,12 @@ class Command(BaseCommand):
         prefix = f"[Outages][{branch.title()}][{outage_type}]"
 
         response, error = fetch(
-            url, logger=logger, prefix=prefix, timeout=15, soup=False
+            url,
+            logger=logger,
+            prefix=prefix,
+            timeout=15,
+            soup=False,
+            cache_ttl=CACHE_TTL,
         )
         if error:
             raise CommandError(error)
@@ -5,6 +5,7 @@ from django.contrib.postgres.fields import ArrayField
 from django.db import models
 from telegram.constants import ParseMode
 
+from mainframe.core.facets import track
 from mainframe.core.models import TimeStampedModel
 
 
@@ -66,3 +67,6 @@ class Message(TimeStampedModel):
 
     def __str__(self):
         return f"{self.date} {self.chat_id} {self.chat_title}"
+
+
+track(Message)
@@ -5,10 +5,26 @@ from rest_framework.permissions import AllowAny, IsAdminUser
 
 from mainframe.bots.models import Bot, Message
 from mainframe.bots.serializers import BotSerializer, MessageSerializer
+from mainframe.core.facets import get_facets
 
 logger = logging.getLogger(__name__)
 
 
+def get_facets_data():
+    return {
+        "authors": list(
+            Message.objects.values_list("author__full_name", flat=True)
+            .distinct("author__full_name")
+            .order_by("author__full_name")
+        ),
+        "chat_ids": list(
+            Message.objects.values_list("chat_id", flat=True)
+            .distinct("chat_id")
+            .order_by("chat_id")
+        ),
+    }
+
+
 class BotViewSet(viewsets.ModelViewSet):
     queryset = Bot.objects.order_by("full_name")
     serializer_class = BotSerializer
@@ -35,14 +51,5 @@ class MessageViewSet(viewsets.ModelViewSet):
 
     def list(self, request, *args, **kwargs):
         response = super().list(request, *args, **kwargs)
-        response.data["authors"] = (
-            Message.objects.values_list("author__full_name", flat=True)
-            .distinct("author__full_name")
-            .order_by("author__full_name")
-        )
-        response.data["chat_ids"] = (
-            Message.objects.values_list("chat_id", flat=True)
-            .distinct("chat_id")
-            .order_by("chat_id")
-        )
+        response.data.update(get_facets("bots.messages", (Message,), get_facets_data))
         return response
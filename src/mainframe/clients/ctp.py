@@ -1,14 +1,12 @@
-import asyncio
 import csv
 import re
 from datetime import datetime
 from typing import List, Optional
 
-import aiohttp
 from asgiref.sync import sync_to_async
 from rest_framework import status
 
-from mainframe.clients import scraper
+from mainframe.clients import fanout, scraper
 from mainframe.transit_lines.models import Schedule, TransitLine
 
 
@@ -49,6 +47,7 @@ def extract_terminals(route, separators):
 class CTPClient:
     DETAIL_URL = "https://ctpcj.ro/orare/csv/orar_{}_{}.csv"
     LIST_URL = "https://ctpcj.ro/index.php/en/timetables/{}"
+    STORE_BATCH_SIZE = 100
 
     def __init__(self, logger):
         self.logger = logger
@@ -125,8 +124,19 @@ class CTPClient:
         self.logger.info(
             "Fetching %d schedules for %d transit lines", len(schedules), lines_count
         )
-        schedules = [s for s in await self.request_many(schedules) if s]
-        if commit:
+        stored, batch = [], []
+        async for schedule in self.request_many(schedules):
+            if not schedule:
+                continue
+            batch.append(schedule)
+            if len(batch) == self.STORE_BATCH_SIZE:
+                stored.extend(await self.store_schedules(batch, commit))
+                batch = []
+        stored.extend(await self.store_schedules(batch, commit))
+        return stored
+
+    async def store_schedules(self, schedules, commit):
+        if commit and schedules:
             await sync_to_async(Schedule.objects.bulk_create)(
                 schedules,
                 update_conflicts=True,
@@ -140,31 +150,24 @@ class CTPClient:
             self.logger.info("Stored %d schedules in db", len(schedules))
         return schedules
 
-    async def request(self, session, sem, schedule):
-        line, occ, url = schedule
-        async with sem:
-            headers = {"Referer": "https://ctpcj.ro/"}
-            try:
-                async with session.get(url, headers=headers) as response:
-                    if response.status not in [
-                        status.HTTP_200_OK,
-                        status.HTTP_404_NOT_FOUND,
-                    ]:
-                        msg = f"Unexpected status for {url}. Status: {response.status}"
-                        raise ValueError(msg)
-                    return await response.text(), line, occ, url
-            except aiohttp.client_exceptions.ClientConnectorError as e:
-                self.logger.error(e)
-                return "", url
+    def get_text(self, result: fanout.Result) -> str:
+        if result.error:
+            self.logger.error(result.error)
+            return ""
+        if result.status not in [status.HTTP_200_OK, status.HTTP_404_NOT_FOUND]:
+            msg = f"Unexpected status for {result.request.url}. Status: {result.status}"
+            raise ValueError(msg)
+        return result.text
 
     async def request_many(self, schedules):
-        sem = asyncio.Semaphore(1000)
-        async with aiohttp.ClientSession() as session:
-            return map(
-                self.parse_schedule,
-                await asyncio.gather(
-                    *[self.request(session, sem, schedule) for schedule in schedules]
-                ),
+        requests = [
+            fanout.Request(url, (line, occ), headers={"Referer": "https://ctpcj.ro/"})
+            for line, occ, url in schedules
+        ]
+        async for result in fanout.fetch_many(requests):
+            line, occ = result.request.context
+            yield self.parse_schedule(
+                (self.get_text(result), line, occ, result.request.url)
             )
 
     def parse_schedule(self, args) -> Optional[Schedule]:  # noqa: C901
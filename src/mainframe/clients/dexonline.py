@@ -8,6 +8,8 @@ from mainframe.clients.scraper import fetch
 
 logger = logging.getLogger(__name__)
 
+CACHE_TTL = 24 * 60 * 60
+
 
 class DexOnlineError(Exception): ...
 
@@ -25,7 +27,9 @@ def fetch_definition(word=None):
             while len(word := random.choice(file.readlines())) < min_len:  # noqa: S311
                 ...
 
-    response, error = fetch(dex_url.format(word.strip()), logger, 1, False)
+    response, error = fetch(
+        dex_url.format(word.strip()), logger, 1, False, cache_ttl=CACHE_TTL
+    )
     if error:
         logger.error(str(error))
         raise DexOnlineError(error)
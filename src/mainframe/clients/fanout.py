@@ -0,0 +1,144 @@
+import asyncio
+import logging
+from collections import defaultdict
+from collections.abc import AsyncIterator, Iterable
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from http import HTTPStatus
+from typing import Any, NamedTuple
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from mainframe.clients import scraper
+from mainframe.clients.scraper import RETRY_STATUSES, get_backoff
+
+logger = logging.getLogger(__name__)
+
+HOST_CONCURRENCY = 4
+MAX_RETRY_AFTER = 60
+RETRIES = 2
+TIMEOUT = 30
+
+
+class Request(NamedTuple):
+    url: str
+    # returned as is with the result, to tell the caller what it was for
+    context: Any = None
+    headers: dict | None = None
+    method: str = "GET"
+    # seconds to serve the response from the scraper cache, see scraper.fetch
+    cache_ttl: int | None = None
+
+
+class Result(NamedTuple):
+    request: Request
+    status: int | None = None
+    text: str = ""
+    error: Exception | None = None
+
+
+def get_retry_delay(retry_after, attempt) -> float:
+    """Seconds to wait as asked by a Retry-After header (delay or HTTP date),
+    capped at MAX_RETRY_AFTER, otherwise the usual backoff"""
+    if not retry_after:
+        return get_backoff(attempt)
+    try:
+        delay = float(retry_after)
+    except ValueError:
+        try:
+            date = parsedate_to_datetime(retry_after)
+        except (TypeError, ValueError):
+            return get_backoff(attempt)
+        delay = (date - datetime.now(timezone.utc)).total_seconds()
+    return min(max(delay, 0), MAX_RETRY_AFTER)
+
+
+def get_cache_key(request: Request):
+    kwargs = {"headers": request.headers}
+    return scraper.get_cache_key(request.method, request.url, kwargs)
+
+
+def get_cached(request: Request) -> Result | None:
+    cached = scraper.get_cached_response(get_cache_key(request))
+    scraper.record_cache(request.url, hit=cached is not None)
+    if cached is None:
+        return None
+    return Result(request, cached.status_code, cached.text)
+
+
+def cache(result: Result):
+    if result.status == HTTPStatus.OK:
+        response = scraper.build_response(
+            result.request.url, result.status, result.text.encode(), encoding="utf-8"
+        )
+        scraper.cache_response(
+            get_cache_key(result.request), result.request.cache_ttl, response
+        )
+    return result
+
+
+async def fetch_one(session, limits, request: Request, retries) -> Result:
+    if request.cache_ttl:
+        # the cache is in Redis, a slow call must not stall the other requests
+        if cached := await asyncio.to_thread(get_cached, request):
+            return cached
+        result = await fetch_url(session, limits, request, retries)
+        return await asyncio.to_thread(cache, result)
+    return await fetch_url(session, limits, request, retries)
+
+
+async def fetch_url(session, limits, request: Request, retries) -> Result:
+    attempt = 0
+    while True:
+        async with limits[urlsplit(request.url).hostname]:
+            try:
+                async with session.request(
+                    request.method, request.url, headers=request.headers
+                ) as response:
+                    text = await response.text()
+                    if response.status not in RETRY_STATUSES or attempt == retries:
+                        return Result(request, response.status, text)
+                    delay = get_retry_delay(
+                        response.headers.get("Retry-After"), attempt
+                    )
+            except (aiohttp.ClientError, TimeoutError) as e:
+                if attempt == retries:
+                    return Result(request, error=e)
+                delay = get_backoff(attempt)
+        attempt += 1
+        logger.info("Retrying '%s' in %.1fs", request.url, delay)
+        await asyncio.sleep(delay)
+
+
+async def fetch_many(
+    requests: Iterable[Request],
+    host_concurrency=HOST_CONCURRENCY,
+    timeout=TIMEOUT,
+    retries=RETRIES,
+) -> AsyncIterator[Result]:
+    """Fetch `requests` concurrently, yielding results as they complete.
+
+    At most `host_concurrency` requests run per host and each attempt gets
+    `timeout` seconds. Connection errors, timeouts, 429 and 5xx responses are
+    retried `retries` times, after the delay asked by Retry-After if any.
+    Requests with a `cache_ttl` are served from the scraper's response cache.
+    Errors are yielded, never raised.
+    """
+    limits = defaultdict(lambda: asyncio.Semaphore(host_concurrency))
+    client_timeout = aiohttp.ClientTimeout(total=timeout)
+    async with aiohttp.ClientSession(timeout=client_timeout) as session:
+        pending = {
+            asyncio.ensure_future(fetch_one(session, limits, request, retries))
+            for request in requests
+        }
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    yield task.result()
+        finally:
+            for task in pending:
+                task.cancel()
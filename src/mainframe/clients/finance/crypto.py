@@ -5,6 +5,7 @@ from datetime import datetime
 from django.core.exceptions import ValidationError
 from django.db import IntegrityError
 
+from mainframe.core.facets import bump_data_version
 from mainframe.finance.models import CryptoPnL, CryptoTransaction
 from mainframe.finance.tasks import backup_finance_model
 
@@ -145,5 +146,6 @@ class CryptoTransactionsImporter:
             self.logger.error(str(e))
         else:
             self.logger.info("Imported '%d' crypto transactions", len(results))
+            bump_data_version(CryptoTransaction)
 
         backup_finance_model(model="CryptoTransaction")
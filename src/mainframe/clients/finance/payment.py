@@ -4,8 +4,8 @@ from functools import cached_property
 
 from django.core.exceptions import ValidationError
 from django.db import IntegrityError
-from pypdf import PdfReader
 
+from mainframe.clients.finance.pdf import read_pages_text
 from mainframe.finance.models import Payment, Timetable
 from mainframe.finance.tasks import backup_finance_model
 
@@ -88,7 +88,7 @@ class PaymentsImporter:
         payments = []
         for page in pages:
             header = "BalantaDebit CreditDetalii tranzactieData"
-            contents = page.extract_text().split(header)[1].strip().split("\n \n")[0]
+            contents = page.split(header)[1].strip().split("\n \n")[0]
             rows = [
                 r for r in contents.split("\n")[:-1] if "Alocare fonduri" not in r and r
             ]
@@ -96,9 +96,8 @@ class PaymentsImporter:
         return payments
 
     def run(self):
-        reader = PdfReader(self.file)
         try:
-            payments = self.extract_payments(reader.pages)
+            payments = self.extract_payments(read_pages_text(self.file))
         except (IndexError, ValueError) as e:
             raise PaymentImportError("Could not extract payments") from e
         try:
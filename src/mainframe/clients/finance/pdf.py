@@ -0,0 +1,16 @@
+import io
+
+from pypdf import PdfReader
+
+from mainframe.core.processes import run_in_process
+
+
+def extract_pages_text(file: str | bytes) -> list[str]:
+    reader = PdfReader(file if isinstance(file, str) else io.BytesIO(file))
+    return [page.extract_text() for page in reader.pages]
+
+
+def read_pages_text(file) -> list[str]:
+    """Extract the text of every page of a PDF path or upload in the process pool"""
+    data = file if isinstance(file, str) else file.read()
+    return run_in_process(extract_pages_text, data)
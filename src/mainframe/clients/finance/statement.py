@@ -9,6 +9,8 @@ from django.core.files.uploadedfile import InMemoryUploadedFile
 from django.db import IntegrityError
 
 from mainframe.bots.management.commands.inlines.shared import chunks
+from mainframe.core.facets import bump_data_version
+from mainframe.core.processes import run_in_process
 from mainframe.finance.models import Account, Transaction
 from mainframe.finance.tasks import backup_finance_model
 
@@ -16,6 +18,13 @@ from mainframe.finance.tasks import backup_finance_model
 class StatementImportError(Exception): ...
 
 
+def read_rows(file: str | bytes) -> list[tuple]:
+    from openpyxl import load_workbook
+
+    wb = load_workbook(file if isinstance(file, str) else io.BytesIO(file))
+    return list(wb.active.iter_rows(values_only=True))
+
+
 class StatementParser:
     def __init__(self, file: InMemoryUploadedFile, logger):
         self.file = file
@@ -92,44 +101,38 @@ class RaiffeisenParser(StatementParser):
         return additional_data
 
     def run(self):  # noqa: C901, PLR0912
-        from openpyxl import load_workbook
-
-        wb = load_workbook(self.file)
-        ws = wb.active
-
-        rows = list(ws.rows)
+        data = self.file if isinstance(self.file, str) else self.file.read()
+        rows = run_in_process(read_rows, data)
         starting_index = None
         for i, row in enumerate(rows):
-            if row[0].value == "Nume client:":
+            if row[0] == "Nume client:":
                 starting_index = i
 
         if not starting_index:
             raise StatementImportError("Could not find starting index")
 
-        if rows[starting_index][0].value != "Nume client:":
+        if rows[starting_index][0] != "Nume client:":
             raise AssertionError
         middle_name, first_name, last_name = [
-            n.capitalize() for n in rows[starting_index][1].value.split()
+            n.capitalize() for n in rows[starting_index][1].split()
         ]
-        if rows[starting_index + 2][0].value != "Numar client:":
+        if rows[starting_index + 2][0] != "Numar client:":
             raise AssertionError
-        client_code = rows[starting_index + 2][1].value
-        if rows[starting_index + 4][0].value != "Unitate Bancara:":
+        client_code = rows[starting_index + 2][1]
+        if rows[starting_index + 4][0] != "Unitate Bancara:":
             raise AssertionError
-        bank = rows[starting_index + 4][1].value
-        if rows[starting_index + 6][0].value != "Cod IBAN:":
+        bank = rows[starting_index + 4][1]
+        if rows[starting_index + 6][0] != "Cod IBAN:":
             raise AssertionError
-        number = " ".join(chunks(rows[starting_index + 6][1].value, 4))
-        if rows[starting_index + 6][2].value != "Tip cont:":
+        number = " ".join(chunks(rows[starting_index + 6][1], 4))
+        if rows[starting_index + 6][2] != "Tip cont:":
             raise AssertionError
-        account_type = (
-            "Current" if rows[starting_index + 6][3].value == "curent" else None
-        )
-        if rows[starting_index + 6][4].value != "Valuta:":
+        account_type = "Current" if rows[starting_index + 6][3] == "curent" else None
+        if rows[starting_index + 6][4] != "Valuta:":
             raise AssertionError
         currency = (
             "RON"
-            if rows[starting_index + 6][5].value == "LEI"
+            if rows[starting_index + 6][5] == "LEI"
             else rows[starting_index + 6][5].upper()
         )
 
@@ -147,7 +150,7 @@ class RaiffeisenParser(StatementParser):
             backup_finance_model(model="Account")
 
         header_index = starting_index + 11
-        header = [x.value for x in rows[header_index]]
+        header = list(rows[header_index])
         if header != [
             "Data inregistrare",
             "Data tranzactiei",
@@ -164,11 +167,11 @@ class RaiffeisenParser(StatementParser):
         ]:
             raise AssertionError
 
-        if any(x.value for x in rows[header_index + 1]):
+        if any(rows[header_index + 1]):
             raise AssertionError
         rows = rows[header_index + 2 :]
         transactions = []
-        while any((row := [x.value for x in rows.pop(0)])):
+        while any(row := rows.pop(0)):
             started_at, completed_at, debit, credit, *additional_data, description = row
             completed_at = completed_at and datetime.strptime(
                 completed_at, "%d/%m/%Y"
@@ -279,6 +282,10 @@ def import_statement(file: str | InMemoryUploadedFile, logger):
     except (IntegrityError, ValidationError) as e:
         logger.error(e)
         raise StatementImportError(e) from e
+    Transaction.objects.filter(
+        pk__in=[t.pk for t in transactions]
+    ).update_search_vector()
+    bump_data_version(Transaction)
 
     backup_finance_model(model="Transaction")
     return transactions
@@ -4,6 +4,7 @@ import io
 from django.core.exceptions import ValidationError
 from django.db import IntegrityError
 
+from mainframe.core.facets import bump_data_version
 from mainframe.finance.models import PnL, StockTransaction
 from mainframe.finance.tasks import backup_finance_model
 
@@ -106,5 +107,6 @@ class StockTransactionsImporter:
             self.logger.error(str(e))
         else:
             self.logger.info("Imported '%d' stock transactions", len(results))
+            bump_data_version(StockTransaction)
 
         backup_finance_model(model="StockTransaction")
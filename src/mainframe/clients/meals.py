@@ -1,14 +1,13 @@
 import asyncio
-import itertools
 import logging
 from datetime import datetime, timedelta
 from typing import List
 
-import aiohttp
 from bs4 import BeautifulSoup
 from django.core.signing import Signer
 from rest_framework import status
 
+from mainframe.clients import fanout
 from mainframe.meals.models import Meal
 
 logger = logging.getLogger(__name__)
@@ -26,29 +25,25 @@ class FetchMealsException(Exception):
     pass
 
 
-async def fetch(session, sem, url):
-    async with sem:
-        try:
-            async with session.get(url) as response:
-                if response.status != status.HTTP_200_OK:
-                    msg = f"Unexpected status for {url}. Status: {response.status}"
-                    if response.status == status.HTTP_404_NOT_FOUND:
-                        logger.warning(msg)
-                    else:
-                        raise ValueError(msg)
-                return await response.text(), url
-        except aiohttp.client_exceptions.ClientConnectorError as e:
-            logger.error(e)
-            return "", url
-
-
-async def fetch_many(urls):
-    sem = asyncio.Semaphore(1000)
-    async with aiohttp.ClientSession() as session:
-        return map(
-            parse_week,
-            await asyncio.gather(*[fetch(session, sem, url) for url in urls]),
-        )
+def get_text(result: fanout.Result) -> str:
+    if result.error:
+        logger.error(result.error)
+        return ""
+    if result.status != status.HTTP_200_OK:
+        msg = f"Unexpected status for {result.request.url}. Status: {result.status}"
+        if result.status != status.HTTP_404_NOT_FOUND:
+            raise ValueError(msg)
+        logger.warning(msg)
+    return result.text
+
+
+async def fetch_many(urls) -> List[Meal]:
+    """Parse each week as soon as it arrives so only the meals are kept"""
+    meals = []
+    async for result in fanout.fetch_many(map(fanout.Request, urls)):
+        if text := get_text(result):
+            meals.extend(parse_week((text, result.request.url)))
+    return meals
 
 
 def parse_meal(row) -> Meal:
@@ -131,7 +126,7 @@ class MealsClient:
             "Hhq6D12GLwL3MuG7vmBv7LoXyDQND-lb6wg9QVqh1Sg"
         )
         urls = [f"{url}/week-{week_no}" for week_no in range(1, 5)]
-        meals = list(itertools.chain.from_iterable(asyncio.run(fetch_many(urls))))
+        meals = asyncio.run(fetch_many(urls))
 
         Meal.objects.bulk_create(
             meals,
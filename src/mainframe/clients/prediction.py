@@ -6,6 +6,7 @@ from django.utils import timezone
 from huey.signals import SIGNAL_ERROR
 
 from mainframe.clients.storage import GoogleCloudStorageClient
+from mainframe.core.processes import run_in_process
 from mainframe.core.tasks import log_status
 
 
@@ -36,12 +37,16 @@ def save(item, item_type, prefix, logger):
 
 class SKLearn:
     @classmethod
-    def predict(cls, df) -> django.db.models.QuerySet:
+    def classify(cls, descriptions):
         model, vectorizer = load("latest_model"), load("latest_vectorizer")
-        return model.predict(vectorizer.transform(df["description"]))
+        return model.predict(vectorizer.transform(descriptions))
 
     @classmethod
-    def train(cls, df, logger):
+    def predict(cls, df) -> django.db.models.QuerySet:
+        return run_in_process(cls.classify, df["description"])
+
+    @classmethod
+    def fit(cls, df):
         from sklearn.feature_extraction.text import TfidfVectorizer
         from sklearn.linear_model import LogisticRegression
         from sklearn.model_selection import train_test_split
@@ -60,8 +65,11 @@ class SKLearn:
         model = LogisticRegression()  # noqa: F821
         model.fit(X_train, y_train)
 
-        accuracy = model.score(X_test, y_test)
+        return model, vect, model.score(X_test, y_test)
 
+    @classmethod
+    def train(cls, df, logger):
+        model, vect, accuracy = run_in_process(cls.fit, df)
         log_status("train", accuracy=f"{accuracy:.2f}")
         if accuracy < 0.95:  # noqa PLR2004
             error = f"Insufficient accuracy: {accuracy:.2f}"
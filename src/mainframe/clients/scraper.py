@@ -1,26 +1,253 @@
+import hashlib
+import json
+import logging
+import os
+import random
+import threading
+import time
+from collections import defaultdict
+from datetime import timedelta
+from http import HTTPStatus
+from http.cookiejar import DefaultCookiePolicy
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import redis
 import requests
 from bs4 import BeautifulSoup
 from requests import Response
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from mainframe.core.redis import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 10
+CACHE_KEY_PREFIX = "scraper.cache"
+CACHE_MAX_SIZE = 512 * 1024
+HOST_STATS_KEY = "scraper.hosts"
+HOST_STATS_TTL = timedelta(days=30)
+POOL_HOSTS = 20
+POOL_SIZE = 4
+RETRY_STATUSES = (
+    HTTPStatus.TOO_MANY_REQUESTS,
+    HTTPStatus.INTERNAL_SERVER_ERROR,
+    HTTPStatus.BAD_GATEWAY,
+    HTTPStatus.SERVICE_UNAVAILABLE,
+    HTTPStatus.GATEWAY_TIMEOUT,
+)
+
+_lock = threading.Lock()
+_sessions: dict[int, requests.Session] = {}
+
+
+def get_session() -> requests.Session:
+    """Return the process-wide session, keeping a pool of POOL_SIZE
+    connections for each of the last POOL_HOSTS hosts.
+
+    Keyed by pid so forked workers don't share sockets with their parent.
+    Cookies set by responses are not kept: callers expect independent requests.
+    """
+    if (session := _sessions.get(pid := os.getpid())) is None:
+        with _lock:
+            if (session := _sessions.get(pid)) is None:
+                session = requests.Session()
+                session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+                adapter = HTTPAdapter(
+                    pool_connections=POOL_HOSTS, pool_maxsize=POOL_SIZE
+                )
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _sessions[pid] = session
+    return session
+
+
+def get_backoff(attempt) -> float:
+    """Exponential backoff with full jitter"""
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2**attempt))  # noqa: S311
+
+
+def is_retryable(error) -> bool:
+    if isinstance(error, requests.exceptions.HTTPError):
+        return getattr(error.response, "status_code", None) in RETRY_STATUSES
+    return not isinstance(error, requests.exceptions.TooManyRedirects)
+
+
+def record_request(url, seconds, error=False):
+    """Per host request, error and latency counters for the tasks dashboard"""
+    host = urlsplit(url).hostname or url
+    try:
+        with get_redis_client().pipeline(transaction=False) as pipe:
+            pipe.hincrby(HOST_STATS_KEY, f"{host}:requests")
+            pipe.hincrby(HOST_STATS_KEY, f"{host}:errors", int(error))
+            pipe.hincrbyfloat(HOST_STATS_KEY, f"{host}:seconds", round(seconds, 3))
+            pipe.expire(HOST_STATS_KEY, int(HOST_STATS_TTL.total_seconds()))
+            pipe.execute()
+    except redis.exceptions.RedisError as e:
+        logger.warning("Could not record request stats for '%s': %s", host, e)
+
+
+def record_cache(url, hit):
+    host = urlsplit(url).hostname or url
+    field = f"{host}:cache_hits" if hit else f"{host}:cache_misses"
+    try:
+        get_redis_client().hincrby(HOST_STATS_KEY, field)
+    except redis.exceptions.RedisError as e:
+        logger.warning("Could not record cache stats for '%s': %s", host, e)
+
+
+def normalize_url(url, params=None):
+    """Lowercase scheme and host, no fragment and query (with `params`) sorted"""
+    parts = urlsplit(url)
+    if isinstance(params, dict):
+        params = params.items()
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    query += [(str(key), str(value)) for key, value in params or ()]
+    return urlunsplit(
+        (
+            parts.scheme.lower(),
+            parts.netloc.lower(),
+            parts.path or "/",
+            urlencode(sorted(query)),
+            "",
+        )
+    )
+
+
+def get_cache_key(method, url, kwargs) -> str:
+    request = [
+        method.upper(),
+        normalize_url(url, kwargs.get("params")),
+        *(kwargs.get(name) for name in ("headers", "json", "data")),
+    ]
+    digest = hashlib.sha256(json.dumps(request, sort_keys=True, default=str).encode())
+    return f"{CACHE_KEY_PREFIX}:{digest.hexdigest()}"
+
+
+def get_cached_response(key) -> Response | None:
+    try:
+        cached = get_redis_client().hgetall(key)
+    except redis.exceptions.RedisError as e:
+        logger.warning("Could not read cached response: %s", e)
+        return None
+    if not cached:
+        return None
+    return build_response(
+        cached[b"url"].decode(),
+        int(cached[b"status"]),
+        cached[b"content"],
+        json.loads(cached[b"headers"]),
+        cached[b"encoding"].decode() or None,
+    )
+
+
+def build_response(url, status, content, headers=None, encoding=None) -> Response:
+    response = Response()
+    response.url = url
+    response.status_code = status
+    response.headers = CaseInsensitiveDict(headers or {})
+    response.encoding = encoding
+    response._content = content
+    return response
+
+
+def cache_response(key, ttl, response: Response):
+    """Keep successful responses up to CACHE_MAX_SIZE for `ttl` seconds"""
+    if len(response.content) > CACHE_MAX_SIZE:
+        logger.info("Not caching '%s': %d bytes", response.url, len(response.content))
+        return
+    mapping = {
+        "status": response.status_code,
+        "url": response.url or "",
+        "headers": json.dumps(
+            {k: v for k, v in response.headers.items() if k.lower() == "content-type"}
+        ),
+        "encoding": response.encoding or "",
+        "content": response.content,
+    }
+    try:
+        with get_redis_client().pipeline() as pipe:
+            pipe.hset(key, mapping=mapping)
+            pipe.expire(key, ttl)
+            pipe.execute()
+    except redis.exceptions.RedisError as e:
+        logger.warning("Could not cache response: %s", e)
+
+
+def ratio(value, total):
+    return round(value / total, 3) if total else 0
+
+
+def get_host_stats() -> list[dict]:
+    counters = defaultdict(lambda: defaultdict(float))
+    for field, value in get_redis_client().hgetall(HOST_STATS_KEY).items():
+        host, name = field.decode().rsplit(":", 1)
+        counters[host][name] = float(value)
+
+    stats = [
+        {
+            "host": host,
+            "requests": int(counter["requests"]),
+            "errors": int(counter["errors"]),
+            "error_rate": ratio(counter["errors"], counter["requests"]),
+            "mean_latency": ratio(counter["seconds"], counter["requests"]),
+            "cache_hits": int(counter["cache_hits"]),
+            "cache_misses": int(counter["cache_misses"]),
+        }
+        for host, counter in counters.items()
+    ]
+    return sorted(stats, key=lambda s: (-s["requests"], s["host"]))
+
+
+def to_result(response: Response, soup):
+    if not soup:
+        return response, None
+    return BeautifulSoup(response.content, features="html.parser"), None
 
 
 def fetch(
     url, logger, retries=0, soup=True, timeout=10, **kwargs
 ) -> tuple[BeautifulSoup | Response | None, Exception | None]:
+    """Request `url` through the shared session, retrying `retries` times.
+
+    With `cache_ttl` (seconds) successful responses are kept in Redis and
+    the same request is served from there, without any network round trip,
+    until they expire.
+    """
     method = kwargs.pop("method", "GET")
     prefix = kwargs.pop("prefix", "") or ""
-    logger.info("%s[fetch] Sending '%s' request to '%s'", prefix, method, url)
-    try:
-        response = requests.request(method, url, timeout=timeout, **kwargs)
-        response.raise_for_status()
-    except (
-        requests.exceptions.ConnectionError,
-        requests.exceptions.HTTPError,
-        requests.exceptions.ReadTimeout,
-        requests.exceptions.TooManyRedirects,
-    ) as e:
-        if retries > 0:
-            return fetch(url, logger, retries - 1, soup, timeout, **kwargs)
-        return None, e
-    if not soup:
-        return response, None
-    return BeautifulSoup(response.content, features="html.parser"), None
+    if cache_ttl := kwargs.pop("cache_ttl", None):
+        cache_key = get_cache_key(method, url, kwargs)
+        cached = get_cached_response(cache_key)
+        record_cache(url, hit=cached is not None)
+        if cached is not None:
+            logger.info("%s[fetch] Cached '%s' response for '%s'", prefix, method, url)
+            return to_result(cached, soup)
+
+    error = None
+    for attempt in range(retries + 1):
+        if attempt:
+            time.sleep(get_backoff(attempt))
+        logger.info("%s[fetch] Sending '%s' request to '%s'", prefix, method, url)
+        started = time.monotonic()
+        try:
+            response = get_session().request(method, url, timeout=timeout, **kwargs)
+            response.raise_for_status()
+        except (
+            requests.exceptions.ConnectionError,
+            requests.exceptions.HTTPError,
+            requests.exceptions.ReadTimeout,
+            requests.exceptions.TooManyRedirects,
+        ) as e:
+            record_request(url, time.monotonic() - started, error=True)
+            error = e
+            if not is_retryable(e):
+                break
+            continue
+
+        record_request(url, time.monotonic() - started)
+        if cache_ttl:
+            cache_response(cache_key, cache_ttl, response)
+        return to_result(response, soup)
+    return None, error
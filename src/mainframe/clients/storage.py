@@ -6,6 +6,8 @@ import environ
 import redis
 from google.cloud import storage
 
+from mainframe.core.redis import get_redis_client
+
 config = environ.Env()
 
 
@@ -56,7 +58,7 @@ class GoogleCloudStorageClient:
 
 class RedisClient:
     def __init__(self, logger=None):
-        self.client = redis.Redis(host="localhost", port=6379)
+        self.client = get_redis_client()
         self.logger = logger or logging.getLogger(__name__)
 
     def delete(self, key):
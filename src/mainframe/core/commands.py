@@ -0,0 +1,90 @@
+import functools
+import itertools
+from typing import NamedTuple
+
+from django.core.management import (
+    BaseCommand,
+    CommandError,
+    get_commands,
+    load_command_class,
+)
+
+
+class RegisteredCommand(NamedTuple):
+    app: str
+    command_class: type[BaseCommand]
+
+
+@functools.cache
+def get_command_registry() -> dict[str, RegisteredCommand]:
+    """mainframe's management commands by name, loaded once per process.
+
+    Deploys restart every process, so new or removed commands are picked up
+    then - `get_command_registry.cache_clear()` reloads it in place.
+    """
+    return {
+        name: RegisteredCommand(app, type(load_command_class(app, name)))
+        for name, app in sorted(get_commands().items())
+        if "mainframe" in app
+    }
+
+
+def get_command(name) -> RegisteredCommand:
+    try:
+        return get_command_registry()[name]
+    except KeyError as e:
+        raise CommandError(f"Unknown command: {name}") from e
+
+
+def get_custom_arguments(command_class, name) -> list[dict]:
+    """Options `command_class` adds on top of the ones every command has"""
+    parser = command_class().create_parser("manage.py", name)
+    base_parser = BaseCommand().create_parser("manage.py", "base")
+    default_options = {action.dest for action in base_parser._actions}
+
+    return [
+        {
+            "choices": o.choices,
+            "default": o.default,
+            "dest": o.dest,
+            "help": o.help,
+            "nargs": o.nargs,
+            "option_strings": o.option_strings,
+            "required": o.required,
+            "type": o.type.__name__ if o.type else None,
+        }
+        for o in parser._actions
+        if o.dest not in default_options
+    ]
+
+
+@functools.cache
+def get_command_catalog() -> list[dict]:
+    """Commands grouped by app with their help and arguments, for listing.
+
+    Building a parser per command is the expensive part, so this is computed
+    once per process - `refresh_command_catalog` rebuilds it.
+    """
+    commands = sorted(
+        get_command_registry().items(), key=lambda item: (item[1].app, item[0])
+    )
+    return [
+        {
+            "app": app,
+            "commands": [
+                {
+                    "name": name,
+                    "help": command.command_class.help,
+                    "args": get_custom_arguments(command.command_class, name),
+                }
+                for name, command in group
+            ],
+        }
+        for app, group in itertools.groupby(commands, key=lambda item: item[1].app)
+    ]
+
+
+def refresh_command_catalog() -> list[dict]:
+    get_command_registry.cache_clear()
+    get_command_catalog.cache_clear()
+    return get_command_catalog()
@@ -0,0 +1,84 @@
+import json
+import logging
+from collections.abc import Callable, Iterable
+from datetime import timedelta
+
+import redis
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Model, signals
+
+from mainframe.core.redis import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+FACETS_KEY_PREFIX = "facets"
+FACETS_TTL = timedelta(days=1)
+
+
+def get_version_key(model: type[Model]):
+    return f"{FACETS_KEY_PREFIX}.version.{model._meta.label_lower}"
+
+
+def bump_data_version(*models: type[Model]):
+    """Invalidate the facets computed from `models` once the current
+    transaction commits (right away outside of one).
+
+    Saves and deletes of tracked models do this on their own - call it after
+    `update()`, `bulk_create()` and other writes that don't send signals.
+    """
+
+    def bump():
+        try:
+            with get_redis_client().pipeline(transaction=False) as pipe:
+                for model in models:
+                    pipe.incr(get_version_key(model))
+                pipe.execute()
+        except redis.exceptions.RedisError as e:
+            logger.warning("Could not bump data version of %s: %s", models, e)
+
+    transaction.on_commit(bump)
+
+
+def on_change(sender, **kwargs):
+    bump_data_version(sender)
+
+
+def track(*models: type[Model]):
+    """Bump the data version of `models` whenever one of their rows is saved
+    or deleted"""
+    for model in models:
+        uid = f"facets.{model._meta.label_lower}"
+        signals.post_save.connect(on_change, sender=model, dispatch_uid=uid)
+        signals.post_delete.connect(on_change, sender=model, dispatch_uid=uid)
+
+
+def get_facets(name, models: Iterable[type[Model]], compute: Callable[[], dict]):
+    """Filter options (distinct values, counts) of a list endpoint, computed
+    by `compute` once per data version of the `models` they are read from.
+
+    Stale entries are never read again after a bump and expire on their own.
+    Without Redis they are computed on every call.
+    """
+    client = get_redis_client()
+    try:
+        versions = client.mget([get_version_key(model) for model in models])
+        key = ".".join(
+            [FACETS_KEY_PREFIX, name, *(v.decode() if v else "0" for v in versions)]
+        )
+        if (cached := client.get(key)) is not None:
+            return json.loads(cached)
+    except redis.exceptions.RedisError as e:
+        logger.warning("Could not read '%s' facets: %s", name, e)
+        return compute()
+
+    facets = compute()
+    try:
+        client.set(
+            key,
+            json.dumps(facets, cls=DjangoJSONEncoder),
+            ex=int(FACETS_TTL.total_seconds()),
+        )
+    except redis.exceptions.RedisError as e:
+        logger.warning("Could not cache '%s' facets: %s", name, e)
+    return facets
@@ -0,0 +1,115 @@
+import logging
+
+from huey import RedisHuey
+from huey.constants import EmptyData
+from huey.storage import RedisStorage
+
+logger = logging.getLogger(__name__)
+
+# huey 2.5.0 has no enqueue signal, so we emit our own with the same name
+SIGNAL_ENQUEUED = "enqueued"
+
+DEFAULT_LANE = "default"
+RESULT_MAX_SIZE = 64 * 1024
+
+
+class ResultTTLRedisStorage(RedisStorage):
+    """RedisStorage keeping task results in their own expiring keys.
+
+    Revocations and locks stay in the results hash, reads check both.
+    """
+
+    def get_result_key(self, key):
+        return f"{self.result_key}:{key}"
+
+    def put_result(self, key, value, ttl):
+        self.conn.set(self.get_result_key(key), value, ex=ttl)
+
+    def read_data(self, key, delete=False):
+        pipe = self.conn.pipeline()
+        pipe.get(self.get_result_key(key))
+        pipe.hexists(self.result_key, key)
+        pipe.hget(self.result_key, key)
+        if delete:
+            pipe.delete(self.get_result_key(key))
+            pipe.hdel(self.result_key, key)
+        value, exists, data, *_ = pipe.execute()
+        if value is not None:
+            return value
+        return data if exists else EmptyData
+
+    def peek_data(self, key):
+        return self.read_data(key)
+
+    def pop_data(self, key):
+        return self.read_data(key, delete=True)
+
+
+class MainframeHuey(RedisHuey):
+    """RedisHuey that emits an enqueued signal, routes tasks to lanes and only
+    stores the results tasks opt into.
+
+    A lane is a separate queue with its own consumer (see `run_huey_lane`), so
+    slow CPU-bound tasks can't starve the I/O ones. Tasks pick a lane with
+    `@db_task(lane="cpu")`; unknown lanes fall back to the default queue.
+    Lanes share the registry, signals and result store with the default
+    instance, so results, locks, revokes and the tasks dashboard are the same
+    for every lane.
+
+    Results (and errors) are kept only for tasks declared with
+    `@task(result_ttl=<seconds>)`, for that long, and only if their serialized
+    size is within `result_max_size` (per task or HUEY["result_max_size"]).
+    """
+
+    storage_class = ResultTTLRedisStorage
+
+    def __init__(
+        self, name="huey", lanes=(), result_max_size=RESULT_MAX_SIZE, **kwargs
+    ):
+        super().__init__(name, **kwargs)
+        self.result_max_size = result_max_size
+        self._executing = {}
+        self.lanes = {DEFAULT_LANE: self}
+        for lane in lanes:
+            huey = self.__class__(
+                f"{name}.{lane}", result_max_size=result_max_size, **kwargs
+            )
+            huey.lanes = self.lanes
+            huey._locks = self._locks
+            huey._registry = self._registry
+            huey._signal = self._signal
+            huey.storage.result_key = self.storage.result_key
+            self.lanes[lane] = huey
+
+    def enqueue(self, task):
+        huey = self.lanes.get(getattr(task, "lane", None) or DEFAULT_LANE, self)
+        if huey is not self:
+            return huey.enqueue(task)
+        if not self._immediate:
+            self._emit(SIGNAL_ENQUEUED, task)
+        return super().enqueue(task)
+
+    def _execute(self, task, timestamp):
+        # put_result() only gets the task id
+        self._executing[task.id] = task
+        try:
+            return super()._execute(task, timestamp)
+        finally:
+            self._executing.pop(task.id, None)
+
+    def put_result(self, key, data):
+        task = self._executing.get(key)
+        if not (ttl := getattr(task, "result_ttl", None)):
+            return None
+
+        value = self.serializer.serialize(data)
+        max_size = getattr(task, "result_max_size", None) or self.result_max_size
+        if len(value) > max_size:
+            logger.warning(
+                "Not storing %s result: %d bytes > %d", task.name, len(value), max_size
+            )
+            return None
+
+        if isinstance(self.storage, ResultTTLRedisStorage):
+            return self.storage.put_result(key, value, ttl)
+        return self.storage.put_data(key, value, is_result=True)
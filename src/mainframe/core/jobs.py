@@ -0,0 +1,166 @@
+import contextlib
+import contextvars
+import io
+import json
+import logging
+import uuid
+from datetime import timedelta
+
+from django.core.management import call_command
+from django.utils import timezone
+
+from mainframe.core.commands import get_command
+from mainframe.core.redis import get_redis_client
+
+JOB_OUTPUT_LIMIT = 10_000  # lines
+JOB_TTL = timedelta(days=1)
+
+STATUS_QUEUED = "queued"
+STATUS_RUNNING = "running"
+STATUS_COMPLETE = "complete"
+STATUS_ERROR = "error"
+
+# the job run by the current thread (Huey worker) or asyncio task
+_current_job = contextvars.ContextVar("current_job", default=None)
+
+
+def get_job_keys(job_id):
+    return f"commands.jobs.{job_id}", f"commands.jobs.{job_id}.output"
+
+
+def update_job(job_id, **fields):
+    key, _ = get_job_keys(job_id)
+    with get_redis_client().pipeline() as pipe:
+        pipe.hset(key, mapping=fields)
+        pipe.expire(key, int(JOB_TTL.total_seconds()))
+        pipe.execute()
+
+
+def create_job(name, args=(), kwargs=None) -> str:
+    """Record a queued run of command `name` - raises CommandError if unknown"""
+    get_command(name)
+    job_id = uuid.uuid4().hex
+    update_job(
+        job_id,
+        command=name,
+        args=json.dumps({"args": list(args), "kwargs": kwargs or {}}),
+        created_at=timezone.now().isoformat(),
+        status=STATUS_QUEUED,
+    )
+    return job_id
+
+
+class JobOutput(io.TextIOBase):
+    """Appends every complete line written to the job's output list, so it
+    can be read while the command is still running"""
+
+    def __init__(self, job_id):
+        super().__init__()
+        _, self.key = get_job_keys(job_id)
+        self.pending = ""
+        self.lines = 0
+
+    def writable(self):
+        return True
+
+    def write(self, text):
+        self.pending += text
+        *lines, self.pending = self.pending.split("\n")
+        self.push(lines)
+        return len(text)
+
+    def flush(self):
+        if self.pending:
+            self.push([self.pending])
+            self.pending = ""
+
+    def push(self, lines):
+        if not lines or self.lines > JOB_OUTPUT_LIMIT:
+            return
+        if self.lines + len(lines) > JOB_OUTPUT_LIMIT:
+            lines = [*lines[: JOB_OUTPUT_LIMIT - self.lines], "[output truncated]"]
+        self.lines += len(lines)
+        with get_redis_client().pipeline() as pipe:
+            pipe.rpush(self.key, *lines)
+            pipe.expire(self.key, int(JOB_TTL.total_seconds()))
+            pipe.execute()
+
+
+class JobFilter(logging.Filter):
+    """Only lets through the records logged while running `job_id` - every
+    run of a command logs to the same module logger"""
+
+    def __init__(self, job_id):
+        super().__init__()
+        self.job_id = job_id
+
+    def filter(self, record):
+        return _current_job.get() == self.job_id
+
+
+def get_command_logger(name):
+    app, _ = get_command(name)
+    return logging.getLogger(f"{app}.management.commands.{name}")
+
+
+@contextlib.contextmanager
+def track_job(job_id, logger):
+    """Mark the job running, stream this job's records of `logger` into its
+    output (yielded, for stdout and stderr) and record how it ended"""
+    output = JobOutput(job_id)
+    handler = logging.StreamHandler(output)
+    handler.setFormatter(logging.Formatter("%(levelname)s %(message)s"))
+    handler.addFilter(JobFilter(job_id))
+    logger.addHandler(handler)
+    token = _current_job.set(job_id)
+
+    update_job(job_id, status=STATUS_RUNNING, started_at=timezone.now().isoformat())
+    try:
+        yield output
+    except Exception as e:
+        update_job(
+            job_id,
+            error=str(e),
+            finished_at=timezone.now().isoformat(),
+            status=STATUS_ERROR,
+        )
+        raise
+    else:
+        update_job(
+            job_id, finished_at=timezone.now().isoformat(), status=STATUS_COMPLETE
+        )
+    finally:
+        _current_job.reset(token)
+        logger.removeHandler(handler)
+        output.flush()
+
+
+def run_job(job_id, name, args=(), kwargs=None):
+    """Run command `name` for `job_id`, streaming its stdout, stderr and the
+    logs of its module into the job's output"""
+    _, command_class = get_command(name)
+    with track_job(job_id, get_command_logger(name)) as output:
+        call_command(
+            command_class(), *args, stdout=output, stderr=output, **(kwargs or {})
+        )
+
+
+def get_job(job_id, offset=0) -> dict | None:
+    """The job's state and its output lines from `offset` on. Pass back the
+    returned `offset` to only get the lines written since"""
+    key, output_key = get_job_keys(job_id)
+    with get_redis_client().pipeline(transaction=False) as pipe:
+        pipe.hgetall(key)
+        pipe.lrange(output_key, max(offset, 0), -1)
+        job, lines = pipe.execute()
+    if not job:
+        return None
+
+    job = {k.decode(): v.decode() for k, v in job.items()}
+    return {
+        "id": job_id,
+        **json.loads(job.pop("args")),
+        **job,
+        "output": [line.decode() for line in lines],
+        "offset": max(offset, 0) + len(lines),
+    }
@@ -1,4 +1,8 @@
+from datetime import timedelta
+
 from django.db import models
+from django.utils import timezone
+from huey import signals
 
 
 class TimeStampedModel(models.Model):
@@ -7,3 +11,40 @@ class TimeStampedModel(models.Model):
 
     class Meta:
         abstract = True
+
+
+class RunModel(models.Model):
+    """One execution of a task - subclasses add the FK to what ran"""
+
+    RETENTION = timedelta(days=90)
+    STATUS_COMPLETE = signals.SIGNAL_COMPLETE
+    STATUS_ERROR = signals.SIGNAL_ERROR
+
+    STATUS_CHOICES = ((STATUS_COMPLETE, "Complete"), (STATUS_ERROR, "Error"))
+
+    duration = models.FloatField()  # seconds
+    error = models.TextField(blank=True)
+    finished_at = models.DateTimeField()
+    output_size = models.PositiveIntegerField(default=0)
+    started_at = models.DateTimeField()
+    status = models.CharField(choices=STATUS_CHOICES, max_length=16)
+
+    class Meta:
+        abstract = True
+
+    def finish(self, error=None, output_size=0, commit=True, finished_at=None):
+        self.finished_at = finished_at or timezone.now()
+        self.duration = (self.finished_at - self.started_at).total_seconds()
+        self.status = self.STATUS_ERROR if error else self.STATUS_COMPLETE
+        self.error = str(error) if error else ""
+        self.output_size = output_size
+        if commit:
+            self.save()
+        return self
+
+    @classmethod
+    def prune(cls):
+        """Forget runs older than RETENTION"""
+        return cls.objects.filter(
+            started_at__lt=timezone.now() - cls.RETENTION
+        ).delete()
@@ -0,0 +1,75 @@
+import asyncio
+import functools
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import django
+from django.conf import settings
+
+_executor = None
+_lock = threading.Lock()
+
+
+def get_executor():
+    """Lazily start the shared pool for CPU-bound jobs.
+
+    Workers are spawned (forking a threaded gunicorn/huey process is unsafe)
+    and set up Django, so jobs may use settings and models.
+    """
+    global _executor  # noqa: PLW0603
+    with _lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=settings.PROCESS_POOL_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=django.setup,
+            )
+        return _executor
+
+
+def shutdown(wait=True):
+    global _executor  # noqa: PLW0603
+    with _lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=wait, cancel_futures=True)
+
+
+def run_inline(fn, *args, **kwargs):
+    future = Future()
+    try:
+        future.set_result(fn(*args, **kwargs))
+    except Exception as e:  # noqa: BLE001
+        future.set_exception(e)
+    return future
+
+
+def submit(fn, *args, **kwargs) -> Future:
+    """Run `fn(*args, **kwargs)` in the process pool and return its Future.
+
+    `fn` and its arguments must be picklable. Poll with `future.done()`, wait
+    with `future.result(timeout)` or await `asyncio.wrap_future(future)`.
+    Runs inline when the pool is disabled (PROCESS_POOL_WORKERS=0) or when
+    already inside a child process (e.g. Huey process workers, pool workers).
+    """
+    if not settings.PROCESS_POOL_WORKERS or multiprocessing.parent_process():
+        return run_inline(fn, *args, **kwargs)
+    try:
+        return get_executor().submit(fn, *args, **kwargs)
+    except BrokenProcessPool:  # a worker died (e.g. OOM) - start a fresh pool
+        shutdown(wait=False)
+        return get_executor().submit(fn, *args, **kwargs)
+
+
+def run_in_process(fn, *args, timeout=None, **kwargs):
+    """Run `fn` in the process pool and block until it returns.
+
+    Only the calling thread waits; the GIL stays free for the other threads.
+    """
+    return submit(fn, *args, **kwargs).result(timeout=timeout)
+
+
+async def arun_in_process(fn, *args, **kwargs):
+    return await asyncio.wrap_future(submit(functools.partial(fn, *args, **kwargs)))
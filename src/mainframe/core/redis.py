@@ -0,0 +1,25 @@
+import threading
+
+import redis
+from django.conf import settings
+
+_lock = threading.Lock()
+_pools: dict[str, redis.BlockingConnectionPool] = {}
+
+
+def get_connection_pool(url, **options) -> redis.BlockingConnectionPool:
+    """Return the process-wide pool for `url`, creating it on first use.
+
+    Pools are safe to share between threads and are reset by redis-py
+    after a fork, so web, Huey and bot processes can all go through here.
+    """
+    if (pool := _pools.get(url)) is None:
+        with _lock:
+            if (pool := _pools.get(url)) is None:
+                pool = redis.BlockingConnectionPool.from_url(url, **options)
+                _pools[url] = pool
+    return pool
+
+
+def get_redis_client() -> redis.Redis:
+    return redis.Redis(connection_pool=get_connection_pool(**settings.REDIS))
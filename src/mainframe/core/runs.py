@@ -0,0 +1,124 @@
+from datetime import timedelta
+
+from django.db.models import Aggregate, Count, F, FloatField, Max, Q
+from django.http import JsonResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+
+from mainframe.core.models import RunModel
+
+DEFAULT_RANGE = timedelta(days=7)
+PERCENTILES = (50, 95, 99)
+SLOWEST_LIMIT = 20
+SLOWEST_LIMIT_MAX = 100
+
+
+class Percentile(Aggregate):
+    """Continuous (interpolated) percentile - Postgres' ordered-set aggregate"""
+
+    function = "PERCENTILE_CONT"
+    template = "%(function)s(%(fraction)s) WITHIN GROUP (ORDER BY %(expressions)s)"
+    output_field = FloatField()
+
+    def __init__(self, expression, percent, **extra):
+        super().__init__(expression, fraction=float(percent) / 100, **extra)
+
+
+def parse_range(params) -> tuple:
+    """`since` / `until` ISO datetimes, the last DEFAULT_RANGE by default"""
+    bounds = {}
+    for name in ("since", "until"):
+        if not (value := params.get(name)):
+            continue
+        try:
+            bound = parse_datetime(value)
+        except ValueError:
+            bound = None
+        if bound is None:
+            raise ValidationError({name: f"Invalid datetime: {value}"})
+        if timezone.is_naive(bound):
+            bound = timezone.make_aware(bound)
+        bounds[name] = bound
+
+    until = bounds.get("until") or timezone.now()
+    since = bounds.get("since") or until - DEFAULT_RANGE
+    if since >= until:
+        raise ValidationError({"since": "Must be before until"})
+    return since, until
+
+
+def parse_limit(params) -> int:
+    try:
+        limit = int(params.get("limit", SLOWEST_LIMIT))
+    except ValueError as e:
+        raise ValidationError({"limit": "Must be an integer"}) from e
+    return min(max(limit, 1), SLOWEST_LIMIT_MAX)
+
+
+def rounded(value):
+    return round(value, 3) if value is not None else None
+
+
+class RunStatsMixin:
+    """`stats` and `slowest` list actions over the viewset's run history.
+
+    Set `run_model` to the RunModel subclass and `run_field` to its FK
+    towards the viewset's model.
+    """
+
+    run_model: type[RunModel]
+    run_field: str
+
+    def get_runs(self, request):
+        since, until = parse_range(request.query_params)
+        return self.run_model.objects.filter(
+            started_at__gte=since, started_at__lt=until
+        )
+
+    @action(detail=False, methods=["GET"])
+    def stats(self, request):
+        failed = Q(status=RunModel.STATUS_ERROR)
+        stats = (
+            self.get_runs(request)
+            .values(task_id=F(self.run_field), name=F(f"{self.run_field}__name"))
+            .annotate(
+                runs=Count("id"),
+                failures=Count("id", filter=failed),
+                max=Max("duration"),
+                **{f"p{p}": Percentile("duration", p) for p in PERCENTILES},
+            )
+            .order_by("-runs", "name")
+        )
+        results = [
+            {
+                **row,
+                "failure_rate": rounded(row["failures"] / row["runs"]),
+                "max": rounded(row["max"]),
+                **{f"p{p}": rounded(row[f"p{p}"]) for p in PERCENTILES},
+            }
+            for row in stats
+        ]
+        return JsonResponse({"results": results})
+
+    @action(detail=False, methods=["GET"])
+    def slowest(self, request):
+        runs = (
+            self.get_runs(request)
+            .order_by("-duration", "-started_at")
+            .values(
+                "id",
+                "duration",
+                "error",
+                "finished_at",
+                "output_size",
+                "started_at",
+                "status",
+                task_id=F(self.run_field),
+                name=F(f"{self.run_field}__name"),
+            )
+        )
+        return JsonResponse(
+            {"results": list(runs[: parse_limit(request.query_params)])}
+        )
@@ -18,6 +18,8 @@ import logfire
 import sentry_sdk
 from sentry_sdk.integrations.django import DjangoIntegration
 
+from mainframe.core.redis import get_connection_pool
+
 env = environ.Env(
     ALLOWED_HOSTS=(list, []),
     CORS_ALLOW_ALL_ORIGINS=(bool, False),
@@ -277,19 +279,30 @@ elif ENV not in ["ci", "test"]:
     raise ValueError(f"Invalid ENV variable set: {ENV}")
 
 
+REDIS = {
+    "url": env("REDIS_URL", default=None) or "redis://localhost:6379",
+    "max_connections": env.int("REDIS_MAX_CONNECTIONS", default=16),
+    "timeout": env.int("REDIS_POOL_TIMEOUT", default=5),  # Wait for a free slot.
+    "health_check_interval": env.int("REDIS_HEALTH_CHECK_INTERVAL", default=30),
+    "socket_keepalive": True,
+}
+
+# CPU-bound jobs (PDF/xlsx parsing, ML) - see mainframe.core.processes. 0 = inline
+PROCESS_POOL_WORKERS = env.int("PROCESS_POOL_WORKERS", default=1)
+
 HUEY = {
-    "huey_class": "huey.RedisHuey",  # Huey's implementation to use.
-    "results": True,  # Store return values of tasks.
+    "huey_class": "mainframe.core.huey.MainframeHuey",  # Emits an enqueued signal.
+    "results": True,  # Store return values of tasks with a result_ttl.
+    "result_max_size": 64 * 1024,  # Skip larger (serialized) results.
     "store_none": False,  # If a task returns None, do not save to results.
     "immediate": False,  # If DEBUG=True, run synchronously.
     "utc": True,  # Use UTC for all times internally.
     "blocking": True,  # Perform blocking pop rather than poll Redis.
     "connection": {
-        "connection_pool": None,  # Definitely you should use pooling!
-        # ... tons of other options, see redis-py for details.
+        # Shared with get_redis_client() - see mainframe.core.redis.
+        "connection_pool": get_connection_pool(**REDIS),
         # huey-specific connection parameters.
         "read_timeout": 1,  # If not polling (blocking pop), use timeout.
-        "url": env("REDIS_URL", default=None),  # Allow Redis config via a DSN.
     },
     "consumer": {
         "workers": 3,
@@ -302,6 +315,14 @@ HUEY = {
         "check_worker_health": True,  # Enable worker health checks.
         "health_check_interval": 1,  # Check worker health every second.
     },
+    # Extra queues, each with its own consumer (manage.py run_huey_lane <lane>).
+    # Values override "consumer" above for that lane.
+    "lanes": {
+        "cpu": {
+            "workers": env.int("HUEY_CPU_WORKERS", default=1),
+            "worker_type": "process",
+        },
+    },
 }
 ACTSTREAM_SETTINGS = {"USE_JSONFIELD": True}
 SITE_ID = 1
@@ -1,51 +1,179 @@
 import asyncio
+import bisect
+import itertools
 import json
 import logging
+import math
+import threading
+import time
+from datetime import timedelta
+from typing import NamedTuple
 
-from django.conf import settings
+from django.apps import apps
 from django.db import close_old_connections
 from django.utils import timezone
 from huey import crontab, signals
-from huey.contrib.djhuey import HUEY, periodic_task, task
+from huey.contrib.djhuey import HUEY, db_task, periodic_task, task
 
 from mainframe.clients.chat import send_telegram_message
 from mainframe.clients.system import run_cmd
+from mainframe.core.huey import SIGNAL_ENQUEUED
+from mainframe.core.jobs import run_job
+from mainframe.core.redis import get_redis_client
 
 logger = logging.getLogger(__name__)
 
+TASK_ERRORS_LIMIT = 30
+TASK_HISTORY_LIMIT = 1000
+TASK_HISTORY_PAGE_SIZE = 25
+TASK_HISTORY_TTL = timedelta(days=30)
+TASK_METRICS_BUCKETS = (0.1, 0.5, 1, 5, 10, 30, 60, 300)
+TASK_METRICS_SAMPLES = 500
+TASK_FINAL_SIGNALS = (signals.SIGNAL_COMPLETE, signals.SIGNAL_ERROR)
 
-def get_redis_client():
-    return HUEY.storage.redis_client.from_url(settings.HUEY["connection"]["url"])
+_started_at: dict[str, float] = {}
+
+
+def get_task_keys(name):
+    return f"tasks.{name}.errors", f"tasks.{name}.history"
 
 
 def log_status(key, error=None, **kwargs):
     stamp = {"timestamp": timezone.now().isoformat()}
-    redis_client = get_redis_client()
-    key = f"tasks.{key}"
     new_event = {**stamp, **kwargs}
     errors = [{**stamp, "msg": error}] if error else []
+    errors_key, history_key = get_task_keys(key)
+    ttl = int(TASK_HISTORY_TTL.total_seconds())
+
+    with get_redis_client().pipeline() as pipe:
+        pipe.lpush(history_key, json.dumps(new_event))
+        pipe.ltrim(history_key, 0, TASK_HISTORY_LIMIT - 1)
+        pipe.expire(history_key, ttl)
+        if errors:
+            pipe.lpush(errors_key, json.dumps(errors[0]))
+            pipe.ltrim(errors_key, 0, TASK_ERRORS_LIMIT - 1)
+            pipe.expire(errors_key, ttl)
+        pipe.execute()
+    return {"errors": errors, "history": [new_event]}
+
+
+def queue_task_status(pipe, name, page=1, page_size=TASK_HISTORY_PAGE_SIZE):
+    errors_key, history_key = get_task_keys(name)
+    start = (max(page, 1) - 1) * page_size
+    pipe.lrange(history_key, start, start + page_size - 1)
+    pipe.lrange(errors_key, 0, TASK_ERRORS_LIMIT - 1)
+    pipe.llen(history_key)
+    pipe.llen(errors_key)
+
+
+def parse_task_status(replies):
+    """Consume the pipeline replies queued by `queue_task_status` for one task"""
+    history, errors, history_count, errors_count = itertools.islice(replies, 4)
+    if not history_count:
+        return {}
+    return {
+        "errors": [json.loads(e) for e in errors],
+        "errors_count": errors_count,
+        "history": [json.loads(e) for e in history],
+        "history_count": history_count,
+    }
+
+
+def get_task_status(name, page=1, page_size=TASK_HISTORY_PAGE_SIZE):
+    with get_redis_client().pipeline(transaction=False) as pipe:
+        queue_task_status(pipe, name, page, page_size)
+        return parse_task_status(iter(pipe.execute()))
+
+
+def delete_task_status(name):
+    # also drops the pre-list JSON blob that used to live under tasks.<name>
+    return get_redis_client().delete(*get_task_keys(name), f"tasks.{name}")
+
+
+def get_metrics_keys(name):
+    return f"tasks.{name}.durations", f"tasks.{name}.waits"
+
+
+def record_timing(signal, t):
+    """Track enqueue -> start -> finish for a task run.
 
-    details = json.loads(redis_client.get(key) or "{}")
-    if not details:
-        details = {"errors": errors, "history": [new_event]}
+    The enqueue time is shared through Redis since periodic tasks are enqueued
+    by the scheduler and ad-hoc ones by the web process, while the start time
+    stays in memory: a run always starts and finishes in the same worker.
+    """
+    now = time.time()
+    enqueued_key = f"tasks.enqueued.{t.id}"
+    durations_key, waits_key = get_metrics_keys(t.name)
+    ttl = int(TASK_HISTORY_TTL.total_seconds())
+
+    if signal == SIGNAL_ENQUEUED:
+        get_redis_client().set(enqueued_key, now, ex=ttl)
+        return
+
+    if signal == signals.SIGNAL_EXECUTING:
+        _started_at[t.id] = now
+        with get_redis_client().pipeline() as pipe:
+            pipe.get(enqueued_key)
+            pipe.delete(enqueued_key)
+            enqueued_at, _ = pipe.execute()
+        if not enqueued_at:
+            return
+        key, sample = waits_key, now - float(enqueued_at)
+    elif (started_at := _started_at.pop(t.id, None)) and signal in TASK_FINAL_SIGNALS:
+        key, sample = durations_key, now - started_at
     else:
-        if "errors" not in details:
-            details["errors"] = errors
-        else:
-            details["errors"] = [*errors, *details["errors"][:29]]
-        details["history"] = [new_event, *details["history"][:999]]
-    redis_client.set(key, json.dumps(details))
-    return details
+        return
+
+    with get_redis_client().pipeline() as pipe:
+        pipe.lpush(key, round(sample, 3))
+        pipe.ltrim(key, 0, TASK_METRICS_SAMPLES - 1)
+        pipe.expire(key, ttl)
+        pipe.execute()
+
+
+def percentile(values, percent):
+    # nearest-rank on an already sorted list
+    return values[max(math.ceil(percent / 100 * len(values)) - 1, 0)]
+
+
+def summarize(samples):
+    if not samples:
+        return {"count": 0}
+
+    values = sorted(float(s) for s in samples)
+    histogram = [
+        {"le": bucket, "count": bisect.bisect_right(values, bucket)}
+        for bucket in TASK_METRICS_BUCKETS
+    ]
+    return {
+        "count": len(values),
+        "histogram": [*histogram, {"le": None, "count": len(values)}],
+        "max": values[-1],
+        "mean": round(sum(values) / len(values), 3),
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+    }
+
+
+def get_task_metrics(name):
+    durations_key, waits_key = get_metrics_keys(name)
+    with get_redis_client().pipeline(transaction=False) as pipe:
+        pipe.lrange(durations_key, 0, -1)
+        pipe.lrange(waits_key, 0, -1)
+        durations, waits = pipe.execute()
+    return {"duration": summarize(durations), "queue_wait": summarize(waits)}
 
 
 @HUEY.signal()
 def signal_handler(signal, t, exc=None):
     if signal == signals.SIGNAL_EXECUTING:
         close_old_connections()
-    log_status(key=t.name, error=str(exc) if exc else None, id=t.id, status=signal)
+    if signal != SIGNAL_ENQUEUED:
+        log_status(key=t.name, error=str(exc) if exc else None, id=t.id, status=signal)
+    record_timing(signal, t)
 
 
-@task(expires=10)
+@task(expires=10, result_ttl=60)
 def schedule_deploy():
     from mainframe.clients import cron
 
@@ -97,16 +225,96 @@ def schedule_deploy():
     return msg
 
 
+class Schedule(NamedTuple):
+    task_name: str
+    expression: str
+    lock: str
+
+
+# (model label, pk) -> Schedule currently registered in this consumer, only
+# touched under _schedules_lock: reconcile runs from any Huey worker thread
+_schedules: dict[tuple[str, int], Schedule] = {}
+_schedules_lock = threading.Lock()
+
+
+def get_schedule(instance) -> Schedule | None:
+    if (class_name := instance.__class__.__qualname__) != "Cron":
+        raise ValueError(f"Unknown task class: {class_name}")
+
+    if not (instance.expression and instance.is_active):
+        return None
+    task_name = f"{instance.__module__}.{instance.name}"
+    return Schedule(task_name, instance.expression, f"{task_name}-lock")
+
+
+def get_runner(instance):
+    # Load the row on every run so edits that don't touch the schedule
+    # (selector, kwargs, log level, etc.) apply without re-registering
+    model, pk = instance.__class__, instance.pk
+
+    def run():
+        try:
+            obj = model.objects.get(pk=pk)
+        except model.DoesNotExist:
+            logger.warning("[%s] %s no longer exists", model.__qualname__, pk)
+            return None
+        return obj.run()
+
+    run.__module__ = model.__module__
+    return run
+
+
+def unregister(task_name):
+    if task_name in HUEY._registry._registry:
+        HUEY._registry.unregister(HUEY._registry.string_to_task(task_name))
+
+
+def reconcile(instances, prune=False):
+    """Bring the periodic tasks registered in this process in line with
+    `instances`, touching only the entries whose schedule changed.
+
+    With `prune`, registered entries missing from `instances` are removed too,
+    so callers can pass every Cron for a full reconciliation.
+    """
+    instances = list(instances)  # query outside of the lock
+    with _schedules_lock:
+        return _reconcile(instances, prune)
+
+
+def _reconcile(instances, prune):
+    report = {"added": [], "removed": [], "updated": [], "unchanged": 0}
+    seen = set()
+    for instance in instances:
+        key = (instance._meta.label, instance.pk)
+        seen.add(key)
+        current, desired = _schedules.get(key), get_schedule(instance)
+        if current == desired:
+            report["unchanged"] += 1
+            continue
+
+        if current:
+            unregister(current.task_name)
+            del _schedules[key]
+        if desired:
+            schedule = crontab(*desired.expression.split())
+            lock_task = HUEY.lock_task(desired.lock)
+            lock_task(periodic_task(schedule, name=instance.name)(get_runner(instance)))
+            _schedules[key] = desired
+
+        action = "updated" if current and desired else "added" if desired else "removed"
+        report[action].append(instance.name)
+        logger.info("[%s] %s: %s", instance.__class__.__qualname__, action, desired)
+
+    if prune:
+        for key in set(_schedules) - seen:
+            schedule = _schedules.pop(key)
+            unregister(schedule.task_name)
+            report["removed"].append(schedule.task_name.split(".")[-1])
+    return report
+
+
 @task()
 def schedule_task(instance, **kwargs):
-    if (class_name := instance.__class__.__qualname__) == "Cron":
-        expression = instance.expression
-    elif class_name == "Watcher":
-        expression = instance.cron
-    else:
-        logger.error("Unknown task class: %s", class_name)
-        return
-
     if kwargs:
         logger.info(
             "[%s][%s] schedule_task got kwargs: %s",
@@ -114,14 +322,19 @@ def schedule_task(instance, **kwargs):
             instance.name,
             kwargs,
         )
+    try:
+        return reconcile([instance])
+    except ValueError as e:
+        logger.error(e)
 
-    task_name = f"{instance.__module__}.{instance.name}"
-    if task_name in HUEY._registry._registry:
-        task_class = HUEY._registry.string_to_task(task_name)
-        HUEY._registry.unregister(task_class)
-        logger.info("Unregistered task: %s", instance)
-    if expression and instance.is_active:
-        schedule = crontab(*expression.split())
-        lock_task = HUEY.lock_task(f"{task_name}-lock")
-        lock_task(periodic_task(schedule, name=instance.name)(instance.run))
-        logger.info("[%s] Scheduled: %s (%s)", class_name, instance.name, expression)
+
+@task()
+def reconcile_tasks():
+    report = reconcile(apps.get_model("crons", "Cron").objects.all(), prune=True)
+    logger.info("Reconciled periodic tasks: %s", report)
+    return report
+
+
+@db_task(lane="cpu")
+def run_command_job(job_id, name, args, kwargs):
+    run_job(job_id, name, args, kwargs)
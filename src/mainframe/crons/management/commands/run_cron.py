@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from mainframe.crons.models import Cron
+
+
+class Command(BaseCommand):
+    help = "Run a cron's command in this process - used by subprocess crons"
+
+    def add_arguments(self, parser):
+        parser.add_argument("cron_id", type=int)
+
+    def handle(self, *_, **options):
+        try:
+            cron = Cron.objects.get(pk=options["cron_id"])
+        except Cron.DoesNotExist as e:
+            raise CommandError(f"Cron {options['cron_id']} does not exist") from e
+        cron.run_inline()
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-17 07:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("crons", "0012_alter_cron_log_level"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="cron",
+            name="mode",
+            field=models.IntegerField(
+                choices=[(1, "Inline"), (2, "Subprocess")], default=1
+            ),
+        ),
+        migrations.AddField(
+            model_name="cron",
+            name="timeout",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.2.18 on 2026-10-17 07:14
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("crons", "0013_cron_mode_cron_timeout"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CronRun",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("duration", models.FloatField()),
+                ("error", models.TextField(blank=True)),
+                ("finished_at", models.DateTimeField()),
+                ("output_size", models.PositiveIntegerField(default=0)),
+                ("started_at", models.DateTimeField()),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[("complete", "Complete"), ("error", "Error")],
+                        max_length=16,
+                    ),
+                ),
+                (
+                    "cron",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="runs",
+                        to="crons.cron",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["cron", "started_at"],
+                        name="crons_cronr_cron_id_9a156a_idx",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -1,22 +1,34 @@
+import io
 import logging
+import sys
 
-from django.core.management import call_command, get_commands
+from django.core.management import call_command
 from django.db import models
 from django.db.models import signals
 from django.dispatch import receiver
+from django.utils import timezone
 
+from mainframe.core.commands import get_command
 from mainframe.core.logs import capture_command_logs
-from mainframe.core.models import TimeStampedModel
+from mainframe.core.models import RunModel, TimeStampedModel
 from mainframe.core.tasks import schedule_task
+from mainframe.crons.subprocesses import run_tracked
 
 
 class Cron(TimeStampedModel):
+    MODE_INLINE = 1
+    MODE_SUBPROCESS = 2
+
+    MODE_CHOICES = ((MODE_INLINE, "Inline"), (MODE_SUBPROCESS, "Subprocess"))
+
     command = models.CharField(max_length=512)
     expression = models.CharField(max_length=32)
     is_active = models.BooleanField(default=False)
     kwargs = models.JSONField(default=dict)
     log_level = models.IntegerField(default=logging.WARNING)
+    mode = models.IntegerField(choices=MODE_CHOICES, default=MODE_INLINE)
     name = models.CharField(max_length=255, unique=True)
+    timeout = models.PositiveIntegerField(blank=True, null=True)  # seconds
 
     class Meta:
         unique_together = ("command", "kwargs", "expression")
@@ -28,14 +40,44 @@ class Cron(TimeStampedModel):
         display += f" {self.expression}"
         return display
 
-    def run(self) -> None:
-        app = {k: v for k, v in get_commands().items() if "mainframe" in v}[
-            self.command
-        ]
+    def run(self, stdout=None) -> None:
+        """Run the command and record the run - its output is also written to
+        `stdout` if given"""
+        run = CronRun(cron=self, started_at=timezone.now())
+        try:
+            if self.mode == self.MODE_SUBPROCESS:
+                output = run_tracked(self)
+            else:
+                output = self.run_inline()
+        except Exception as e:
+            run.finish(error=e)
+            raise
+        run.finish(output_size=len(output))
+        if stdout is not None:
+            stdout.write(output)
+
+    def run_inline(self) -> str:
+        """Run the command in this process, returning its output"""
+        app, command_class = get_command(self.command)
         logger = logging.getLogger(f"{app}.management.commands.{self.command}")
 
+        output = io.StringIO()
         with capture_command_logs(logger, self.log_level, span_name=str(self)):
-            call_command(self.command, **self.kwargs)
+            try:
+                call_command(command_class(), stdout=output, **self.kwargs)
+            finally:
+                sys.stdout.write(output.getvalue())
+        return output.getvalue()
+
+
+class CronRun(RunModel):
+    cron = models.ForeignKey(Cron, on_delete=models.CASCADE, related_name="runs")
+
+    class Meta:
+        indexes = [models.Index(fields=("cron", "started_at"))]
+
+    def __str__(self):
+        return f"{self.cron.name} at {self.started_at} ({self.status})"
 
 
 @receiver(signals.post_delete, sender=Cron)
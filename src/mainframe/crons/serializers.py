@@ -1,4 +1,3 @@
-import json
 import logging
 
 import redis
@@ -6,8 +5,9 @@ from cron_descriptor import get_description
 from crontab import CronTab
 from rest_framework import serializers
 
+from mainframe.core.commands import get_command_registry
 from mainframe.core.serializers import ScheduleTaskIsRenamedSerializer
-from mainframe.core.tasks import get_redis_client
+from mainframe.core.tasks import get_task_status
 from mainframe.crons.models import Cron
 
 logger = logging.getLogger(__name__)
@@ -21,6 +21,12 @@ class CronSerializer(ScheduleTaskIsRenamedSerializer):
         model = Cron
         fields = "__all__"
 
+    @staticmethod
+    def validate_command(value):
+        if value not in get_command_registry():
+            raise serializers.ValidationError(f"Unknown command: {value}")
+        return value
+
     @staticmethod
     def validate_expression(value):
         if value:
@@ -38,7 +44,7 @@ class CronSerializer(ScheduleTaskIsRenamedSerializer):
     @staticmethod
     def get_redis(obj):
         try:
-            result = json.loads(get_redis_client().get(f"tasks.{obj.name}") or "{}")
+            result = get_task_status(obj.name)
         except redis.exceptions.ConnectionError as e:
             logger.error("Error in CronSerializer.get_redis: %s", e)
             return {}
@@ -0,0 +1,88 @@
+import json
+import logging
+import os
+import signal
+import subprocess
+import sys
+import time
+
+import psutil
+from django.conf import settings
+from django.core.management import CommandError
+
+from mainframe.core.redis import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = 60 * 60
+# create_time() is rounded differently than what Popen returned right after
+START_TIME_TOLERANCE = 1
+
+
+def get_process_key(cron):
+    return f"crons.{cron.pk}.process"
+
+
+def get_tracked(cron) -> dict | None:
+    """PID and start time of the subprocess running `cron`, if any"""
+    data = get_redis_client().get(get_process_key(cron))
+    return json.loads(data) if data else None
+
+
+def get_start_time(pid):
+    try:
+        return psutil.Process(pid).create_time()
+    except psutil.NoSuchProcess:  # already done
+        return time.time()
+
+
+def run_tracked(cron) -> str:
+    """Run `cron` in its own process group through `manage.py run_cron`,
+    killing it after `cron.timeout` seconds (DEFAULT_TIMEOUT if not set).
+    Returns its output.
+
+    The PID is kept in Redis while it runs so it can be killed directly.
+    """
+    timeout = cron.timeout or DEFAULT_TIMEOUT
+    manage = settings.BASE_DIR.parent / "manage.py"
+    process = subprocess.Popen(  # noqa: S603
+        [sys.executable, str(manage), "run_cron", str(cron.pk)],
+        start_new_session=True,
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    key = get_process_key(cron)
+    client = get_redis_client()
+    tracked = {"pid": process.pid, "started_at": get_start_time(process.pid)}
+    client.set(key, json.dumps(tracked), ex=timeout + 60)
+    logger.info("[%s] Started subprocess %d", cron.name, process.pid)
+    try:
+        output, _ = process.communicate(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        os.killpg(process.pid, signal.SIGKILL)
+        process.communicate()
+        raise CommandError(f"[{cron.name}] Timed out after {timeout}s") from None
+    finally:
+        client.delete(key)
+    sys.stdout.write(output)
+    if process.returncode:
+        raise CommandError(f"[{cron.name}] Exited with code {process.returncode}")
+    return output
+
+
+def kill(cron) -> bool:
+    """Kill the subprocess running `cron` and its children.
+
+    Returns False if it isn't running in a tracked subprocess.
+    """
+    if not (tracked := get_tracked(cron)):
+        return False
+    try:
+        process = psutil.Process(tracked["pid"])
+        if abs(process.create_time() - tracked["started_at"]) > START_TIME_TOLERANCE:
+            return False  # the PID was reused
+        os.killpg(process.pid, signal.SIGKILL)
+    except (psutil.NoSuchProcess, ProcessLookupError):
+        return False
+    logger.info("[%s] Killed subprocess %d", cron.name, process.pid)
+    return True
@@ -0,0 +1,18 @@
+from huey import crontab
+from huey.contrib.djhuey import db_periodic_task, db_task
+
+from mainframe.core.jobs import get_command_logger, track_job
+from mainframe.crons.models import Cron, CronRun
+
+
+@db_periodic_task(crontab(minute="15", hour="3"))
+def prune_cron_runs():
+    deleted, _ = CronRun.prune()
+    return deleted
+
+
+@db_task(lane="cpu")
+def run_cron_job(job_id, cron_id):
+    cron = Cron.objects.get(pk=cron_id)
+    with track_job(job_id, get_command_logger(cron.command)) as output:
+        cron.run(stdout=output)
@@ -1,40 +1,48 @@
 import logging
 
-import psutil
-from django.core.exceptions import ValidationError
 from django.core.management import CommandError
 from django.http import JsonResponse
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAdminUser
 
-from mainframe.crons.models import Cron
+from mainframe.core.jobs import create_job
+from mainframe.core.runs import RunStatsMixin
+from mainframe.crons import subprocesses
+from mainframe.crons.models import Cron, CronRun
 from mainframe.crons.serializers import CronSerializer
+from mainframe.crons.tasks import run_cron_job
 
 logger = logging.getLogger(__name__)
 
 
-class CronViewSet(viewsets.ModelViewSet):
+class CronViewSet(RunStatsMixin, viewsets.ModelViewSet):
     queryset = Cron.objects.order_by("-is_active", "command")
     serializer_class = CronSerializer
     permission_classes = (IsAdminUser,)
+    run_model = CronRun
+    run_field = "cron"
 
     @action(detail=True, methods=["put"])
     def kill(self, request, **kwargs):
         instance: Cron = self.get_object()
-        for process in psutil.process_iter():
-            if instance.command in " ".join(process.cmdline()):
-                process.kill()
-                return JsonResponse(data={}, status=status.HTTP_204_NO_CONTENT)
-        return JsonResponse(data={}, status=status.HTTP_404_NOT_FOUND)
+        if subprocesses.kill(instance):
+            return JsonResponse(data={}, status=status.HTTP_204_NO_CONTENT)
+        return JsonResponse(
+            data={"detail": "Not running in a tracked subprocess"},
+            status=status.HTTP_404_NOT_FOUND,
+        )
 
     @action(detail=True, methods=["put"])
     def run(self, request, **kwargs):
+        """Queue the cron and return its job id right away - poll it through
+        commands/jobs/<job_id>/"""
         instance: Cron = self.get_object()
         try:
-            instance.run()
-        except (CommandError, ValidationError) as e:
+            job_id = create_job(instance.command, kwargs=instance.kwargs)
+        except CommandError as e:
             return JsonResponse(
                 data={"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST
             )
-        return JsonResponse(data={"detail": "ok"}, status=status.HTTP_204_NO_CONTENT)
+        run_cron_job(job_id, instance.pk)
+        return JsonResponse(data={"job_id": job_id}, status=status.HTTP_202_ACCEPTED)
@@ -5,6 +5,7 @@ from bs4 import BeautifulSoup
 from defusedxml import ElementTree
 
 from mainframe.clients.scraper import fetch
+from mainframe.core.facets import bump_data_version
 from mainframe.exchange.models import ExchangeRate
 
 
@@ -48,6 +49,7 @@ class BaseExchange:
             unique_fields=list(*ExchangeRate._meta.unique_together),
             batch_size=self.batch_size,
         )
+        bump_data_version(ExchangeRate)
         return len(rates)
 
     def fetch_available_urls(self) -> list[str]:
@@ -1,5 +1,6 @@
 from django.db import models
 
+from mainframe.core.facets import track
 from mainframe.core.models import TimeStampedModel
 
 
@@ -24,3 +25,6 @@ class ExchangeRate(TimeStampedModel):
 
     def __str__(self):
         return f"{self.date} - {self.symbol} - {self.value}"
+
+
+track(ExchangeRate)
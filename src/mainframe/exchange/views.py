@@ -2,10 +2,22 @@ from rest_framework import viewsets
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.settings import api_settings
 
+from mainframe.core.facets import get_facets
 from mainframe.exchange.models import ExchangeRate
 from mainframe.exchange.serializers import ExchangeRateSerializer
 
 
+def get_facets_data():
+    return {
+        f"{field}s": list(
+            ExchangeRate.objects.distinct(field)
+            .order_by(field)
+            .values_list(field, flat=True)
+        )
+        for field in ("source", "symbol")
+    }
+
+
 class ExchangePagination(api_settings.DEFAULT_PAGINATION_CLASS):
     page_size = 31
 
@@ -29,9 +41,8 @@ class ExchangeRateViewSet(viewsets.ModelViewSet):
         return queryset
 
     def list(self, request, *args, **kwargs):
-        symbols = ExchangeRate.objects.distinct("symbol").order_by("symbol")
-        sources = ExchangeRate.objects.distinct("source").order_by("source")
         response = super().list(request, *args, **kwargs)
-        response.data["symbols"] = symbols.values_list("symbol", flat=True)
-        response.data["sources"] = sources.values_list("source", flat=True)
+        response.data.update(
+            get_facets("exchange.rates", (ExchangeRate,), get_facets_data)
+        )
         return response
@@ -11,6 +11,9 @@ from mainframe.finance.models import Pension, UnitValue
 
 logger = logging.getLogger(__name__)
 
+# unit values are published once a day
+CACHE_TTL = 30 * 60
+
 
 def extract_azt(response, pensions):
     soup = BeautifulSoup(response.content, "html.parser")
@@ -69,6 +72,7 @@ class Command(BaseCommand):
             logger=logger,
             timeout=15,
             soup=False,
+            cache_ttl=CACHE_TTL,
             json=json.loads(payload) if ":7777" not in url else None,
         )
         if error:
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-17 07:19
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+
+
+def populate_search_vector(apps, _):
+    apps.get_model("finance", "Transaction").objects.update(
+        search_vector=SearchVector(
+            "description", "additional_data", "amount", "type", "started_at"
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("finance", "0069_remove_pension_total_units"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="transaction",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.RunPython(populate_search_vector, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="transaction",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="finance_tra_search__57a258_gin"
+            ),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-17 07:22
+
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("finance", "0070_transaction_search_vector"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        # not part of the model state - see Transaction.Meta
+        migrations.RunSQL(
+            "CREATE INDEX finance_tra_descrip_trgm ON finance_transaction "
+            "USING gin (description gin_trgm_ops)",
+            "DROP INDEX finance_tra_descrip_trgm",
+        ),
+    ]
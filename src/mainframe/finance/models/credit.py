@@ -4,6 +4,7 @@ from django.db import models
 from django.db.models import Q
 
 from mainframe.core.defaults import DECIMAL_DEFAULT_KWARGS
+from mainframe.core.facets import track
 from mainframe.core.models import TimeStampedModel
 
 NULLABLE_KWARGS = {"blank": True, "null": True}
@@ -128,3 +129,6 @@ class Timetable(TimeStampedModel):
 
     def __str__(self):
         return f"{self.date} | {self.interest}% ({self.ircc}% IRCC + {self.margin}%)"
+
+
+track(Account)
@@ -1,5 +1,6 @@
 from django.db import models
 
+from mainframe.core.facets import track
 from mainframe.core.models import TimeStampedModel
 
 
@@ -77,3 +78,6 @@ class CryptoTransaction(TimeStampedModel):
             f"{self.get_type_display()} {self.value} "
             f"{self.currency} {self.symbol or ''}"
         )
+
+
+track(CryptoTransaction)
@@ -1,5 +1,6 @@
 from django.db import models
 
+from mainframe.core.facets import track
 from mainframe.core.models import TimeStampedModel
 
 
@@ -87,3 +88,6 @@ class StockTransaction(TimeStampedModel):
             f"{self.get_type_display()} {self.total_amount} "
             f"{self.currency} {self.ticker or ''}"
         )
+
+
+track(StockTransaction)
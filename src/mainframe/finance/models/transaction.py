@@ -1,5 +1,8 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.db import models
 
+from mainframe.core.facets import track
 from mainframe.core.models import TimeStampedModel
 from mainframe.finance.models import DECIMAL_DEFAULT_KWARGS, NULLABLE_KWARGS
 
@@ -21,6 +24,9 @@ class TransactionQuerySet(models.QuerySet):
     def expenses(self):
         return self.filter(amount__lt=0)
 
+    def update_search_vector(self):
+        return self.update(search_vector=SearchVector(*Transaction.SEARCH_FIELDS))
+
 
 class Transaction(TimeStampedModel):
     CONFIRMED_BY_UNCONFIRMED = 0
@@ -69,6 +75,9 @@ class Transaction(TimeStampedModel):
         (TYPE_UNIDENTIFIED, TYPE_UNIDENTIFIED.capitalize()),
     )
 
+    # what `search_vector` is built from - see update_search_vector
+    SEARCH_FIELDS = ("description", "additional_data", "amount", "type", "started_at")
+
     account = models.ForeignKey("finance.Account", on_delete=models.CASCADE)
     additional_data = models.JSONField(blank=True, default=dict, null=True)
     amount = models.DecimalField(**DECIMAL_DEFAULT_KWARGS)
@@ -98,6 +107,7 @@ class Transaction(TimeStampedModel):
         default=PRODUCT_CURRENT,
         max_length=11,
     )
+    search_vector = SearchVectorField(editable=False, null=True)
     started_at = models.DateTimeField()
     state = models.CharField(max_length=24)
     type = models.CharField(
@@ -109,6 +119,10 @@ class Transaction(TimeStampedModel):
     objects = TransactionQuerySet.as_manager()
 
     class Meta:
+        # + a pg_trgm GIN index on description (similarity / autocomplete),
+        # created in migration 0071 only, so databases without the extension
+        # can still build the schema
+        indexes = [GinIndex(fields=["search_vector"])]
         ordering = ["-completed_at"]
 
     def __str__(self):
@@ -117,3 +131,12 @@ class Transaction(TimeStampedModel):
             f"{self.amount} {self.currency} "
             f"{f'- {self.completed_at}' if self.completed_at else self.state}"
         )
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or set(update_fields) & set(self.SEARCH_FIELDS):
+            Transaction.objects.filter(pk=self.pk).update_search_vector()
+
+
+track(Category, Transaction)
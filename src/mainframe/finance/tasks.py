@@ -18,12 +18,12 @@ def backup_finance_model(model):
     logger.warning("Attempted to backup '%s' in local env", model)
 
 
-@db_task(expires=30)
+@db_task(expires=30, lane="cpu")
 def backup_finance(model):
     call_command("backup", app="finance", model=model)
 
 
-@db_task()
+@db_task(lane="cpu")
 def predict(queryset, logger):
     import pandas as pd
 
@@ -55,7 +55,7 @@ def predict(queryset, logger):
     return transactions
 
 
-@db_task(expires=10)
+@db_task(expires=10, lane="cpu")
 def train(logger):
     import pandas as pd
 
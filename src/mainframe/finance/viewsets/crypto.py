@@ -10,6 +10,7 @@ from mainframe.clients.finance.crypto import (
     CryptoPnLImporter,
     CryptoTransactionsImporter,
 )
+from mainframe.core.facets import get_facets
 from mainframe.finance.models import CryptoPnL, CryptoTransaction
 from mainframe.finance.serializers import (
     CryptoPnLSerializer,
@@ -18,6 +19,24 @@ from mainframe.finance.serializers import (
 from mainframe.finance.viewsets.mixins import PnlActionModelViewSet
 
 
+def get_facets_data():
+    return {
+        "currencies": list(
+            CryptoTransaction.objects.values_list("currency", flat=True)
+            .exclude(currency="")
+            .distinct("currency")
+            .order_by("currency")
+        ),
+        "symbols": list(
+            CryptoTransaction.objects.filter(symbol__isnull=False)
+            .values_list("symbol", flat=True)
+            .distinct("symbol")
+            .order_by("symbol")
+        ),
+        "transactions_count": CryptoTransaction.objects.count(),
+    }
+
+
 class CryptoViewSet(PnlActionModelViewSet):
     permission_classes = (IsAdminUser,)
     pnl_importer_class = CryptoPnLImporter
@@ -54,20 +73,9 @@ class CryptoViewSet(PnlActionModelViewSet):
             return type_display.replace(" -", "").replace(" ", "_")
 
         response = super().list(request, *args, **kwargs)
-        currencies = (
-            CryptoTransaction.objects.values_list("currency", flat=True)
-            .exclude(currency="")
-            .distinct("currency")
-            .order_by("currency")
-        )
-        symbols = (
-            CryptoTransaction.objects.filter(symbol__isnull=False)
-            .values_list("symbol", flat=True)
-            .distinct("symbol")
-            .order_by("symbol")
-        )
-        response.data["currencies"] = currencies
-        response.data["symbols"] = symbols
+        facets = get_facets("finance.crypto", (CryptoTransaction,), get_facets_data)
+        currencies, symbols = facets["currencies"], facets["symbols"]
+        response.data.update(facets)
         aggregations = CryptoTransaction.objects.aggregate(
             **{
                 f"{normalize_type(_type_display)}_total_{currency}": Sum(
@@ -139,6 +147,5 @@ class CryptoViewSet(PnlActionModelViewSet):
             for (k, v) in aggregations.items()
             if k.endswith("_quantity") and v
         ]
-        response.data["transactions_count"] = CryptoTransaction.objects.count()
         response.data["types"] = CryptoTransaction.TYPE_CHOICES
         return response
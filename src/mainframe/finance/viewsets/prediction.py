@@ -1,4 +1,3 @@
-import json
 import logging
 
 import redis
@@ -16,7 +15,7 @@ from rest_framework import viewsets
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAdminUser
 
-from mainframe.core.tasks import get_redis_client, log_status
+from mainframe.core.tasks import delete_task_status, get_task_status, log_status
 from mainframe.finance.models import Category, Transaction
 from mainframe.finance.tasks import predict, train
 
@@ -31,8 +30,8 @@ FINAL_STATUSES = [
     SIGNAL_LOCKED,
     SIGNAL_REVOKED,
 ]
-PREDICT_KEY = "tasks.predict"
-TRAIN_KEY = "tasks.train"
+PREDICT_KEY = "predict"
+TRAIN_KEY = "train"
 
 
 class PredictionViewSet(viewsets.ViewSet):
@@ -40,29 +39,24 @@ class PredictionViewSet(viewsets.ViewSet):
     error = "Tasks backend unreachable"
 
     def list(self, request, *args, **kwargs):
-        redis_client = get_redis_client()
         try:
-            train_data = redis_client.get(TRAIN_KEY)
+            train_data = get_task_status(TRAIN_KEY) or None
         except redis.exceptions.ConnectionError:
             logger.exception(self.error)
             return JsonResponse({"detail": self.error}, status=400)
-        train_data = json.loads(train_data) if train_data else None
-        predict_data = redis_client.get(PREDICT_KEY)
-        predict_data = json.loads(predict_data) if predict_data else None
+        predict_data = get_task_status(PREDICT_KEY) or None
         return JsonResponse({"train": train_data, "predict": predict_data})
 
     @action(methods=["put"], detail=False, url_path="start-prediction")
     def start_prediction(self, request, *args, **kwargs):
-        redis_client = get_redis_client()
         try:
-            redis_entry = redis_client.get(PREDICT_KEY)
+            details = get_task_status(PREDICT_KEY)
         except redis.exceptions.ConnectionError:
             logger.exception(self.error)
             return JsonResponse({"detail": self.error}, status=400)
-        details = json.loads(redis_entry) if redis_entry else {}
         if (status := details.get("status")) and status not in FINAL_STATUSES:
             return JsonResponse({"detail": f"prediction - {status}"}, status=400)
-        redis_client.delete(PREDICT_KEY)
+        delete_task_status(PREDICT_KEY)
 
         queryset = Transaction.objects.expenses().filter(
             category=Category.UNIDENTIFIED,
@@ -78,17 +72,15 @@ class PredictionViewSet(viewsets.ViewSet):
 
     @action(methods=["put"], detail=False, url_path="start-training")
     def start_training(self, request, *args, **kwargs):
-        redis_client = get_redis_client()
         try:
-            redis_entry = redis_client.get(TRAIN_KEY)
+            details = get_task_status(TRAIN_KEY)
         except redis.exceptions.ConnectionError:
             logger.exception(self.error)
             return JsonResponse({"detail": self.error}, status=400)
 
-        details = json.loads(redis_entry) if redis_entry else {}
         if (status := details.get("status")) and status not in FINAL_STATUSES:
             return JsonResponse({"detail": f"training - {status}"}, status=400)
-        redis_client.delete(TRAIN_KEY)
+        delete_task_status(TRAIN_KEY)
 
         try:
             train(logger)
@@ -101,14 +93,12 @@ class PredictionViewSet(viewsets.ViewSet):
 
     @action(methods=["get"], detail=False, url_path="predict-status")
     def predict_status(self, request, *args, **kwargs):
-        redis_client = get_redis_client()
-        if not (task := redis_client.get(PREDICT_KEY)):
+        if not (task := get_task_status(PREDICT_KEY)):
             raise Http404
-        return JsonResponse(data={"type": "predict", **json.loads(task)})
+        return JsonResponse(data={"type": "predict", **task})
 
     @action(methods=["get"], detail=False, url_path="train-status")
     def train_status(self, request, *args, **kwargs):
-        redis_client = get_redis_client()
-        if not (task := redis_client.get(TRAIN_KEY)):
+        if not (task := get_task_status(TRAIN_KEY)):
             raise Http404
-        return JsonResponse(data={"type": "train", **json.loads(task)})
+        return JsonResponse(data={"type": "train", **task})
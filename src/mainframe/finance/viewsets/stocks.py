@@ -10,6 +10,7 @@ from mainframe.clients.finance.stocks import (
     StockPnLImporter,
     StockTransactionsImporter,
 )
+from mainframe.core.facets import get_facets
 from mainframe.finance.models import PnL, StockTransaction
 from mainframe.finance.serializers import PnLSerializer, StockTransactionSerializer
 from mainframe.finance.viewsets.mixins import PnlActionModelViewSet
@@ -17,6 +18,23 @@ from mainframe.finance.viewsets.mixins import PnlActionModelViewSet
 logger = logging.getLogger(__name__)
 
 
+def get_facets_data():
+    return {
+        "currencies": list(
+            StockTransaction.objects.values_list("currency", flat=True)
+            .distinct("currency")
+            .order_by("currency")
+        ),
+        "tickers": list(
+            StockTransaction.objects.filter(ticker__isnull=False)
+            .values_list("ticker", flat=True)
+            .distinct("ticker")
+            .order_by("ticker")
+        ),
+        "transactions_count": StockTransaction.objects.count(),
+    }
+
+
 class StocksViewSet(PnlActionModelViewSet):
     permission_classes = (IsAdminUser,)
     pnl_importer_class = StockPnLImporter
@@ -50,19 +68,9 @@ class StocksViewSet(PnlActionModelViewSet):
             return type_display.replace(" -", "").replace(" ", "_")
 
         response = super().list(request, *args, **kwargs)
-        currencies = (
-            StockTransaction.objects.values_list("currency", flat=True)
-            .distinct("currency")
-            .order_by("currency")
-        )
-        tickers = (
-            StockTransaction.objects.filter(ticker__isnull=False)
-            .values_list("ticker", flat=True)
-            .distinct("ticker")
-            .order_by("ticker")
-        )
-        response.data["currencies"] = currencies
-        response.data["tickers"] = tickers
+        facets = get_facets("finance.stocks", (StockTransaction,), get_facets_data)
+        currencies, tickers = facets["currencies"], facets["tickers"]
+        response.data.update(facets)
         aggregations = StockTransaction.objects.aggregate(
             **{
                 f"{normalize_type(_type_display)}_total_{currency}": Sum(
@@ -133,6 +141,5 @@ class StocksViewSet(PnlActionModelViewSet):
             for (k, v) in aggregations.items()
             if k.endswith("_quantity") and v
         ]
-        response.data["transactions_count"] = StockTransaction.objects.count()
         response.data["types"] = StockTransaction.TYPE_CHOICES
         return response
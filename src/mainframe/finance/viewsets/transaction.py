@@ -1,8 +1,8 @@
 import logging
 from operator import itemgetter
 
-from django.contrib.postgres.search import SearchVector
-from django.db.models import Count, F, Sum
+from django.contrib.postgres.search import TrigramSimilarity, TrigramWordSimilarity
+from django.db.models import Count, F, Max, Sum
 from django.http import JsonResponse
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
@@ -10,9 +10,33 @@ from rest_framework.permissions import IsAdminUser
 from rest_framework.response import Response
 
 from mainframe.clients.finance.statement import StatementImportError, import_statement
+from mainframe.core.facets import bump_data_version, get_facets
 from mainframe.finance.models import Account, Category, Transaction
 from mainframe.finance.serializers import TransactionSerializer
 
+AUTOCOMPLETE_LIMIT = 10
+AUTOCOMPLETE_LIMIT_MAX = 50
+
+
+def get_transaction_facets():
+    return {
+        "types": list(
+            Transaction.objects.expenses()
+            .values_list("type", flat=True)
+            .distinct("type")
+            .order_by("type")
+        ),
+        "categories": list(
+            Category.objects.values_list("id", flat=True).order_by("id")
+        ),
+        "accounts": list(Account.objects.values("id", "bank", "type")),
+        "unidentified_count": (
+            Transaction.objects.expenses()
+            .filter(category=Category.UNIDENTIFIED)
+            .count()
+        ),
+    }
+
 
 class TransactionViewSet(viewsets.ModelViewSet):
     permission_classes = (IsAdminUser,)
@@ -32,12 +56,38 @@ class TransactionViewSet(viewsets.ModelViewSet):
                 category_suggestion_id=None,
                 confirmed_by=Transaction.CONFIRMED_BY_ML,
             )
+        bump_data_version(Transaction)
         response = self.list(request, *args, **kwargs)
         response.data["msg"] = {
             "message": f"Successfully updated {total} transaction categories"
         }
         return response
 
+    @action(methods=["get"], detail=False)
+    def autocomplete(self, request, *args, **kwargs):
+        """Distinct descriptions close to `q` (typos included) with their count,
+        best matches first"""
+        if not (term := request.query_params.get("q", "").strip()):
+            return JsonResponse(
+                {"msg": "Search term (q) required"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            limit = int(request.query_params.get("limit", AUTOCOMPLETE_LIMIT))
+        except ValueError:
+            limit = AUTOCOMPLETE_LIMIT
+        limit = min(max(limit, 1), AUTOCOMPLETE_LIMIT_MAX)
+        results = (
+            Transaction.objects.filter(description__trigram_word_similar=term)
+            .values("description")
+            .annotate(
+                count=Count("id"),
+                similarity=Max(TrigramWordSimilarity(term, "description")),
+            )
+            .order_by("-similarity", "-count", "description")
+        )
+        return JsonResponse({"results": list(results[:limit])})
+
     @action(methods=["put"], detail=False, url_path="bulk-update-preview")
     def bulk_update_preview(self, request, *args, **kwargs):
         if not request.data:
@@ -91,11 +141,13 @@ class TransactionViewSet(viewsets.ModelViewSet):
         if month := params.get("month"):
             queryset = queryset.filter(started_at__month=month)
         if search_term := params.get("search_term"):
-            queryset = queryset.annotate(
-                search=SearchVector(
-                    "description", "additional_data", "amount", "type", "started_at"
-                ),
-            ).filter(search=search_term)
+            queryset = queryset.filter(search_vector=search_term)
+        if similar_to := params.get("similar_to"):
+            queryset = (
+                queryset.filter(description__trigram_similar=similar_to)
+                .annotate(similarity=TrigramSimilarity("description", similar_to))
+                .order_by("-similarity", "-started_at")
+            )
         if types := params.getlist("type"):
             queryset = queryset.filter(type__in=types)
         if year := params.get("year"):
@@ -134,6 +186,7 @@ class TransactionViewSet(viewsets.ModelViewSet):
                 else Transaction.CONFIRMED_BY_UNCONFIRMED
             ),
         )
+        bump_data_version(Transaction)
         response = self.list(request, *args, **kwargs)
         response.data["msg"] = {
             "message": f"Successfully updated {total} transactions",
@@ -142,22 +195,14 @@ class TransactionViewSet(viewsets.ModelViewSet):
         return response
 
     def _populate_filters(self, response):
-        response.data["types"] = (
-            Transaction.objects.expenses()
-            .values_list("type", flat=True)
-            .distinct("type")
-            .order_by("type")
+        response.data.update(
+            get_facets(
+                "finance.transactions",
+                (Account, Category, Transaction),
+                get_transaction_facets,
+            )
         )
         response.data["confirmed_by_choices"] = Transaction.CONFIRMED_BY_CHOICES
-        response.data["categories"] = Category.objects.values_list(
-            "id", flat=True
-        ).order_by("id")
-        response.data["accounts"] = Account.objects.values("id", "bank", "type")
-        response.data["unidentified_count"] = (
-            Transaction.objects.expenses()
-            .filter(category=Category.UNIDENTIFIED)
-            .count()
-        )
         response.data["page_amount"] = self.get_queryset().aggregate(Sum("amount"))[
             "amount__sum"
         ]
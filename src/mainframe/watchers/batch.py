@@ -0,0 +1,303 @@
+import asyncio
+import hashlib
+import json
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta
+from http import HTTPStatus
+from typing import NamedTuple
+from urllib.parse import urlsplit
+
+import aiohttp
+import redis
+from croniter import croniter
+from django.utils import timezone
+from huey.signals import SIGNAL_COMPLETE, SIGNAL_ERROR
+
+from mainframe.core.logs import capture_command_logs
+from mainframe.core.processes import arun_in_process
+from mainframe.core.redis import get_redis_client
+from mainframe.core.tasks import log_status
+from mainframe.watchers.models import (
+    Watcher,
+    WatcherElementsNotFound,
+    WatcherError,
+    WatcherItem,
+    WatcherRun,
+    parse_responses,
+)
+
+logger = logging.getLogger(__name__)
+
+HOST_CONCURRENCY = 2
+RETRIES = 1
+TIMEOUT = 10
+# Watcher.request is written for requests.request - these map 1:1 onto aiohttp
+REQUEST_KWARGS = ("allow_redirects", "cookies", "data", "headers", "json", "params")
+
+LAST_MINUTE_KEY = "watchers.last_minute"
+# minutes missed for longer (outages, deploys) are not caught up on
+MAX_CATCH_UP = timedelta(hours=1)
+
+
+class Fetch(NamedTuple):
+    # links, None (not modified) or the exception
+    links: list | Exception | None
+    # of the request, shared by the watchers with the same request key
+    started_at: datetime
+    finished_at: datetime
+
+
+def get_pending_minutes(now) -> list[datetime]:
+    """Minutes after the last processed one up to `now`'s, so a late run or
+    one skipped because the previous run held the lock is caught up on and a
+    repeated run of the same minute finds nothing due"""
+    now = now.replace(second=0, microsecond=0)
+    try:
+        last = get_redis_client().get(LAST_MINUTE_KEY)
+    except redis.exceptions.RedisError as e:
+        logger.warning("Could not read the last processed minute: %s", e)
+        last = None
+    if last is None:
+        return [now]
+
+    minute = timedelta(minutes=1)
+    start = datetime.fromtimestamp(int(last), tz=now.tzinfo) + minute
+    start = max(start, now - MAX_CATCH_UP + minute)
+    return [start + minute * i for i in range((now - start) // minute + 1)]
+
+
+def set_last_minute(minute):
+    try:
+        get_redis_client().set(
+            LAST_MINUTE_KEY,
+            int(minute.timestamp()),
+            ex=int(MAX_CATCH_UP.total_seconds()),
+        )
+    except redis.exceptions.RedisError as e:
+        logger.warning("Could not store the last processed minute: %s", e)
+
+
+def get_due_watchers(*minutes) -> list[Watcher]:
+    """Active watchers due in any of `minutes` - once, however many match"""
+    watchers = Watcher.objects.filter(is_active=True).exclude(cron="")
+    return [w for w in watchers if any(croniter.match(w.cron, m) for m in minutes)]
+
+
+def get_cache_key(watcher):
+    """Validators only hold for the same request and selectors"""
+    config = [watcher.type, watcher.url, watcher.selector, watcher.request]
+    return hashlib.sha256(json.dumps(config, sort_keys=True).encode()).hexdigest()
+
+
+def get_http_cache(watcher) -> dict:
+    cache = watcher.http_cache
+    return cache if cache.get("key") == get_cache_key(watcher) else {}
+
+
+def get_conditional_headers(cache) -> dict:
+    headers = {}
+    if etag := cache.get("etag"):
+        headers["If-None-Match"] = etag
+    if last_modified := cache.get("last_modified"):
+        headers["If-Modified-Since"] = last_modified
+    return headers
+
+
+def get_request(watcher) -> tuple[str, dict]:
+    kwargs = {k: v for k, v in watcher.request.items() if k in REQUEST_KWARGS}
+    if watcher.request.get("verify") is False:
+        kwargs["ssl"] = False
+    return watcher.request.get("method", "GET"), kwargs
+
+
+def get_request_key(watcher):
+    """Watchers with the same key get the same response"""
+    return json.dumps([watcher.url, *get_request(watcher)], sort_keys=True)
+
+
+def get_shared_conditional_headers(watchers) -> dict:
+    """Validators can only be sent if every watcher sharing the request has
+    them, otherwise a 304 would leave some watchers without a body"""
+    headers = [get_conditional_headers(get_http_cache(w)) for w in watchers]
+    return headers[0] if all(h == headers[0] for h in headers) else {}
+
+
+async def fetch_content(
+    session, limits, url, method, kwargs
+) -> tuple[int, bytes, dict]:
+    for attempt in range(RETRIES + 1):
+        async with limits[urlsplit(url).hostname]:
+            try:
+                async with session.request(
+                    method, url, raise_for_status=True, **kwargs
+                ) as response:
+                    return response.status, await response.read(), response.headers
+            except (aiohttp.ClientError, TimeoutError) as e:
+                if attempt == RETRIES:
+                    raise WatcherError(e) from e
+
+
+async def fetch_links(session, limits, watchers) -> list:
+    """Fetch the response `watchers` share once and parse it once for all of
+    them. Returns links, None if the response is unchanged (304 or same body)
+    since the last parse or the parse error, per watcher - updates their
+    `http_cache`"""
+    url = watchers[0].url
+    logger.info("Sending request to '%s' for %d watcher(s)", url, len(watchers))
+    method, kwargs = get_request(watchers[0])
+    if conditional := get_shared_conditional_headers(watchers):
+        kwargs["headers"] = {**kwargs.get("headers", {}), **conditional}
+    status, content, headers = await fetch_content(session, limits, url, method, kwargs)
+    if status == HTTPStatus.NOT_MODIFIED:
+        return [None] * len(watchers)
+
+    content_hash = hashlib.sha256(content).hexdigest()
+    caches = [
+        {
+            "key": get_cache_key(watcher),
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "hash": content_hash,
+        }
+        for watcher in watchers
+    ]
+    results = [None] * len(watchers)
+    changed = [
+        i
+        for i, watcher in enumerate(watchers)
+        if content_hash != get_http_cache(watcher).get("hash")
+    ]
+    if changed:
+        targets = [
+            (w.type, url, w.selector, w.latest_url)
+            for w in map(watchers.__getitem__, changed)
+        ]
+        parsed = await arun_in_process(parse_responses, content, targets)
+        for i, links in zip(changed, parsed, strict=True):
+            if isinstance(links, Exception):  # parse it again next time
+                caches[i] = {}
+            results[i] = links
+
+    # only once parsed, so a failed parse is not skipped as unchanged next time
+    for watcher, cache in zip(watchers, caches, strict=True):
+        watcher.http_cache = cache
+    return results
+
+
+async def fetch_group(session, limits, watchers) -> list[Fetch]:
+    started_at = timezone.now()
+    try:
+        results = await fetch_links(session, limits, watchers)
+    except Exception as e:  # noqa: BLE001 - the whole group failed
+        results = [e] * len(watchers)
+        for watcher in watchers:  # fetch and parse it again next time
+            watcher.http_cache = {}
+    finished_at = timezone.now()
+    return [Fetch(links, started_at, finished_at) for links in results]
+
+
+async def fetch_all(watchers) -> list[Fetch]:
+    """Fetch and parse all `watchers` concurrently, at most HOST_CONCURRENCY
+    requests per host at a time and one request per distinct URL, method and
+    request options. Returns the links, None (not modified) or the exception
+    and when its request started and finished per watcher"""
+    groups = defaultdict(list)
+    for i, watcher in enumerate(watchers):
+        groups[get_request_key(watcher)].append(i)
+
+    limits = defaultdict(lambda: asyncio.Semaphore(HOST_CONCURRENCY))
+    timeout = aiohttp.ClientTimeout(total=TIMEOUT)
+    async with aiohttp.ClientSession(timeout=timeout) as session:
+        responses = await asyncio.gather(
+            *(
+                fetch_group(session, limits, [watchers[i] for i in group])
+                for group in groups.values()
+            )
+        )
+
+    results = [None] * len(watchers)
+    for group, response in zip(groups.values(), responses, strict=True):
+        for i, fetch in zip(group, response, strict=True):
+            results[i] = fetch
+    return results
+
+
+def process(watcher, links) -> tuple[bool, list]:
+    """Notify about new `links` (or the fetch error). Returns whether the
+    watcher changed and the new results"""
+    changed = watcher.send_pending(logger)
+    if links is None:
+        logger.info("[%s] Not modified", watcher.name)
+        log_status(watcher.name, status=SIGNAL_COMPLETE, new=0, not_modified=True)
+        return changed, []
+    if isinstance(links, WatcherElementsNotFound):
+        logger.warning("[%s] %s", watcher.name, links)
+        links = []
+    elif isinstance(links, Exception):
+        logger.error("[%s] %s", watcher.name, links)
+        log_status(watcher.name, error=str(links), status=SIGNAL_ERROR)
+        return changed, []
+
+    if results := watcher.find_new(links):
+        watcher.notify(results, logger)
+        changed = True
+    else:
+        logger.info("[%s] No new items", watcher.name)
+    log_status(watcher.name, status=SIGNAL_COMPLETE, new=len(results))
+    return changed, results
+
+
+def get_run_error(links):
+    """A page without matches is a normal run, other exceptions are errors"""
+    if isinstance(links, WatcherElementsNotFound) or not isinstance(links, Exception):
+        return None
+    return links
+
+
+def run_due_watchers(now=None) -> list[Watcher]:
+    """Run every watcher due since the last processed minute in one concurrent
+    fetch wave and save the changes with a single bulk update"""
+    if not (minutes := get_pending_minutes(now or timezone.now())):
+        return []
+    if not (watchers := get_due_watchers(*minutes)):
+        set_last_minute(minutes[-1])
+        return []
+
+    caches = [watcher.http_cache for watcher in watchers]
+    results = asyncio.run(fetch_all(watchers))
+
+    updated, items, runs = [], [], []
+    for watcher, cache, fetch in zip(watchers, caches, results, strict=True):
+        links, processing_started_at = fetch.links, timezone.now()
+        with capture_command_logs(logger, watcher.log_level, span_name=str(watcher)):
+            try:
+                changed, results = process(watcher, links)
+            except Exception as e:  # noqa: BLE001 - one watcher must not stop the rest
+                logger.exception("[%s] %s", watcher.name, e)
+                log_status(watcher.name, error=str(e), status=SIGNAL_ERROR)
+                error, output_size = e, 0
+            else:
+                error = get_run_error(links)
+                output_size = len(links) if isinstance(links, list) else 0
+                if changed or watcher.http_cache != cache:
+                    watcher.updated_at = timezone.now()
+                    updated.append(watcher)
+                # only the new results, like Watcher.run_once
+                items.extend(watcher.get_items(results))
+
+        # a run lasts its own request and its own processing, not the time
+        # spent on the watchers processed before it
+        run = WatcherRun(watcher=watcher, started_at=fetch.started_at)
+        finished_at = fetch.finished_at + (timezone.now() - processing_started_at)
+        run.finish(error, output_size, commit=False, finished_at=finished_at)
+        runs.append(run)
+
+    Watcher.objects.bulk_update(
+        updated, ["http_cache", "latest", "pending_data", "updated_at"]
+    )
+    WatcherItem.remember(items)
+    WatcherRun.objects.bulk_create(runs)
+    set_last_minute(minutes[-1])
+    logger.info("Ran %d watchers, %d updated", len(watchers), len(updated))
+    return updated
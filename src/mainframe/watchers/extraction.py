@@ -0,0 +1,105 @@
+import functools
+
+import lxml.html
+import soupsieve
+from bs4 import BeautifulSoup, UnicodeDammit
+from cssselect import SelectorError
+from lxml import etree
+from lxml.cssselect import CSSSelector
+
+FALLBACK_PARSER = "html.parser"
+
+
+@functools.lru_cache(maxsize=256)
+def compile_selector(selector) -> CSSSelector | None:
+    """The selector translated to an lxml XPath once - None if cssselect can't
+    (e.g. some pseudo-classes), those are only matched by the fallback"""
+    try:
+        return CSSSelector(selector, translator="html")
+    except SelectorError:
+        return None
+
+
+@functools.lru_cache(maxsize=256)
+def compile_fallback_selector(selector):
+    return soupsieve.compile(selector)
+
+
+@functools.lru_cache(maxsize=256)
+def compile_path(path):
+    """Accessor for a dotted `path` into decoded JSON"""
+    keys = tuple(path.split("."))
+
+    def access(structure):
+        for key in keys:
+            structure = structure[key]
+        return structure
+
+    return access
+
+
+def parse(content):
+    """lxml document of `content`, None if lxml can't parse it. Bytes are
+    decoded like BeautifulSoup does - lxml assumes latin-1 without a meta
+    charset.
+
+    The whole document is parsed: lxml builds it natively faster than a
+    Python parser target can filter it down to the selected subtrees, and
+    parsing only some tags changes how broken markup is recovered (an unclosed
+    <a> takes in the links after it)"""
+    if isinstance(content, bytes):
+        content = UnicodeDammit(content, is_html=True).unicode_markup
+    try:
+        return lxml.html.document_fromstring(content)
+    except (etree.ParserError, ValueError):
+        return None
+
+
+def get_text(element) -> str:
+    if isinstance(element, lxml.html.HtmlElement):
+        return element.text_content()
+    return element.text
+
+
+def get_attrs(element):
+    if isinstance(element, lxml.html.HtmlElement):
+        return element.attrib
+    return element.attrs
+
+
+def select_document(document, selector) -> list:
+    compiled = compile_selector(selector)
+    return compiled(document) if compiled is not None else []
+
+
+def select(content, selector) -> list:
+    """Parse and select with lxml"""
+    document = parse(content)
+    return select_document(document, selector) if document is not None else []
+
+
+def select_fallback(content, selectors) -> dict[str, list]:
+    """Select with BeautifulSoup's html.parser, from a single parse"""
+    soup = BeautifulSoup(content, features=FALLBACK_PARSER)
+    return {s: compile_fallback_selector(s).select(soup) for s in selectors}
+
+
+def select_elements(content, selector) -> list:
+    """Select with lxml, falling back to html.parser when lxml finds nothing
+    (their error recovery differs on broken markup)"""
+    return select(content, selector) or select_fallback(content, [selector])[selector]
+
+
+def select_many(content, selectors) -> dict[str, list]:
+    """Select several selectors from a single lxml parse of `content` (plus one
+    html.parser parse if any of them comes out empty with lxml)"""
+    selectors = list(dict.fromkeys(selectors))
+    if len(selectors) == 1:
+        return {selectors[0]: select_elements(content, selectors[0])}
+
+    selected = dict.fromkeys(selectors, [])
+    if (document := parse(content)) is not None:
+        selected = {s: select_document(document, s) for s in selectors}
+    if missing := [s for s, elements in selected.items() if not elements]:
+        selected.update(select_fallback(content, missing))
+    return selected
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("watchers", "0014_remove_watcher_has_new_data_watcher_pending_data"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="watcher",
+            name="http_cache",
+            field=models.JSONField(default=dict),
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:59
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("watchers", "0015_watcher_http_cache"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="WatcherItem",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("title", models.TextField()),
+                ("url", models.TextField()),
+                ("url_hash", models.CharField(max_length=32)),
+                (
+                    "watcher",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="items",
+                        to="watchers.watcher",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["updated_at"], name="watchers_wa_updated_70c69f_idx"
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("watcher", "url_hash"), name="unique_watcher_item"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -1,23 +1,32 @@
 import asyncio
+import functools
+import hashlib
+import json
 import logging
+from datetime import timedelta
 from typing import TypedDict
 from urllib.parse import urljoin
 
 from croniter import croniter
-from django.conf import settings
 from django.db import models
-from django.db.models import signals
-from django.dispatch import receiver
 from django.utils import timezone
 from telegram.constants import ParseMode
 
 from mainframe.clients.chat import send_telegram_message
 from mainframe.clients.scraper import fetch
 from mainframe.core.logs import capture_command_logs
-from mainframe.core.models import TimeStampedModel
-from mainframe.core.tasks import schedule_task
+from mainframe.core.models import RunModel, TimeStampedModel
+from mainframe.watchers.extraction import (
+    compile_fallback_selector,
+    compile_path,
+    get_attrs,
+    get_text,
+    select_many,
+)
 
 JSON_EXTENSION = ".json"
+ITEMS_RETENTION = timedelta(days=30)
+NEW_ITEMS_LIMIT = 5
 
 
 class Link(TypedDict):
@@ -31,22 +40,29 @@ class WatcherError(Exception): ...
 class WatcherElementsNotFound(WatcherError): ...
 
 
-def extract(structure, keys):
-    if len(keys) == 1:
-        return structure[keys[0]]
-    return extract(structure[keys[0]], keys[1:])
+def get_title(element):
+    attrs = get_attrs(element)
+    return get_text(element).strip() or attrs.get("title") or attrs.get("aria-label")
 
 
-def fetch_api(watcher, logger) -> list[Link]:
-    response, error = fetch(
-        watcher.url, logger, retries=1, soup=False, **watcher.request
-    )
-    if error:
-        raise WatcherError(error)
+def get_url(url, element):
+    href = get_attrs(element)["href"]
+    return href if href.startswith("http") else str(urljoin(url, href))
+
+
+def get_links(url, elements) -> list[Link]:
+    return [
+        {"title": get_title(e), "url": get_url(url, e)}
+        for e in elements
+        if get_title(e)
+    ]
+
 
-    results = response.json()
+@functools.lru_cache(maxsize=256)
+def compile_api_selector(selector):
+    """Accessors for the list, title and url of an API watcher's selector"""
     try:
-        list_selector, title_selector, url_selector = watcher.selector.split(" ")
+        list_selector, title_selector, url_selector = selector.split(" ")
     except ValueError as e:
         raise WatcherError(
             "API type Watchers must have dotted list, title and url "
@@ -55,42 +71,83 @@ def fetch_api(watcher, logger) -> list[Link]:
 
     if not all((list_selector, title_selector, url_selector)):
         raise WatcherError("Missing one of the selectors")
+    return tuple(map(compile_path, (list_selector, title_selector, url_selector)))
 
+
+def extract_links(selector, data, until=None) -> list[Link]:
+    """Links up to and including the one with the `until` url - newer items
+    come first, so the rest were seen already"""
+    get_results, get_result_title, get_result_url = compile_api_selector(selector)
+    links = []
     try:
-        return [
-            {
-                "title": extract(result, title_selector.split(".")),
-                "url": extract(result, url_selector.split(".")),
-            }
-            for result in extract(results, list_selector.split("."))
-        ]
+        for result in get_results(data):
+            links.append(
+                {"title": get_result_title(result), "url": get_result_url(result)}
+            )
+            if until and links[-1]["url"] == until:
+                break
     except (IndexError, ValueError) as e:
         raise WatcherError(e) from e
+    return links
 
 
-def fetch_web(watcher, logger) -> list[Link]:
-    def get_title(element):
-        return (
-            element.text.strip()
-            or element.attrs.get("title")
-            or element.attrs.get("aria-label")
-        )
+def parse_api_responses(content, targets, results):
+    data = None
+    for i, (kind, _, selector, until) in enumerate(targets):
+        if kind != Watcher.TYPE_API:
+            continue
+        try:
+            data = json.loads(content) if data is None else data
+            results[i] = extract_links(selector, data, until)
+        except WatcherError as e:
+            results[i] = e
+        except Exception as e:  # noqa: BLE001 - isolate the watchers sharing it
+            results[i] = WatcherError(e)
+
+
+def parse_web_responses(content, targets, results):
+    web = []
+    for i, (kind, _, selector, _) in enumerate(targets):
+        if kind == Watcher.TYPE_API:
+            continue
+        try:
+            compile_fallback_selector(selector)  # an invalid one would fail them all
+        except Exception as e:  # noqa: BLE001 - isolate the watchers sharing it
+            results[i] = WatcherError(e)
+        else:
+            web.append(i)
+    if not web:
+        return
 
-    soup, error = fetch(watcher.url, logger, retries=1, **watcher.request)
-    if soup and (elements := soup.select(watcher.selector)):
-        return [
-            {
-                "title": get_title(e),
-                "url": str(urljoin(watcher.url, e.attrs["href"]))
-                if not e.attrs["href"].startswith("http")
-                else e.attrs["href"],
-            }
-            for e in elements
-            if get_title(e)
-        ]
-    if error:
-        raise WatcherError(error)
-    raise WatcherElementsNotFound(f"[{watcher.name}] No elements found")
+    try:
+        selected = select_many(content, [targets[i][2] for i in web])
+    except Exception as e:  # noqa: BLE001
+        for i in web:
+            results[i] = WatcherError(e)
+        return
+
+    for i in web:
+        _, url, selector, _ = targets[i]
+        try:
+            results[i] = get_links(url, selected[selector]) or WatcherElementsNotFound(
+                "No elements found"
+            )
+        except Exception as e:  # noqa: BLE001 - e.g. an anchor without href
+            results[i] = WatcherError(e)
+
+
+def parse_responses(content, targets) -> list[list[Link] | WatcherError]:
+    """Extract links for every (watcher type, url, selector, latest url) in
+    `targets` from the same response body, decoding or parsing it only once. Returns the
+    links or the error per target - picklable for the process pool"""
+    results = [None] * len(targets)
+    parse_api_responses(content, targets, results)
+    parse_web_responses(content, targets, results)
+    return results
+
+
+def hash_url(url):
+    return hashlib.blake2b(url.encode(), digest_size=16).hexdigest()
 
 
 class Watcher(TimeStampedModel):
@@ -102,6 +159,7 @@ class Watcher(TimeStampedModel):
     chat_id = models.BigIntegerField(blank=True, null=True)
     cron = models.CharField(blank=True, max_length=32)
     cron_notification = models.CharField(blank=True, max_length=32)
+    http_cache = models.JSONField(default=dict)  # response validators, see batch.py
     is_active = models.BooleanField(default=False)
     latest = models.JSONField(default=dict)
     pending_data = models.JSONField(default=list)
@@ -118,82 +176,146 @@ class Watcher(TimeStampedModel):
     def __str__(self):
         return self.name
 
-    def fetch(self, logger):
-        fetcher = {
-            self.TYPE_API: fetch_api,
-            self.TYPE_WEB: fetch_web,
-        }.get(self.type)
-        if not fetcher:
+    @property
+    def latest_url(self):
+        return (self.latest or {}).get("url")
+
+    def fetch(self, logger) -> list[Link]:
+        """Request the url and extract the new links, parsing the response the
+        way the batch run does (see batch.py)"""
+        if self.type not in (self.TYPE_API, self.TYPE_WEB):
             raise WatcherError(f"Unexpected watcher type: {self.type}")
 
-        try:
-            results = fetcher(self, logger)
-        except WatcherElementsNotFound as e:
-            logger.warning(e)
+        response, error = fetch(self.url, logger, retries=1, soup=False, **self.request)
+        if error:
+            raise WatcherError(error)
+
+        target = (self.type, self.url, self.selector, self.latest_url)
+        (links,) = parse_responses(response.content, [target])
+        if isinstance(links, WatcherElementsNotFound):
+            logger.warning("[%s] %s", self.name, links)
             return []
+        if isinstance(links, WatcherError):
+            raise links
+        return self.find_new(links)
+
+    def find_new(self, results: list[Link]) -> list[Link]:
+        """Unseen results above the first one seen before (newest come first)"""
+        hashes = [hash_url(result["url"]) for result in results]
+        seen = set()
+        if self.pk:
+            seen = set(
+                self.items.filter(url_hash__in=hashes).values_list(
+                    "url_hash", flat=True
+                )
+            )
+        if not seen:  # no history yet (or the page changed completely)
+            return self.find_new_since_latest(results)
+
+        new, new_hashes = [], set()
+        for result, url_hash in zip(results, hashes, strict=True):
+            if url_hash in seen:
+                break
+            if url_hash not in new_hashes:
+                new.append(result)
+                new_hashes.add(url_hash)
+        return new[:NEW_ITEMS_LIMIT]
+
+    def find_new_since_latest(self, results: list[Link]) -> list[Link]:
         if not (self.latest and self.latest.get("timestamp")):
-            return results[:5]
+            return results[:NEW_ITEMS_LIMIT]
 
         if not (latest_url := self.latest.get("url")):
-            return results[:5]
+            return results[:NEW_ITEMS_LIMIT]
 
         for i, result in enumerate(results):
             if result["url"] == latest_url:
                 if result["title"] != self.latest.get("title"):
-                    return results[: i + 1][:5]
-                return results[:i][:5]
-
-        return results[:5]
+                    return results[: i + 1][:NEW_ITEMS_LIMIT]
+                return results[:i][:NEW_ITEMS_LIMIT]
+
+        return results[:NEW_ITEMS_LIMIT]
+
+    def get_items(self, results: list[Link]) -> list["WatcherItem"]:
+        items = {
+            hash_url(r["url"]): WatcherItem(
+                watcher=self,
+                title=r["title"],
+                url=r["url"],
+                url_hash=hash_url(r["url"]),
+            )
+            for r in reversed(results)  # keep the first (newest) of duplicates
+        }
+        return list(items.values())
+
+    def is_notification_due(self):
+        if not self.cron_notification:
+            return True
+        return croniter.match(self.cron_notification, timezone.now())
+
+    def send_pending(self, logger) -> bool:
+        if not (self.pending_data and self.is_notification_due()):
+            return False
+        logger.info("[%s] Sending pending data", self.name)
+        self.send_notification(self.pending_data)
+        self.pending_data = []
+        return True
+
+    def notify(self, results: list[Link], logger) -> None:
+        """Send (or defer) the new `results` and move `latest` - without saving"""
+        logger.info("[%s] Found new items!", self.name)
+
+        matching_cron = self.is_notification_due()
+        urgent_keywords = ("breaking", "urgent", "alert", "ultima", "ultimă")
+        is_urgent = any(
+            result["title"].lower().startswith(urgent_keywords) for result in results
+        )
+        if is_urgent or matching_cron:
+            logger.info(
+                "[%s] Sending notification (is_urgent=%s, matching_cron=%s)",
+                self.name,
+                is_urgent,
+                matching_cron,
+            )
+            self.send_notification(results)
+        else:
+            logger.info("[%s] Deferring notification to next cron window", self.name)
+            self._accumulate_pending_data(results, logger)
+
+        result = results[0]
+        self.latest = {
+            "title": result["title"],
+            "url": result["url"],
+            "timestamp": timezone.now().isoformat(),
+        }
 
     def run(self):
+        run = WatcherRun(watcher=self, started_at=timezone.now())
+        try:
+            results = self.run_once()
+        except Exception as e:
+            run.finish(error=e)
+            raise
+        run.finish(output_size=len(results))
+        return self if results else None
+
+    def run_once(self) -> list[Link]:
+        """Fetch, notify and store new results - returns them"""
         logger = logging.getLogger(__name__)
         with capture_command_logs(logger, self.log_level, span_name=str(self)):
-            matching_cron = (
-                croniter.match(self.cron_notification, timezone.now())
-                if self.cron_notification
-                else True
-            )
-            if self.pending_data and matching_cron:
-                logger.info("[%s] Sending pending data", self.name)
-                self.send_notification(self.pending_data)
-                self.pending_data = []
+            if self.send_pending(logger):
                 self.save()
 
             if not (results := self.fetch(logger)):
                 logger.info("[%s] No new items", self.name)
-                return None
-
-            logger.info("[%s] Found new items!", self.name)
+                return []
 
-            urgent_keywords = ("breaking", "urgent", "alert", "ultima", "ultimă")
-            is_urgent = any(
-                result["title"].lower().startswith(urgent_keywords)
-                for result in results
-            )
-            if is_urgent or matching_cron:
-                logger.info(
-                    "[%s] Sending notification (is_urgent=%s, matching_cron=%s)",
-                    self.name,
-                    is_urgent,
-                    matching_cron,
-                )
-                self.send_notification(results)
-            else:
-                logger.info(
-                    "[%s] Deferring notification to next cron window", self.name
-                )
-                self._accumulate_pending_data(results, logger)
-
-            result = results[0]
-            self.latest = {
-                "title": result["title"],
-                "url": result["url"],
-                "timestamp": timezone.now().isoformat(),
-            }
+            self.notify(results, logger)
             self.save()
+            WatcherItem.remember(self.get_items(results))
 
             logger.info("[%s] Done", self.name)
-            return self
+            return results
 
     def _accumulate_pending_data(self, new_results: list[Link], logger) -> None:
         """Accumulate new results into pending_data
@@ -268,16 +390,46 @@ class Watcher(TimeStampedModel):
         asyncio.run(send_telegram_message(f"{header}{text}{footer}", **kwargs))
 
 
-@receiver(signals.post_delete, sender=Watcher)
-def post_delete(sender, instance, **kwargs):
-    if settings.ENV != "local":
-        instance.cron = ""
-        schedule_task(instance)
+class WatcherItem(TimeStampedModel):
+    """A result seen by a watcher - `updated_at` is when it was last seen"""
+
+    title = models.TextField()
+    url = models.TextField()
+    url_hash = models.CharField(max_length=32)
+    watcher = models.ForeignKey(Watcher, on_delete=models.CASCADE, related_name="items")
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=("watcher", "url_hash"), name="unique_watcher_item"
+            )
+        ]
+        indexes = [models.Index(fields=("updated_at",))]
+
+    def __str__(self):
+        return self.title
+
+    @classmethod
+    def remember(cls, items):
+        return cls.objects.bulk_create(
+            items,
+            update_conflicts=True,
+            unique_fields=("watcher", "url_hash"),
+            update_fields=("title", "updated_at"),
+        )
+
+    @classmethod
+    def prune(cls):
+        """Forget results not seen in ITEMS_RETENTION"""
+        cutoff = timezone.now() - ITEMS_RETENTION
+        return cls.objects.filter(updated_at__lt=cutoff).delete()
+
+
+class WatcherRun(RunModel):
+    watcher = models.ForeignKey(Watcher, on_delete=models.CASCADE, related_name="runs")
 
+    class Meta:
+        indexes = [models.Index(fields=("watcher", "started_at"))]
 
-@receiver(signals.post_save, sender=Watcher)
-def post_save(sender, instance, **kwargs):
-    if settings.ENV != "local":
-        if getattr(instance, "is_renamed", False):  # set in core/serializers.py update
-            instance.cron = ""
-        schedule_task(instance)
+    def __str__(self):
+        return f"{self.watcher.name} at {self.started_at} ({self.status})"
@@ -1,18 +1,16 @@
-import json
 import logging
 
 import redis.exceptions
 from cron_descriptor import get_description
 from rest_framework import serializers
 
-from mainframe.core.serializers import ScheduleTaskIsRenamedSerializer
-from mainframe.core.tasks import get_redis_client
-from mainframe.watchers.models import Watcher
+from mainframe.core.tasks import get_task_status
+from mainframe.watchers.models import Watcher, WatcherItem
 
 logger = logging.getLogger(__name__)
 
 
-class WatcherSerializer(ScheduleTaskIsRenamedSerializer):
+class WatcherSerializer(serializers.ModelSerializer):
     cron_description = serializers.SerializerMethodField()
     cron_notification_description = serializers.SerializerMethodField()
     redis = serializers.SerializerMethodField()
@@ -20,6 +18,7 @@ class WatcherSerializer(ScheduleTaskIsRenamedSerializer):
     class Meta:
         model = Watcher
         fields = "__all__"
+        read_only_fields = ("http_cache",)
 
     @staticmethod
     def get_cron_description(obj: Watcher) -> str:
@@ -32,8 +31,14 @@ class WatcherSerializer(ScheduleTaskIsRenamedSerializer):
     @staticmethod
     def get_redis(obj):
         try:
-            result = json.loads(get_redis_client().get(f"tasks.{obj.name}") or "{}")
+            result = get_task_status(obj.name)
         except redis.exceptions.ConnectionError as e:
             logger.error("Error in WatcherSerializer.get_redis: %s", e)
             return {}
         return result
+
+
+class WatcherItemSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = WatcherItem
+        fields = ("id", "title", "url", "created_at", "updated_at")
@@ -0,0 +1,23 @@
+from huey import crontab
+from huey.contrib.djhuey import HUEY, db_periodic_task
+
+from mainframe.watchers.batch import run_due_watchers
+from mainframe.watchers.models import WatcherItem, WatcherRun
+
+
+@db_periodic_task(crontab())
+@HUEY.lock_task("run-watchers-lock")
+def run_watchers():
+    return len(run_due_watchers())
+
+
+@db_periodic_task(crontab(minute="30", hour="3"))
+def prune_watcher_items():
+    deleted, _ = WatcherItem.prune()
+    return deleted
+
+
+@db_periodic_task(crontab(minute="45", hour="3"))
+def prune_watcher_runs():
+    deleted, _ = WatcherRun.prune()
+    return deleted
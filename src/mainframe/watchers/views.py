@@ -6,22 +6,36 @@ from rest_framework.decorators import action
 from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAdminUser
 
-from mainframe.watchers.models import Watcher, WatcherError
-from mainframe.watchers.serializers import WatcherSerializer
+from mainframe.core.runs import RunStatsMixin
+from mainframe.watchers.models import Watcher, WatcherError, WatcherRun
+from mainframe.watchers.serializers import WatcherItemSerializer, WatcherSerializer
 
 logger = logging.getLogger(__name__)
 
+ITEMS_LIMIT = 100
 
-class WatcherViewSet(viewsets.ModelViewSet):
+
+class WatcherViewSet(RunStatsMixin, viewsets.ModelViewSet):
     queryset = Watcher.objects.order_by("-is_active", "name")
     serializer_class = WatcherSerializer
     permission_classes = (IsAdminUser,)
+    run_model = WatcherRun
+    run_field = "watcher"
 
     def list(self, request, *args, **kwargs):
         response = super().list(request, *args, **kwargs)
         response.data["types"] = Watcher.TYPE_CHOICES
         return response
 
+    @action(detail=True, methods=["GET"])
+    def items(self, request, pk=None):
+        items = self.get_object().items.order_by("-created_at", "-id")
+        if search := request.query_params.get("search"):
+            items = items.filter(title__icontains=search)
+        return JsonResponse(
+            {"results": WatcherItemSerializer(items[:ITEMS_LIMIT], many=True).data}
+        )
+
     @action(detail=True, methods=["PUT"])
     def run(self, request, pk=None):
         obj: Watcher = self.get_object()
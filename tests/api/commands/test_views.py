@@ -1,6 +1,10 @@
+from unittest import mock
+
 import pytest
 from rest_framework import status
 
+from mainframe.core import commands
+
 
 @pytest.mark.django_db
 class TestCommandsViewSet:
@@ -20,3 +24,71 @@ class TestCommandsViewSet:
             content_type="application/json",
         )
         assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_list_serves_cached_catalog(self, client, staff_session):
+        catalog = [{"app": "mainframe.bots", "commands": []}]
+        with mock.patch(
+            "mainframe.api.commands.views.get_command_catalog", return_value=catalog
+        ):
+            response = client.get("/commands/", HTTP_AUTHORIZATION=staff_session.token)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {"results": catalog}
+
+    def test_refresh(self, client, staff_session):
+        with mock.patch.object(commands, "get_commands", return_value={}):
+            commands.get_command_registry.cache_clear()
+            commands.get_command_catalog.cache_clear()
+            assert commands.get_command_catalog() == []
+
+        response = client.put(
+            "/commands/refresh/", HTTP_AUTHORIZATION=staff_session.token
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        apps = {group["app"] for group in response.json()["results"]}
+        assert "mainframe.crons" in apps
+
+    @mock.patch("mainframe.api.commands.views.run_command_job")
+    @mock.patch("mainframe.api.commands.views.create_job", return_value="a" * 32)
+    def test_run_enqueues_job(self, create_job, run_job, client, staff_session):
+        response = client.put(
+            "/commands/backup/run/",
+            data={"kwargs": {"app": "finance"}},
+            content_type="application/json",
+            HTTP_AUTHORIZATION=staff_session.token,
+        )
+
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert response.json() == {"job_id": "a" * 32}
+        create_job.assert_called_once_with("backup", [], {"app": "finance"})
+        run_job.assert_called_once_with("a" * 32, "backup", [], {"app": "finance"})
+
+    @mock.patch("mainframe.api.commands.views.run_command_job")
+    def test_run_unknown_command(self, run_job, client, staff_session):
+        response = client.put(
+            "/commands/nope/run/", HTTP_AUTHORIZATION=staff_session.token
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json() == {"detail": "Unknown command: nope"}
+        run_job.assert_not_called()
+
+    def test_job(self, client, staff_session):
+        job = {"id": "a" * 32, "status": "running", "output": ["x"], "offset": 3}
+        with mock.patch(
+            "mainframe.api.commands.views.get_job", side_effect=[job, None]
+        ) as get_job:
+            response = client.get(
+                f"/commands/jobs/{'a' * 32}/",
+                {"offset": 2},
+                HTTP_AUTHORIZATION=staff_session.token,
+            )
+            assert response.status_code == status.HTTP_200_OK
+            assert response.json() == job
+            get_job.assert_called_once_with("a" * 32, 2)
+
+            response = client.get(
+                f"/commands/jobs/{'b' * 32}/", HTTP_AUTHORIZATION=staff_session.token
+            )
+            assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,49 @@
+import io
+import uuid
+from unittest import mock
+
+import pytest
+from django.core.management import call_command
+from huey.contrib.djhuey import HUEY
+
+from tests.factories.crons import CronFactory
+
+
+@pytest.mark.django_db
+@mock.patch(
+    "mainframe.api.huey_tasks.management.commands.purge_huey_results.get_redis_client"
+)
+class TestPurgeHueyResultsCommand:
+    def setup_redis(self, mock_redis):
+        CronFactory(name="backup")
+        self.result = str(uuid.uuid4()).encode()
+        mock_redis.return_value.hscan_iter.return_value = [
+            (self.result, b"12345"),
+            (b"rt:mainframe.crons.models.backup", b"1"),
+            (b"rt:mainframe.crons.models.deleted", b"123"),
+            (b"r:" + self.result, b"1"),
+            (b"huey.lock.backup", b"1"),
+        ]
+        return mock_redis.return_value
+
+    def test_purge(self, mock_redis):
+        client = self.setup_redis(mock_redis)
+        out = io.StringIO()
+
+        call_command("purge_huey_results", stdout=out)
+
+        assert "Orphaned: 1 results, 1 revocations (8 bytes)" in out.getvalue()
+        client.hdel.assert_called_once_with(
+            HUEY.storage.result_key,
+            self.result,
+            b"rt:mainframe.crons.models.deleted",
+        )
+
+    def test_dry_run(self, mock_redis):
+        client = self.setup_redis(mock_redis)
+        out = io.StringIO()
+
+        call_command("purge_huey_results", "--dry-run", stdout=out)
+
+        assert "Orphaned: 1 results, 1 revocations (8 bytes)" in out.getvalue()
+        client.hdel.assert_not_called()
@@ -2,8 +2,24 @@ import json
 from unittest import mock
 
 import pytest
+from huey.contrib.djhuey import HUEY
 from rest_framework import status
 
+from mainframe.api.huey_tasks.views import build_registry_snapshot
+
+
+def mock_pipeline(mock_redis, replies):
+    pipe = mock_redis.return_value.pipeline.return_value.__enter__.return_value
+    pipe.execute.return_value = replies
+    return pipe
+
+
+@pytest.fixture(autouse=True)
+def clear_registry_snapshot():
+    build_registry_snapshot.cache_clear()
+    yield
+    build_registry_snapshot.cache_clear()
+
 
 @pytest.mark.django_db
 @mock.patch("mainframe.api.huey_tasks.views.HUEY._registry")
@@ -11,10 +27,10 @@ class TestTasksViewSet:
     @mock.patch("mainframe.api.huey_tasks.views.get_redis_client")
     def test_list_tasks(self, mock_redis, mock_huey, client, staff_session):
         """Test listing all available tasks"""
-        mock_client = mock.MagicMock()
-        mock_client.get.return_value = None
-        mock_redis.return_value = mock_client
-
+        pipe = mock_pipeline(
+            mock_redis,
+            [[None, HUEY.serializer.serialize((None, False))], *[[], [], 0, 0] * 2],
+        )
         mock_huey._registry.__iter__.return_value = [
             "mainframe.api.task1",
             "mainframe.api.task2",
@@ -30,29 +46,29 @@ class TestTasksViewSet:
                     "name": "task1",
                     "id": "api.task1",
                     "is_periodic": False,
-                    "is_revoked": mock.ANY,
+                    "is_revoked": False,
                 },
                 {
                     "app": "api",
                     "name": "task2",
                     "id": "api.task2",
                     "is_periodic": False,
-                    "is_revoked": mock.ANY,
+                    "is_revoked": True,
                 },
             ]
         }
+        pipe.hmget.assert_called_once_with(
+            HUEY.storage.result_key,
+            ["rt:mainframe.api.task1", "rt:mainframe.api.task2"],
+        )
+        pipe.execute.assert_called_once_with()
 
     @mock.patch("mainframe.api.huey_tasks.views.get_redis_client")
     def test_list_tasks_with_history(
         self, mock_redis, mock_huey, client, staff_session
     ):
-        mock_client = mock.MagicMock()
-        task_history = {
-            "history": [{"status": "success", "timestamp": "2024-01-01"}],
-            "errors": [],
-        }
-        mock_client.get.return_value = json.dumps(task_history).encode()
-        mock_redis.return_value = mock_client
+        event = {"status": "success", "timestamp": "2024-01-01"}
+        pipe = mock_pipeline(mock_redis, [[None], [json.dumps(event)], [], 1, 0])
         mock_huey._registry.__iter__.return_value = ["mainframe.core.my_task"]
 
         response = client.get("/tasks/", HTTP_AUTHORIZATION=staff_session.token)
@@ -65,12 +81,15 @@ class TestTasksViewSet:
                     "name": "my_task",
                     "id": "core.my_task",
                     "is_periodic": False,
-                    "is_revoked": mock.ANY,
-                    "history": [{"status": "success", "timestamp": "2024-01-01"}],
+                    "is_revoked": False,
+                    "history": [event],
+                    "history_count": 1,
                     "errors": [],
+                    "errors_count": 0,
                 }
             ]
         }
+        pipe.lrange.assert_any_call("tasks.my_task.history", 0, 0)
 
     def test_tasks_unauthorized(self, _, client, session):
         response = client.get("/tasks/", HTTP_AUTHORIZATION=session.token)
@@ -81,11 +100,12 @@ class TestTasksViewSet:
         assert response.status_code == status.HTTP_403_FORBIDDEN
 
     @mock.patch("mainframe.api.huey_tasks.views.get_redis_client")
-    def test_delete_task_history(self, mock_redis, _, client, staff_session):
-        mock_client = mock.MagicMock()
-        mock_client.delete.return_value = 1
-        mock_client.get.return_value = None
-        mock_redis.return_value = mock_client
+    @mock.patch("mainframe.api.huey_tasks.views.delete_task_status", return_value=1)
+    def test_delete_task_history(
+        self, mock_delete, mock_redis, mock_huey, client, staff_session
+    ):
+        mock_huey._registry.__iter__.return_value = ["mainframe.core.my_task"]
+        mock_pipeline(mock_redis, [[None], [], [], 0, 0])
 
         response = client.delete(
             "/tasks/my_task/delete-history/",
@@ -93,13 +113,10 @@ class TestTasksViewSet:
         )
 
         assert response.status_code == status.HTTP_200_OK
-        mock_client.delete.assert_called_once()
+        mock_delete.assert_called_once_with("my_task")
 
-    @mock.patch("mainframe.api.huey_tasks.views.get_redis_client")
-    def test_delete_task_history_not_found(self, mock_redis, _, client, staff_session):
-        mock_client = mock.MagicMock()
-        mock_client.delete.return_value = 0
-        mock_redis.return_value = mock_client
+    @mock.patch("mainframe.api.huey_tasks.views.delete_task_status", return_value=0)
+    def test_delete_task_history_not_found(self, _, __, client, staff_session):
 
         response = client.delete(
             "/tasks/nonexistent/delete-history/",
@@ -108,3 +125,40 @@ class TestTasksViewSet:
 
         assert response.status_code == status.HTTP_400_BAD_REQUEST
         assert response.json() == {"detail": "No history found"}
+
+    @mock.patch("mainframe.api.huey_tasks.views.get_redis_client")
+    def test_retrieve_task_page(self, mock_redis, mock_huey, client, staff_session):
+        mock_huey._registry.__iter__.return_value = ["mainframe.core.my_task"]
+        event = {"status": "complete", "timestamp": "2024-01-01"}
+        pipe = mock_pipeline(mock_redis, [[None], [json.dumps(event)], [], 11, 0])
+
+        response = client.get(
+            "/tasks/my_task/?page=2&page_size=10",
+            HTTP_AUTHORIZATION=staff_session.token,
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["history"] == [event]
+        assert response.json()["history_count"] == 11
+        pipe.lrange.assert_any_call("tasks.my_task.history", 10, 19)
+
+    @mock.patch("mainframe.api.huey_tasks.views.get_redis_client")
+    def test_retrieve_task_not_found(
+        self, mock_redis, mock_huey, client, staff_session
+    ):
+        mock_huey._registry.__iter__.return_value = ["mainframe.core.my_task"]
+
+        response = client.get("/tasks/other/", HTTP_AUTHORIZATION=staff_session.token)
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        mock_redis.assert_not_called()
+
+    @mock.patch(
+        "mainframe.api.huey_tasks.views.get_host_stats",
+        return_value=[{"host": "a.com", "requests": 1}],
+    )
+    def test_hosts(self, _, __, client, staff_session):
+        response = client.get("/tasks/hosts/", HTTP_AUTHORIZATION=staff_session.token)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {"results": [{"host": "a.com", "requests": 1}]}
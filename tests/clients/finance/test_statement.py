@@ -1,9 +1,13 @@
 from datetime import datetime
+from unittest import mock
 from zoneinfo import ZoneInfo
 
+import pytest
 from django.test import override_settings
 
-from mainframe.clients.finance.statement import RevolutParser
+from mainframe.clients.finance.statement import RevolutParser, import_statement
+from mainframe.finance.models import Transaction
+from tests.factories.finance import AccountFactory, CategoryFactory
 
 
 @override_settings(TIME_ZONE="Europe/Bucharest")
@@ -13,3 +17,25 @@ def test_revolut_convert_to_utc_returns_utc_tzinfo():
     # sanity check conversion: in Feb, Bucharest is +02:00
     local = datetime(2026, 2, 21, 14, 0, 0, tzinfo=ZoneInfo("Europe/Bucharest"))
     assert dt == local.astimezone(ZoneInfo("UTC"))
+
+
+@pytest.mark.django_db
+def test_import_statement_indexes_transactions():
+    transactions = [
+        Transaction(
+            account=AccountFactory(),
+            amount=-10,
+            category=CategoryFactory(),
+            currency="RON",
+            description="Coffee shop",
+            started_at="2026-02-21T14:00:00Z",
+        )
+    ]
+    with (
+        mock.patch.object(RevolutParser, "__init__", return_value=None),
+        mock.patch.object(RevolutParser, "run", return_value=transactions),
+        mock.patch("mainframe.clients.finance.statement.backup_finance_model"),
+    ):
+        import_statement("statement.csv", mock.Mock())
+
+    assert list(Transaction.objects.filter(search_vector="coffee")) == transactions
@@ -0,0 +1,134 @@
+import asyncio
+import time
+from unittest import mock
+
+import aiohttp
+import pytest
+
+from mainframe.clients import fanout
+from tests.fakes import FakeSession, real_sleep
+
+
+def collect(session, requests, **kwargs):
+    async def run():
+        return [result async for result in fanout.fetch_many(requests, **kwargs)]
+
+    with mock.patch.object(fanout.aiohttp, "ClientSession") as client_session:
+        client_session.return_value.__aenter__.return_value = session
+        return asyncio.run(run())
+
+
+@pytest.fixture(autouse=True)
+def sleep():
+    async def skip(_):
+        await real_sleep(0)
+
+    with mock.patch.object(fanout.asyncio, "sleep", side_effect=skip) as sleep:
+        yield sleep
+
+
+class TestFetchMany:
+    def test_yields_as_completed(self):
+        session = FakeSession(
+            {"http://a/slow": ["slow"], "http://b/fast": ["fast"]},
+            delays={"http://a/slow": 0.02},
+        )
+
+        results = collect(
+            session,
+            [fanout.Request("http://a/slow", 1), fanout.Request("http://b/fast", 2)],
+        )
+
+        assert [(r.request.context, r.status, r.text) for r in results] == [
+            (2, 200, "fast"),
+            (1, 200, "slow"),
+        ]
+
+    def test_limits_requests_per_host(self):
+        urls = [f"http://same/{i}" for i in range(6)]
+        session = FakeSession(
+            {url: ["ok"] for url in urls}, delays=dict.fromkeys(urls, 0.01)
+        )
+
+        results = collect(session, map(fanout.Request, urls), host_concurrency=2)
+
+        assert len(results) == len(urls)
+        assert session.max_active == 2  # noqa: PLR2004
+
+    def test_retries_respecting_retry_after(self, sleep):
+        session = FakeSession(
+            {
+                "http://a": [
+                    (429, "", {"Retry-After": "7"}),
+                    aiohttp.ClientError("reset"),
+                    "ok",
+                ]
+            }
+        )
+
+        (result,) = collect(session, [fanout.Request("http://a")])
+
+        assert result.text == "ok"
+        assert len(session.calls) == 3  # noqa: PLR2004
+        assert sleep.call_args_list[0] == mock.call(7)
+
+    def test_yields_errors_after_retries(self):
+        session = FakeSession(
+            {
+                "http://a": [(503, "down", {})] * 2,
+                "http://b": [TimeoutError()] * 2,
+                "http://c": [(404, "missing", {})],
+            }
+        )
+
+        results = collect(
+            session,
+            map(fanout.Request, ["http://a", "http://b", "http://c"]),
+            retries=1,
+        )
+
+        by_url = {r.request.url: r for r in results}
+        assert by_url["http://a"].status == 503  # noqa: PLR2004
+        assert isinstance(by_url["http://b"].error, TimeoutError)
+        assert by_url["http://c"].status == 404  # noqa: PLR2004
+        assert len(session.calls) == 5  # noqa: PLR2004
+
+    def test_cache_does_not_block_other_requests(self):
+        session = FakeSession(
+            {"http://a": ["a"], "http://b": ["b"]}, delays={"http://b": 0.02}
+        )
+
+        def slow_redis(_):
+            time.sleep(0.05)
+
+        with (
+            mock.patch.object(fanout.scraper, "get_cached_response", slow_redis),
+            mock.patch.object(fanout.scraper, "record_cache"),
+            mock.patch.object(fanout.scraper, "cache_response") as cache_response,
+        ):
+            results = collect(
+                session,
+                [fanout.Request("http://a", cache_ttl=60), fanout.Request("http://b")],
+            )
+
+        assert [r.text for r in results] == ["b", "a"]
+        cache_response.assert_called_once()
+
+
+@pytest.mark.parametrize(
+    ("retry_after", "expected"),
+    [
+        ("3", 3),
+        ("3600", fanout.MAX_RETRY_AFTER),
+        ("-1", 0),
+        ("Wed, 21 Oct 2015 07:28:00 GMT", 0),
+    ],
+)
+def test_get_retry_delay(retry_after, expected):
+    assert fanout.get_retry_delay(retry_after, 0) == expected
+
+
+def test_get_retry_delay_falls_back_to_backoff():
+    with mock.patch.object(fanout, "get_backoff", return_value=1.5):
+        assert fanout.get_retry_delay(None, 0) == 1.5  # noqa: PLR2004
+        assert fanout.get_retry_delay("soon", 0) == 1.5  # noqa: PLR2004
@@ -8,16 +8,27 @@ from mainframe.clients import scraper
 
 
 class FakeResponse:
-    def __init__(self, content):
+    def __init__(self, content, status_code=200):
         self.content = content
+        self.status_code = status_code
 
     def raise_for_status(self):
-        return None
+        if self.status_code >= 400:  # noqa: PLR2004
+            raise requests.exceptions.HTTPError(response=self)
+
+
+@pytest.fixture
+def mock_request():
+    with (
+        mock.patch("mainframe.clients.scraper.get_session") as get_session,
+        mock.patch("mainframe.clients.scraper.record_request"),
+        mock.patch("mainframe.clients.scraper.time.sleep"),
+    ):
+        yield get_session.return_value.request
 
 
 @pytest.mark.django_db
 class TestFetch:
-    @mock.patch("mainframe.clients.scraper.requests.request")
     def test_fetch_returns_soup_on_success(self, mock_request):
         mock_request.return_value = FakeResponse(b"<html><body></body></html>")
         logger = SimpleNamespace(info=lambda *a, **k: None)
@@ -25,7 +36,6 @@ class TestFetch:
         assert err is None
         assert hasattr(res, "select")
 
-    @mock.patch("mainframe.clients.scraper.requests.request")
     def test_fetch_returns_error_on_connection(self, mock_request):
         mock_request.side_effect = requests.exceptions.ConnectionError("conn")
         logger = SimpleNamespace(info=lambda *a, **k: None)
@@ -33,10 +43,168 @@ class TestFetch:
         assert res is None
         assert isinstance(err, Exception)
 
-    @mock.patch("mainframe.clients.scraper.requests.request")
     def test_fetch_return_response_when_soup_false(self, mock_request):
         mock_request.return_value = FakeResponse(b"ok")
         logger = SimpleNamespace(info=lambda *a, **k: None)
         res, err = scraper.fetch("http://x", logger, soup=False)
         assert err is None
         assert hasattr(res, "content")
+
+    def test_retries_with_backoff(self, mock_request):
+        mock_request.side_effect = [
+            FakeResponse(b"", 503),
+            requests.exceptions.ReadTimeout(),
+            FakeResponse(b"ok"),
+        ]
+        logger = mock.MagicMock()
+
+        res, err = scraper.fetch(
+            "http://x", logger, retries=2, soup=False, method="POST", prefix="[p] "
+        )
+
+        assert err is None
+        assert res.content == b"ok"
+        assert (
+            mock_request.call_args_list
+            == [mock.call("POST", "http://x", timeout=10)] * 3
+        )
+        assert scraper.time.sleep.call_count == 2  # noqa: PLR2004
+        assert logger.info.call_args_list[-1].args[:2] == (
+            "%s[fetch] Sending '%s' request to '%s'",
+            "[p] ",
+        )
+
+    def test_does_not_retry_client_errors(self, mock_request):
+        mock_request.return_value = FakeResponse(b"", 404)
+
+        res, err = scraper.fetch("http://x", mock.MagicMock(), retries=3)
+
+        assert res is None
+        assert isinstance(err, requests.exceptions.HTTPError)
+        assert mock_request.call_count == 1
+
+
+class TestSession:
+    def test_shared_per_process(self):
+        session = scraper.get_session()
+        assert scraper.get_session() is session
+        assert session.get_adapter("https://a").poolmanager.connection_pool_kw[
+            "maxsize"
+        ] == (scraper.POOL_SIZE)
+
+        with mock.patch("mainframe.clients.scraper.os.getpid", return_value=-1):
+            assert scraper.get_session() is not session
+        scraper._sessions.pop(-1)
+
+    def test_backoff_is_capped(self):
+        assert all(
+            0 <= scraper.get_backoff(attempt) <= scraper.BACKOFF_MAX
+            for attempt in range(20)
+        )
+
+
+@mock.patch("mainframe.clients.scraper.get_redis_client")
+class TestHostStats:
+    def test_record_request(self, mock_redis):
+        pipe = mock_redis.return_value.pipeline.return_value.__enter__.return_value
+
+        scraper.record_request("https://a.com/x?y=1", 0.12345, error=True)
+
+        pipe.hincrby.assert_has_calls(
+            [
+                mock.call(scraper.HOST_STATS_KEY, "a.com:requests"),
+                mock.call(scraper.HOST_STATS_KEY, "a.com:errors", 1),
+            ]
+        )
+        pipe.hincrbyfloat.assert_called_once_with(
+            scraper.HOST_STATS_KEY, "a.com:seconds", 0.123
+        )
+
+    def test_record_request_ignores_redis_errors(self, mock_redis):
+        mock_redis.return_value.pipeline.side_effect = scraper.redis.ConnectionError
+
+        scraper.record_request("https://a.com", 1)
+
+    def test_get_host_stats(self, mock_redis):
+        mock_redis.return_value.hgetall.return_value = {
+            b"a.com:requests": b"4",
+            b"a.com:errors": b"1",
+            b"a.com:seconds": b"2.0",
+            b"b.com:requests": b"8",
+            b"b.com:errors": b"0",
+            b"b.com:seconds": b"1.0",
+        }
+
+        assert scraper.get_host_stats() == [
+            {
+                "host": "b.com",
+                "requests": 8,
+                "errors": 0,
+                "error_rate": 0,
+                "mean_latency": 0.125,
+                "cache_hits": 0,
+                "cache_misses": 0,
+            },
+            {
+                "host": "a.com",
+                "requests": 4,
+                "errors": 1,
+                "error_rate": 0.25,
+                "mean_latency": 0.5,
+                "cache_hits": 0,
+                "cache_misses": 0,
+            },
+        ]
+
+
+class TestCache:
+    def test_normalize_url(self):
+        assert (
+            scraper.normalize_url("HTTPS://Example.COM?b=2&a=1#top", {"c": 3})
+            == "https://example.com/?a=1&b=2&c=3"
+        )
+
+    def test_cache_key(self):
+        key = scraper.get_cache_key("get", "http://x/?b=2&a=1", {"headers": {"A": 1}})
+
+        assert key.startswith(f"{scraper.CACHE_KEY_PREFIX}:")
+        assert key == scraper.get_cache_key(
+            "GET", "http://x/?a=1", {"headers": {"A": 1}, "params": {"b": 2}}
+        )
+        assert key != scraper.get_cache_key("GET", "http://x/?a=1&b=2", {})
+        assert key != scraper.get_cache_key("POST", "http://x/?a=1&b=2", {})
+
+    def test_serves_cached_responses(self, fake_redis):
+        response = scraper.build_response(
+            "http://x/", 200, b'{"a": 1}', {"Content-Type": "application/json"}
+        )
+        logger = mock.MagicMock()
+
+        with mock.patch("mainframe.clients.scraper.get_session") as get_session:
+            get_session.return_value.request.return_value = response
+            first, _ = scraper.fetch("http://x", logger, soup=False, cache_ttl=60)
+            second, _ = scraper.fetch("http://x", logger, soup=False, cache_ttl=60)
+            soup, _ = scraper.fetch("http://x", logger, cache_ttl=60)
+
+        assert get_session.return_value.request.call_count == 1
+        assert first.json() == second.json() == {"a": 1}
+        assert second.headers["content-type"] == "application/json"
+        assert soup.text == '{"a": 1}'
+        assert fake_redis.ttls[scraper.get_cache_key("GET", "http://x", {})] == 60  # noqa: PLR2004
+        stats = fake_redis.hashes[scraper.HOST_STATS_KEY]
+        assert stats[b"x:cache_hits"] == b"2"
+        assert stats[b"x:cache_misses"] == b"1"
+        assert stats[b"x:requests"] == b"1"
+
+    def test_does_not_cache_large_responses(self, fake_redis):
+        content = b"x" * (scraper.CACHE_MAX_SIZE + 1)
+        scraper.cache_response(
+            "key", 60, scraper.build_response("http://x", 200, content)
+        )
+
+        assert fake_redis.hashes == {}
+
+    def test_redis_errors_are_misses(self):
+        with mock.patch("mainframe.clients.scraper.get_redis_client") as client:
+            client.return_value.hgetall.side_effect = scraper.redis.ConnectionError
+            assert scraper.get_cached_response("key") is None
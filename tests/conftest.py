@@ -1,7 +1,10 @@
+import contextlib
+from unittest import mock
 from unittest.mock import patch
 
 import dotenv
 import pytest
+from django.db import DatabaseError, connection
 
 from tests.factories.authentication import ActiveSessionFactory
 from tests.factories.user import UserFactory
@@ -9,6 +12,117 @@ from tests.factories.user import UserFactory
 dotenv.load_dotenv()
 
 
+@pytest.fixture(scope="session")
+def django_db_setup(django_db_setup, django_db_blocker):
+    """--nomigrations skips the migration creating pg_trgm - add it if this
+    Postgres ships it (contrib) and the test role may create it"""
+    with (
+        django_db_blocker.unblock(),
+        connection.cursor() as cursor,
+        contextlib.suppress(DatabaseError),
+    ):
+        cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+
+@pytest.fixture
+def pg_trgm(db):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+        if not cursor.fetchone():
+            pytest.skip("pg_trgm is not available")
+
+
+# modules importing get_redis_client - the fake_redis fixture patches them all
+REDIS_CLIENT_MODULES = (
+    "mainframe.api.huey_tasks.views",
+    "mainframe.clients.scraper",
+    "mainframe.clients.storage",
+    "mainframe.core.facets",
+    "mainframe.core.jobs",
+    "mainframe.core.tasks",
+    "mainframe.crons.subprocesses",
+    "mainframe.watchers.batch",
+)
+
+
+def encode(value):
+    return value if isinstance(value, bytes) else str(value).encode()
+
+
+class FakeRedis:
+    """Strings, hashes and lists in memory - pipelines run commands right
+    away and execute() returns their replies"""
+
+    def __init__(self):
+        self.data, self.hashes, self.lists, self.ttls = {}, {}, {}, {}
+        self.replies = []
+
+    def pipeline(self, **_):
+        return mock.MagicMock(__enter__=lambda _: self)
+
+    def reply(self, value):
+        self.replies.append(value)
+        return value
+
+    def get(self, key):
+        return self.reply(self.data.get(key))
+
+    def mget(self, keys):
+        return self.reply([self.data.get(key) for key in keys])
+
+    def set(self, key, value, ex=None):
+        self.data[key] = encode(value)
+        self.ttls[key] = ex
+        return self.reply(True)
+
+    def incr(self, key, amount=1):
+        value = int(self.data.get(key, 0)) + amount
+        self.data[key] = encode(value)
+        return self.reply(value)
+
+    def hset(self, key, mapping):
+        encoded = {encode(k): encode(v) for k, v in mapping.items()}
+        self.hashes.setdefault(key, {}).update(encoded)
+        return self.reply(len(mapping))
+
+    def hgetall(self, key):
+        return self.reply(dict(self.hashes.get(key, {})))
+
+    def hincrby(self, key, field, amount=1):
+        fields = self.hashes.setdefault(key, {})
+        value = type(amount)(fields.get(encode(field), 0)) + amount
+        fields[encode(field)] = encode(value)
+        return self.reply(value)
+
+    hincrbyfloat = hincrby
+
+    def rpush(self, key, *values):
+        self.lists.setdefault(key, []).extend(map(encode, values))
+        return self.reply(len(self.lists[key]))
+
+    def lrange(self, key, start, end):
+        return self.reply(self.lists.get(key, [])[start:])
+
+    def expire(self, key, ttl):
+        self.ttls[key] = ttl
+        return self.reply(True)
+
+    def execute(self):
+        replies, self.replies = self.replies, []
+        return replies
+
+
+@pytest.fixture
+def fake_redis():
+    fake = FakeRedis()
+    with contextlib.ExitStack() as stack:
+        for module in REDIS_CLIENT_MODULES:
+            stack.enter_context(
+                mock.patch(f"{module}.get_redis_client", return_value=fake)
+            )
+        yield fake
+
+
 @pytest.fixture(autouse=True)
 def fast_password_hasher(settings):
     """Use a fast password hasher in tests to avoid expensive PBKDF2 hashing."""
@@ -0,0 +1,73 @@
+from unittest import mock
+
+import pytest
+from django.core.management import CommandError
+
+from mainframe.bots.management.commands.backup import Command as BackupCommand
+from mainframe.core import commands
+from tests.factories.crons import CronFactory
+
+
+@pytest.fixture(autouse=True)
+def clear_registry():
+    commands.get_command_registry.cache_clear()
+    commands.get_command_catalog.cache_clear()
+    yield
+    commands.get_command_registry.cache_clear()
+    commands.get_command_catalog.cache_clear()
+
+
+class TestCommandRegistry:
+    def test_loads_mainframe_commands_once(self):
+        with mock.patch.object(
+            commands, "get_commands", wraps=commands.get_commands
+        ) as get_commands:
+            registry = commands.get_command_registry()
+            commands.get_command_registry()
+
+        assert get_commands.call_count == 1
+        assert registry["backup"] == ("mainframe.bots", BackupCommand)
+        assert "migrate" not in registry
+        assert "run_huey" not in registry
+
+    def test_unknown_command(self):
+        with pytest.raises(CommandError, match="Unknown command: nope"):
+            commands.get_command("nope")
+
+
+class TestCommandCatalog:
+    def test_builds_parsers_once(self):
+        with mock.patch.object(
+            commands, "get_custom_arguments", wraps=commands.get_custom_arguments
+        ) as get_arguments:
+            catalog = commands.get_command_catalog()
+            assert commands.get_command_catalog() is catalog
+            calls = get_arguments.call_count
+
+        assert calls == len(commands.get_command_registry())
+        apps = [group["app"] for group in catalog]
+        assert apps == sorted(set(apps))
+        bots = next(group for group in catalog if group["app"] == "mainframe.bots")
+        backup = next(c for c in bots["commands"] if c["name"] == "backup")
+        assert backup["help"] == BackupCommand.help
+
+    def test_refresh(self):
+        catalog = commands.get_command_catalog()
+        with mock.patch.object(
+            commands, "get_commands", wraps=commands.get_commands
+        ) as get_commands:
+            refreshed = commands.refresh_command_catalog()
+
+        assert get_commands.call_count == 1
+        assert refreshed is not catalog
+        assert refreshed == catalog
+
+
+@pytest.mark.django_db
+@mock.patch("mainframe.crons.models.call_command")
+def test_cron_run_dispatches_from_registry(call_command):
+    CronFactory(command="backup", kwargs={"foo": 1}).run()
+
+    (command,), kwargs = call_command.call_args
+    assert isinstance(command, BackupCommand)
+    assert kwargs == {"foo": 1, "stdout": mock.ANY}
@@ -0,0 +1,68 @@
+from unittest import mock
+
+import pytest
+import redis
+
+from mainframe.bots.models import Message
+from mainframe.core import facets
+from mainframe.exchange.models import ExchangeRate
+from tests.factories.exchange import ExchangeRateFactory
+
+
+@pytest.mark.django_db
+class TestFacets:
+    def test_computed_once_per_version(
+        self, fake_redis, django_capture_on_commit_callbacks
+    ):
+        compute = mock.Mock(side_effect=[{"symbols": ["EUR"]}, {"symbols": ["USD"]}])
+
+        assert facets.get_facets("rates", (ExchangeRate,), compute) == {
+            "symbols": ["EUR"]
+        }
+        assert facets.get_facets("rates", (ExchangeRate,), compute) == {
+            "symbols": ["EUR"]
+        }
+        assert compute.call_count == 1
+        assert set(fake_redis.ttls.values()) == {facets.FACETS_TTL.total_seconds()}
+
+        with django_capture_on_commit_callbacks(execute=True):
+            facets.bump_data_version(ExchangeRate)
+        assert facets.get_facets("rates", (ExchangeRate,), compute) == {
+            "symbols": ["USD"]
+        }
+        assert compute.call_count == 2  # noqa: PLR2004
+
+    def test_bump_waits_for_commit(
+        self, fake_redis, django_capture_on_commit_callbacks
+    ):
+        with django_capture_on_commit_callbacks() as callbacks:
+            facets.bump_data_version(ExchangeRate, Message)
+            assert fake_redis.data == {}
+
+        for callback in callbacks:
+            callback()
+        assert fake_redis.data == {
+            "facets.version.exchange.exchangerate": b"1",
+            "facets.version.bots.message": b"1",
+        }
+
+    def test_tracked_models_bump_on_save_and_delete(
+        self, fake_redis, django_capture_on_commit_callbacks
+    ):
+        key = facets.get_version_key(ExchangeRate)
+        with django_capture_on_commit_callbacks(execute=True):
+            rate = ExchangeRateFactory()
+        assert fake_redis.data[key] == b"1"
+
+        with django_capture_on_commit_callbacks(execute=True):
+            rate.delete()
+        assert fake_redis.data[key] == b"2"
+
+    def test_computes_without_redis(self):
+        compute = mock.Mock(return_value={"authors": []})
+        with mock.patch("mainframe.core.facets.get_redis_client") as client:
+            client.return_value.mget.side_effect = redis.exceptions.ConnectionError()
+            assert facets.get_facets("messages", (Message,), compute) == {"authors": []}
+            assert facets.get_facets("messages", (Message,), compute) == {"authors": []}
+
+        assert compute.call_count == 2  # noqa: PLR2004
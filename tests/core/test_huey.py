@@ -0,0 +1,128 @@
+from unittest import mock
+
+import pytest
+from huey.constants import EmptyData
+from huey.contrib.djhuey import HUEY
+
+from mainframe.core.huey import DEFAULT_LANE, SIGNAL_ENQUEUED, MainframeHuey
+from mainframe.core.redis import get_connection_pool
+from mainframe.core.tasks import run_command_job
+from mainframe.crons.tasks import run_cron_job
+from mainframe.finance import tasks
+
+
+@pytest.fixture
+def huey():
+    huey = MainframeHuey(
+        "test",
+        lanes=("cpu",),
+        connection_pool=get_connection_pool("redis://localhost:6379/12"),
+    )
+    for lane in huey.lanes.values():
+        lane.storage.enqueue = mock.Mock()
+    return huey
+
+
+class TestLanes:
+    def test_lanes_share_state(self, huey):
+        cpu = huey.lanes["cpu"]
+        assert huey.lanes[DEFAULT_LANE] is huey
+        assert cpu.lanes is huey.lanes
+        assert cpu._registry is huey._registry
+        assert cpu._signal is huey._signal
+        assert cpu.storage.result_key == huey.storage.result_key
+        assert cpu.storage.queue_key != huey.storage.queue_key
+
+    def test_enqueue_routes_to_lane(self, huey):
+        signals = []
+        huey.signal(SIGNAL_ENQUEUED)(lambda signal, task: signals.append(task.name))
+
+        @huey.task(lane="cpu")
+        def heavy(): ...
+
+        @huey.task()
+        def light(): ...
+
+        heavy()
+        light()
+        huey.lanes["cpu"].enqueue(light.s())
+
+        assert huey.lanes["cpu"].storage.enqueue.call_count == 1
+        assert huey.storage.enqueue.call_count == 2
+        assert signals == ["heavy", "light", "light"]
+
+    def test_unknown_lane_uses_default(self, huey):
+        @huey.task(lane="gpu")
+        def task(): ...
+
+        task()
+        huey.storage.enqueue.assert_called_once()
+
+    def test_finance_tasks_use_cpu_lane(self):
+        assert set(HUEY.lanes) == {DEFAULT_LANE, "cpu"}
+        for task in (tasks.backup_finance, tasks.predict, tasks.train):
+            assert task.task_class.lane == "cpu"
+
+    def test_jobs_use_cpu_lane(self):
+        # long ad-hoc commands must not take the workers run_watchers needs
+        for task in (run_command_job, run_cron_job):
+            assert task.task_class.lane == "cpu"
+
+
+class TestResults:
+    @pytest.fixture
+    def storage(self, huey):
+        with (
+            mock.patch.object(huey.storage, "pop_data", return_value=EmptyData),
+            mock.patch.object(huey.storage, "put_result") as put_result,
+        ):
+            yield put_result
+
+    def test_not_stored_by_default(self, huey, storage):
+        @huey.task()
+        def task():
+            return "result"
+
+        huey._execute(task.s(), None)
+        storage.assert_not_called()
+
+    def test_stored_with_ttl(self, huey, storage):
+        @huey.task(result_ttl=60)
+        def task():
+            return "result"
+
+        t = task.s()
+        huey._execute(t, None)
+        storage.assert_called_once_with(t.id, huey.serializer.serialize("result"), 60)
+        assert not huey._executing
+
+    def test_errors_stored_with_ttl(self, huey, storage):
+        @huey.task(result_ttl=60)
+        def task():
+            raise ValueError
+
+        huey._execute(task.s(), None)
+        storage.assert_called_once()
+
+    def test_max_size(self, huey, storage):
+        @huey.task(result_ttl=60, result_max_size=10)
+        def task():
+            return "x" * 100
+
+        huey._execute(task.s(), None)
+        storage.assert_not_called()
+
+    def test_read_falls_back_to_hash(self, huey):
+        storage = huey.storage
+        with mock.patch.object(storage, "conn") as conn:
+            pipe = conn.pipeline.return_value
+            pipe.execute.return_value = [b"value", False, None]
+            assert storage.peek_data("id") == b"value"
+            pipe.get.assert_called_once_with(f"{storage.result_key}:id")
+
+            pipe.execute.return_value = [None, True, b"legacy", 1, 1]
+            assert storage.pop_data("id") == b"legacy"
+            pipe.hdel.assert_called_once_with(storage.result_key, "id")
+
+            pipe.execute.return_value = [None, False, None]
+            assert storage.peek_data("id") is EmptyData
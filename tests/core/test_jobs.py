@@ -0,0 +1,104 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import pytest
+from django.core.management import CommandError
+
+from mainframe.core import jobs
+
+
+class TestJobs:
+    def test_unknown_command(self, fake_redis):
+        with pytest.raises(CommandError):
+            jobs.create_job("nope")
+        assert fake_redis.hashes == {}
+
+    def test_streams_output_and_status(self, fake_redis):
+        job_id = jobs.create_job("backup", ["x"], {"app": "finance"})
+        assert jobs.get_job(job_id)["status"] == jobs.STATUS_QUEUED
+
+        def command(*args, stdout, stderr, **kwargs):
+            stdout.write("first\nsec")
+            assert jobs.get_job(job_id)["output"] == ["first"]
+            assert jobs.get_job(job_id)["status"] == jobs.STATUS_RUNNING
+            stdout.write("ond\n")
+            stderr.write("warning")
+
+        with mock.patch("mainframe.core.jobs.call_command", side_effect=command):
+            jobs.run_job(job_id, "backup", ["x"], {"app": "finance"})
+
+        job = jobs.get_job(job_id)
+        assert job == {
+            "id": job_id,
+            "args": ["x"],
+            "command": "backup",
+            "created_at": mock.ANY,
+            "finished_at": mock.ANY,
+            "kwargs": {"app": "finance"},
+            "offset": 3,
+            "output": ["first", "second", "warning"],
+            "started_at": mock.ANY,
+            "status": jobs.STATUS_COMPLETE,
+        }
+        assert jobs.get_job(job_id, offset=2)["output"] == ["warning"]
+        assert jobs.get_job(job_id, offset=3)["output"] == []
+        assert set(fake_redis.ttls.values()) == {jobs.JOB_TTL.total_seconds()}
+
+    def test_records_errors(self, fake_redis):
+        job_id = jobs.create_job("backup")
+
+        with (
+            mock.patch(
+                "mainframe.core.jobs.call_command", side_effect=CommandError("boom")
+            ),
+            pytest.raises(CommandError),
+        ):
+            jobs.run_job(job_id, "backup")
+
+        job = jobs.get_job(job_id)
+        assert (job["status"], job["error"]) == (jobs.STATUS_ERROR, "boom")
+
+    def test_concurrent_jobs_keep_their_own_logs(self, fake_redis):
+        job_ids = [jobs.create_job("backup") for _ in range(2)]
+        logger = jobs.get_command_logger("backup")
+        logger.setLevel(logging.INFO)
+        barrier = threading.Barrier(2)
+
+        def command(*args, stdout, stderr, **kwargs):
+            barrier.wait()  # both jobs have their handlers attached
+            logger.info("from %s", threading.current_thread().name)
+            barrier.wait()
+
+        try:
+            with (
+                mock.patch("mainframe.core.jobs.call_command", side_effect=command),
+                ThreadPoolExecutor(2, thread_name_prefix="job") as pool,
+            ):
+                list(pool.map(lambda job_id: jobs.run_job(job_id, "backup"), job_ids))
+        finally:
+            logger.setLevel(logging.NOTSET)
+
+        outputs = [jobs.get_job(job_id)["output"] for job_id in job_ids]
+        assert all(len(output) == 1 for output in outputs)
+        assert outputs[0] != outputs[1]
+        assert not any(
+            isinstance(getattr(h, "stream", None), jobs.JobOutput)
+            for h in logger.handlers
+        )
+
+    def test_output_is_capped(self, fake_redis):
+        output = jobs.JobOutput("1")
+        with mock.patch.object(jobs, "JOB_OUTPUT_LIMIT", 2):
+            output.write("a\nb\nc\n")
+            output.write("d\n")
+
+        assert fake_redis.lists[jobs.get_job_keys("1")[1]] == [
+            b"a",
+            b"b",
+            b"[output truncated]",
+        ]
+
+    def test_missing_job(self, fake_redis):
+        assert jobs.get_job("0" * 32) is None
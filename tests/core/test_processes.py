@@ -0,0 +1,54 @@
+import asyncio
+import math
+import os
+from unittest import mock
+
+import pytest
+
+from mainframe.core import processes
+
+
+@pytest.fixture
+def pool(settings):
+    settings.PROCESS_POOL_WORKERS = 1
+    yield
+    processes.shutdown()
+
+
+class TestProcessPool:
+    def test_runs_in_child_process(self, pool):
+        assert processes.run_in_process(os.getpid, timeout=30) != os.getpid()
+        assert processes.run_in_process(math.factorial, 5) == 120  # noqa: PLR2004
+
+    def test_is_started_lazily_and_reused(self, pool):
+        processes.shutdown()
+        assert processes._executor is None
+        future = processes.submit(math.factorial, 3)
+        assert future.result(timeout=30) == 6  # noqa: PLR2004
+        assert processes.get_executor() is processes._executor is not None
+
+    def test_propagates_exceptions(self, pool):
+        with pytest.raises(ValueError, match="invalid literal"):
+            processes.run_in_process(int, "x", timeout=30)
+
+    def test_async(self, pool):
+        result = asyncio.run(processes.arun_in_process(math.factorial, 4))
+        assert result == 24  # noqa: PLR2004
+
+
+class TestInline:
+    def test_disabled(self, settings):
+        settings.PROCESS_POOL_WORKERS = 0
+        future = processes.submit(os.getpid)
+        assert future.done()
+        assert future.result() == os.getpid()
+        assert processes._executor is None
+
+    def test_inside_child_process(self, pool):
+        with mock.patch.object(processes.multiprocessing, "parent_process"):
+            assert processes.run_in_process(os.getpid) == os.getpid()
+
+    def test_exception(self, settings):
+        settings.PROCESS_POOL_WORKERS = 0
+        future = processes.submit(int, "x")
+        assert isinstance(future.exception(), ValueError)
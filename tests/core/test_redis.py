@@ -0,0 +1,15 @@
+from mainframe.core.redis import get_connection_pool, get_redis_client
+
+
+class TestConnectionPool:
+    def test_reuses_pool_per_url(self):
+        pool = get_connection_pool("redis://localhost:6379/15", max_connections=2)
+        assert get_connection_pool("redis://localhost:6379/15") is pool
+        assert get_connection_pool("redis://localhost:6379/14") is not pool
+        assert pool.max_connections == 2
+
+    def test_client_uses_configured_pool(self, settings):
+        settings.REDIS = {"url": "redis://localhost:6379/13", "max_connections": 3}
+        pool = get_redis_client().connection_pool
+        assert pool is get_redis_client().connection_pool
+        assert pool.connection_kwargs["db"] == 13
@@ -0,0 +1,150 @@
+from datetime import timedelta
+from unittest import mock
+
+import pytest
+from django.core.management import CommandError
+from django.utils import timezone
+from freezegun import freeze_time
+from rest_framework.exceptions import ValidationError
+
+from mainframe.core.runs import parse_range
+from mainframe.crons.models import CronRun
+from tests.factories.crons import CronFactory
+
+
+def make_run(cron, seconds, error=None, ago=timedelta(hours=1)):
+    run = CronRun(cron=cron, started_at=timezone.now() - ago)
+    run.finish(error=error, commit=False)
+    run.duration = seconds
+    run.save()
+    return run
+
+
+class TestParseRange:
+    @freeze_time("2026-02-10 12:00:00")
+    def test_defaults_to_last_week(self):
+        since, until = parse_range({})
+        assert until == timezone.now()
+        assert since == until - timedelta(days=7)
+
+    def test_parses_iso_datetimes(self):
+        since, until = parse_range(
+            {"since": "2026-02-01T00:00:00Z", "until": "2026-02-02"}
+        )
+        assert (since.day, until.day) == (1, 2)
+
+    @pytest.mark.parametrize(
+        "params",
+        [
+            {"since": "yesterday"},
+            {"until": "2026-02-31"},
+            {"since": "2026-02-02", "until": "2026-02-01"},
+        ],
+    )
+    def test_invalid(self, params):
+        with pytest.raises(ValidationError):
+            parse_range(params)
+
+
+@pytest.mark.django_db
+class TestRunModel:
+    def test_finish(self):
+        cron = CronFactory()
+        with freeze_time("2026-02-10 12:00:00"):
+            run = CronRun(cron=cron, started_at=timezone.now())
+        with freeze_time("2026-02-10 12:00:03"):
+            run.finish(error=ValueError("boom"), output_size=5)
+
+        run.refresh_from_db()
+        assert run.duration == 3  # noqa: PLR2004
+        assert run.status == CronRun.STATUS_ERROR
+        assert run.error == "boom"
+        assert run.output_size == 5  # noqa: PLR2004
+
+    def test_prune(self):
+        cron = CronFactory()
+        make_run(cron, 1, ago=CronRun.RETENTION + timedelta(days=1))
+        recent = make_run(cron, 1)
+
+        assert CronRun.prune()[0] == 1
+        assert list(CronRun.objects.all()) == [recent]
+
+    def test_cron_run_is_recorded(self):
+        cron = CronFactory(command="backup")
+        with mock.patch("mainframe.crons.models.call_command") as call_command:
+            call_command.side_effect = lambda *args, stdout, **kwargs: stdout.write(
+                "saved"
+            )
+            cron.run()
+
+            call_command.side_effect = CommandError("failed")
+            with pytest.raises(CommandError):
+                cron.run()
+
+        ok, failed = cron.runs.order_by("id")
+        assert (ok.status, ok.output_size, ok.error) == (CronRun.STATUS_COMPLETE, 5, "")
+        assert (failed.status, failed.error) == (CronRun.STATUS_ERROR, "failed")
+
+
+@pytest.mark.django_db
+class TestRunStatsViews:
+    def test_stats(self, client, staff_session):
+        backup, other = CronFactory(name="backup"), CronFactory(name="other")
+        for seconds in range(1, 11):
+            make_run(backup, seconds, error="x" if seconds > 8 else None)  # noqa: PLR2004
+        make_run(other, 1)
+        make_run(other, 100, ago=timedelta(days=8))
+
+        response = client.get("/crons/stats/", HTTP_AUTHORIZATION=staff_session.token)
+
+        assert response.status_code == 200  # noqa: PLR2004
+        assert response.json() == {
+            "results": [
+                {
+                    "task_id": backup.id,
+                    "name": "backup",
+                    "runs": 10,
+                    "failures": 2,
+                    "failure_rate": 0.2,
+                    "max": 10,
+                    "p50": 5.5,
+                    "p95": 9.55,
+                    "p99": 9.91,
+                },
+                {
+                    "task_id": other.id,
+                    "name": "other",
+                    "runs": 1,
+                    "failures": 0,
+                    "failure_rate": 0,
+                    "max": 1,
+                    "p50": 1,
+                    "p95": 1,
+                    "p99": 1,
+                },
+            ]
+        }
+
+    def test_slowest(self, client, staff_session):
+        cron = CronFactory(name="backup")
+        runs = [make_run(cron, seconds) for seconds in (3, 1, 2)]
+
+        response = client.get(
+            "/crons/slowest/",
+            {"limit": 2, "since": (timezone.now() - timedelta(days=1)).isoformat()},
+            HTTP_AUTHORIZATION=staff_session.token,
+        )
+
+        assert response.status_code == 200  # noqa: PLR2004
+        results = response.json()["results"]
+        assert [r["id"] for r in results] == [runs[0].id, runs[2].id]
+        assert results[0]["name"] == "backup"
+        assert results[0]["duration"] == 3  # noqa: PLR2004
+
+    def test_invalid_range(self, client, staff_session):
+        response = client.get(
+            "/watchers/stats/",
+            {"since": "nope"},
+            HTTP_AUTHORIZATION=staff_session.token,
+        )
+        assert response.status_code == 400  # noqa: PLR2004
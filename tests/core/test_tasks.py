@@ -0,0 +1,241 @@
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from unittest import mock
+
+import pytest
+from freezegun import freeze_time
+from huey import signals
+from huey.contrib.djhuey import HUEY
+
+from mainframe.core import tasks
+from mainframe.core.huey import SIGNAL_ENQUEUED
+from mainframe.core.tasks import (
+    TASK_ERRORS_LIMIT,
+    TASK_HISTORY_LIMIT,
+    TASK_METRICS_SAMPLES,
+    delete_task_status,
+    get_task_metrics,
+    get_task_status,
+    log_status,
+    reconcile,
+    record_timing,
+)
+from mainframe.crons.models import Cron
+from tests.factories.crons import CronFactory
+
+
+def get_pipeline(mock_redis):
+    return mock_redis.return_value.pipeline.return_value.__enter__.return_value
+
+
+@mock.patch("mainframe.core.tasks.get_redis_client")
+class TestLogStatus:
+    @freeze_time("2024-01-01")
+    def test_appends_and_trims_history(self, mock_redis):
+        pipe = get_pipeline(mock_redis)
+
+        result = log_status("foo", id="1", status="executing")
+
+        event = {
+            "timestamp": "2024-01-01T00:00:00+00:00",
+            "id": "1",
+            "status": "executing",
+        }
+        assert result == {"errors": [], "history": [event]}
+        pipe.lpush.assert_called_once_with("tasks.foo.history", json.dumps(event))
+        pipe.ltrim.assert_called_once_with(
+            "tasks.foo.history", 0, TASK_HISTORY_LIMIT - 1
+        )
+        pipe.expire.assert_called_once()
+        pipe.execute.assert_called_once_with()
+        pipe.get.assert_not_called()
+
+    @freeze_time("2024-01-01")
+    def test_appends_errors(self, mock_redis):
+        pipe = get_pipeline(mock_redis)
+
+        result = log_status("foo", error="boom", status="error")
+
+        error = {"timestamp": "2024-01-01T00:00:00+00:00", "msg": "boom"}
+        assert result["errors"] == [error]
+        assert pipe.lpush.call_args_list[1] == mock.call(
+            "tasks.foo.errors", json.dumps(error)
+        )
+        assert pipe.ltrim.call_args_list[1] == mock.call(
+            "tasks.foo.errors", 0, TASK_ERRORS_LIMIT - 1
+        )
+
+
+@mock.patch("mainframe.core.tasks.get_redis_client")
+class TestGetTaskStatus:
+    def test_reads_requested_page(self, mock_redis):
+        pipe = get_pipeline(mock_redis)
+        pipe.execute.return_value = [
+            [json.dumps({"status": "complete"})],
+            [json.dumps({"msg": "boom"})],
+            42,
+            1,
+        ]
+
+        result = get_task_status("foo", page=3, page_size=10)
+
+        assert result == {
+            "errors": [{"msg": "boom"}],
+            "errors_count": 1,
+            "history": [{"status": "complete"}],
+            "history_count": 42,
+        }
+        pipe.lrange.assert_any_call("tasks.foo.history", 20, 29)
+
+    def test_no_history(self, mock_redis):
+        get_pipeline(mock_redis).execute.return_value = [[], [], 0, 0]
+        assert get_task_status("foo") == {}
+
+    def test_delete(self, mock_redis):
+        mock_redis.return_value.delete.return_value = 2
+        assert delete_task_status("foo") == 2
+        mock_redis.return_value.delete.assert_called_once_with(
+            "tasks.foo.errors", "tasks.foo.history", "tasks.foo"
+        )
+
+
+@mock.patch("mainframe.core.tasks.time.time")
+@mock.patch("mainframe.core.tasks.get_redis_client")
+class TestRecordTiming:
+    def test_records_queue_wait_and_duration(self, mock_redis, mock_time):
+        t = SimpleNamespace(id="abc", name="foo")
+        pipe = get_pipeline(mock_redis)
+        pipe.execute.return_value = [b"100.0", 1]
+
+        mock_time.return_value = 100.0
+        record_timing(SIGNAL_ENQUEUED, t)
+        mock_redis.return_value.set.assert_called_once_with(
+            "tasks.enqueued.abc", 100.0, ex=mock.ANY
+        )
+
+        mock_time.return_value = 102.5
+        record_timing(signals.SIGNAL_EXECUTING, t)
+        pipe.lpush.assert_called_once_with("tasks.foo.waits", 2.5)
+
+        mock_time.return_value = 110.0
+        record_timing(signals.SIGNAL_COMPLETE, t)
+        pipe.lpush.assert_called_with("tasks.foo.durations", 7.5)
+        pipe.ltrim.assert_called_with(
+            "tasks.foo.durations", 0, TASK_METRICS_SAMPLES - 1
+        )
+
+    def test_ignores_finish_without_start(self, mock_redis, mock_time):
+        record_timing(signals.SIGNAL_ERROR, SimpleNamespace(id="x", name="foo"))
+        mock_redis.assert_not_called()
+
+
+@mock.patch("mainframe.core.tasks.get_redis_client")
+class TestGetTaskMetrics:
+    def test_summarizes_samples(self, mock_redis):
+        durations = [str(i).encode() for i in range(1, 101)]
+        get_pipeline(mock_redis).execute.return_value = [durations, []]
+
+        metrics = get_task_metrics("foo")
+
+        assert metrics["queue_wait"] == {"count": 0}
+        duration = metrics["duration"]
+        assert duration["count"] == 100
+        assert duration["p50"] == 50
+        assert duration["p95"] == 95
+        assert duration["max"] == 100
+        assert duration["mean"] == 50.5
+        assert duration["histogram"][3] == {"le": 5, "count": 5}
+        assert duration["histogram"][-1] == {"le": None, "count": 100}
+
+
+@pytest.fixture
+def schedules():
+    yield tasks._schedules
+    for schedule in list(tasks._schedules.values()):
+        tasks.unregister(schedule.task_name)
+    tasks._schedules.clear()
+
+
+def registered(name):
+    return name in HUEY._registry._registry
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("schedules")
+class TestReconcile:
+    def test_only_touches_changed_schedules(self):
+        cron = CronFactory(name="foo", expression="0 0 * * *", is_active=True)
+        other = CronFactory(name="bar", expression="*/5 * * * *", is_active=True)
+
+        report = reconcile([cron, other])
+        assert report == {
+            "added": ["foo", "bar"],
+            "removed": [],
+            "updated": [],
+            "unchanged": 0,
+        }
+        assert registered("mainframe.crons.models.foo")
+        assert registered("mainframe.crons.models.bar")
+
+        with mock.patch.object(HUEY._registry, "register") as mock_register:
+            report = reconcile([cron, other])
+        mock_register.assert_not_called()
+        assert report["unchanged"] == 2
+
+        cron.expression = "0 1 * * *"
+        other.is_active = False
+        report = reconcile([cron, other])
+        assert report["updated"] == ["foo"]
+        assert report["removed"] == ["bar"]
+        assert registered("mainframe.crons.models.foo")
+        assert not registered("mainframe.crons.models.bar")
+
+    def test_rename_unregisters_previous_name(self):
+        cron = CronFactory(name="foo", expression="0 0 * * *", is_active=True)
+        reconcile([cron])
+
+        cron.name = "renamed"
+        report = reconcile([cron])
+
+        assert report["updated"] == ["renamed"]
+        assert not registered("mainframe.crons.models.foo")
+        assert registered("mainframe.crons.models.renamed")
+
+    def test_prune_removes_missing(self):
+        cron = CronFactory(name="foo", expression="0 0 * * *", is_active=True)
+        reconcile([cron])
+
+        report = reconcile([], prune=True)
+
+        assert report["removed"] == ["foo"]
+        assert not registered("mainframe.crons.models.foo")
+
+    def test_runner_loads_fresh_instance(self):
+        cron = CronFactory(name="foo", expression="0 0 * * *", is_active=True)
+        reconcile([cron])
+        task_class = HUEY._registry.string_to_task("mainframe.crons.models.foo")
+
+        with mock.patch.object(Cron, "run", autospec=True) as mock_run:
+            task_class().execute()
+
+        assert mock_run.call_args.args[0].pk == cron.pk
+
+    def test_concurrent_reconciles_register_once(self):
+        cron = CronFactory(name="foo", expression="0 0 * * *", is_active=True)
+        get_schedule = tasks.get_schedule
+
+        def slow_get_schedule(instance):
+            time.sleep(0.01)  # widen the read -> register window
+            return get_schedule(instance)
+
+        with (
+            mock.patch.object(tasks, "get_schedule", slow_get_schedule),
+            ThreadPoolExecutor(max_workers=4) as pool,
+        ):
+            reports = list(pool.map(lambda _: reconcile([cron]), range(4)))
+
+        assert sum(len(report["added"]) for report in reports) == 1
+        assert sum(report["unchanged"] for report in reports) == 3  # noqa: PLR2004
+        assert registered("mainframe.crons.models.foo")
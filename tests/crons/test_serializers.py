@@ -6,19 +6,19 @@ from mainframe.crons.serializers import CronSerializer
 from tests.factories.crons import CronFactory
 
 
-@mock.patch("mainframe.crons.serializers.get_redis_client", return_value={})
+@mock.patch("mainframe.crons.serializers.get_task_status", return_value={})
 @mock.patch("mainframe.crons.models.schedule_task", return_value="{}")
 @pytest.mark.django_db
 class TestCronSerializer:
     def test_create(self, _, __):
         serializer = CronSerializer(
-            data={"expression": "0 10 31 2 *", "name": "foo", "command": "cmd"}
+            data={"expression": "0 10 31 2 *", "name": "foo", "command": "backup"}
         )
         assert serializer.is_valid(), serializer.errors
 
         instance = serializer.save()
         assert instance.name == "foo"
-        assert instance.command == "cmd"
+        assert instance.command == "backup"
         assert not getattr(instance, "is_renamed", None)
         assert instance.expression == "0 10 31 2 *"
         assert instance.is_active is False
@@ -35,3 +35,11 @@ class TestCronSerializer:
         assert instance.name == "renamed foo"
         assert getattr(instance, "is_renamed", None) is True
         assert schedule_task_mock.call_args_list == [mock.call(instance)]
+
+    def test_unknown_command(self, _, __):
+        serializer = CronSerializer(
+            data={"expression": "0 10 31 2 *", "name": "foo", "command": "nope"}
+        )
+
+        assert not serializer.is_valid()
+        assert serializer.errors["command"] == ["Unknown command: nope"]
@@ -0,0 +1,138 @@
+import json
+import signal
+import subprocess
+from unittest import mock
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from mainframe.crons import subprocesses
+from mainframe.crons.models import Cron
+from tests.factories.crons import CronFactory
+
+
+@pytest.fixture
+def redis_client():
+    with mock.patch("mainframe.crons.subprocesses.get_redis_client") as client:
+        yield client.return_value
+
+
+@pytest.fixture
+def popen():
+    with (
+        mock.patch("mainframe.crons.subprocesses.subprocess.Popen") as popen,
+        mock.patch("mainframe.crons.subprocesses.get_start_time", return_value=100.0),
+    ):
+        popen.return_value.pid = 1234
+        popen.return_value.communicate.return_value = ("done", None)
+        popen.return_value.returncode = 0
+        yield popen
+
+
+@mock.patch("mainframe.crons.subprocesses.os.killpg")
+class TestRunTracked:
+    def test_tracks_pid_while_running(self, killpg, popen, redis_client):
+        cron = Cron(pk=7, name="backup", command="backup", timeout=30)
+
+        assert subprocesses.run_tracked(cron) == "done"
+
+        args = popen.call_args.args[0]
+        assert args[-2:] == ["run_cron", "7"]
+        assert popen.call_args.kwargs == {
+            "start_new_session": True,
+            "stdout": subprocess.PIPE,
+            "text": True,
+        }
+        redis_client.set.assert_called_once_with(
+            "crons.7.process", json.dumps({"pid": 1234, "started_at": 100.0}), ex=90
+        )
+        popen.return_value.communicate.assert_called_once_with(timeout=30)
+        redis_client.delete.assert_called_once_with("crons.7.process")
+        killpg.assert_not_called()
+
+    def test_kills_on_timeout(self, killpg, popen, redis_client):
+        popen.return_value.communicate.side_effect = [
+            subprocess.TimeoutExpired("cmd", 30),
+            ("", None),
+        ]
+        cron = Cron(pk=7, name="backup", command="backup")
+
+        with pytest.raises(CommandError, match="Timed out after 3600s"):
+            subprocesses.run_tracked(cron)
+
+        killpg.assert_called_once_with(1234, signal.SIGKILL)
+        redis_client.delete.assert_called_once_with("crons.7.process")
+
+    def test_failure(self, _, popen, redis_client):
+        popen.return_value.returncode = 1
+
+        with pytest.raises(CommandError, match="Exited with code 1"):
+            subprocesses.run_tracked(Cron(pk=7, name="backup"))
+
+
+@mock.patch("mainframe.crons.subprocesses.os.killpg")
+@mock.patch("mainframe.crons.subprocesses.psutil.Process")
+class TestKill:
+    def test_kills_tracked_process(self, process, killpg, redis_client):
+        redis_client.get.return_value = json.dumps({"pid": 1234, "started_at": 100})
+        process.return_value.pid = 1234
+        process.return_value.create_time.return_value = 100.4
+
+        assert subprocesses.kill(Cron(pk=7)) is True
+        process.assert_called_once_with(1234)
+        killpg.assert_called_once_with(1234, signal.SIGKILL)
+
+    def test_not_tracked(self, process, killpg, redis_client):
+        redis_client.get.return_value = None
+
+        assert subprocesses.kill(Cron(pk=7)) is False
+        process.assert_not_called()
+
+    def test_reused_pid(self, process, killpg, redis_client):
+        redis_client.get.return_value = json.dumps({"pid": 1234, "started_at": 100})
+        process.return_value.create_time.return_value = 500
+
+        assert subprocesses.kill(Cron(pk=7)) is False
+        killpg.assert_not_called()
+
+    def test_already_done(self, process, killpg, redis_client):
+        redis_client.get.return_value = json.dumps({"pid": 1234, "started_at": 100})
+        process.side_effect = subprocesses.psutil.NoSuchProcess(1234)
+
+        assert subprocesses.kill(Cron(pk=7)) is False
+
+
+@pytest.mark.django_db
+class TestCronModes:
+    @mock.patch("mainframe.crons.models.run_tracked")
+    @mock.patch("mainframe.crons.models.call_command")
+    def test_subprocess_mode(self, call_command, run_tracked):
+        cron = CronFactory(command="backup", mode=Cron.MODE_SUBPROCESS)
+
+        cron.run()
+
+        run_tracked.assert_called_once_with(cron)
+        call_command.assert_not_called()
+
+    def test_run_cron_command(self):
+        cron = CronFactory(command="backup")
+
+        with mock.patch.object(Cron, "run_inline") as run_inline:
+            call_command("run_cron", str(cron.pk))
+
+        run_inline.assert_called_once_with()
+
+    def test_run_cron_command_missing(self):
+        with pytest.raises(CommandError, match="Cron 0 does not exist"):
+            call_command("run_cron", "0")
+
+    def test_kill_view(self, client, staff_session):
+        cron = CronFactory(command="backup")
+
+        with mock.patch("mainframe.crons.views.subprocesses.kill", return_value=False):
+            response = client.put(
+                f"/crons/{cron.pk}/kill/", HTTP_AUTHORIZATION=staff_session.token
+            )
+
+        assert response.status_code == 404  # noqa: PLR2004
+        assert response.json() == {"detail": "Not running in a tracked subprocess"}
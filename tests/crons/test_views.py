@@ -0,0 +1,40 @@
+from unittest import mock
+
+import pytest
+from rest_framework import status
+
+from mainframe.core import jobs
+from mainframe.crons.tasks import run_cron_job
+from tests.factories.crons import CronFactory
+
+
+@pytest.mark.django_db
+class TestCronViews:
+    @mock.patch("mainframe.crons.views.run_cron_job")
+    def test_run_enqueues_job(self, run_job, client, staff_session, fake_redis):
+        cron = CronFactory(command="backup", kwargs={"app": "finance"})
+
+        response = client.put(
+            f"/crons/{cron.id}/run/", HTTP_AUTHORIZATION=staff_session.token
+        )
+
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        job_id = response.json()["job_id"]
+        run_job.assert_called_once_with(job_id, cron.id)
+        job = jobs.get_job(job_id)
+        assert (job["command"], job["kwargs"]) == ("backup", {"app": "finance"})
+        assert job["status"] == jobs.STATUS_QUEUED
+
+    def test_run_cron_job(self, fake_redis):
+        cron = CronFactory(command="backup")
+        job_id = jobs.create_job(cron.command)
+
+        with mock.patch("mainframe.crons.models.call_command") as call_command:
+            call_command.side_effect = lambda *args, stdout, **kwargs: stdout.write(
+                "saved\n"
+            )
+            run_cron_job.call_local(job_id, cron.id)
+
+        job = jobs.get_job(job_id)
+        assert (job["status"], job["output"]) == (jobs.STATUS_COMPLETE, ["saved"])
+        assert cron.runs.get().output_size == len("saved\n")
@@ -1,6 +1,8 @@
+import datetime
+
 import factory
 
-from mainframe.exchange.models import Currency
+from mainframe.exchange.models import Currency, ExchangeRate
 
 
 class CurrencyFactory(factory.django.DjangoModelFactory):
@@ -9,3 +11,13 @@ class CurrencyFactory(factory.django.DjangoModelFactory):
 
     name = "cname"
     symbol = factory.Sequence(str)
+
+
+class ExchangeRateFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = ExchangeRate
+
+    date = factory.Sequence(lambda n: datetime.date(2026, 1, 1) + datetime.timedelta(n))
+    source = "bnr"
+    symbol = "EUR"
+    value = 5
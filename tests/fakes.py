@@ -0,0 +1,52 @@
+import asyncio
+from http import HTTPStatus
+
+# captured before tests patch asyncio.sleep to skip retry delays
+real_sleep = asyncio.sleep
+
+
+class FakeSession:
+    """Stands in for aiohttp.ClientSession. `responses` maps URLs to a body,
+    a (status, body, headers) tuple or an exception to raise - or a list of
+    those, served one per request. Records calls and peak concurrency"""
+
+    def __init__(self, responses, delay=0, delays=None):
+        self.responses = {
+            url: list(response) if isinstance(response, list) else response
+            for url, response in responses.items()
+        }
+        self.delay, self.delays = delay, delays or {}
+        self.active = self.max_active = 0
+        self.calls = []
+
+    def request(self, method, url, **kwargs):
+        self.calls.append((method, url, kwargs))
+        response = self.responses[url]
+        if isinstance(response, list):
+            response = response.pop(0)
+        return FakeResponse(self, url, response)
+
+
+class FakeResponse:
+    def __init__(self, session, url, response):
+        self.session, self.url = session, url
+        self.status, self.body, self.headers = HTTPStatus.OK, response, {}
+        if isinstance(response, tuple):
+            self.status, self.body, self.headers = response
+
+    async def __aenter__(self):
+        self.session.active += 1
+        self.session.max_active = max(self.session.max_active, self.session.active)
+        await real_sleep(self.session.delays.get(self.url, self.session.delay))
+        if isinstance(self.body, Exception):
+            raise self.body
+        return self
+
+    async def __aexit__(self, *args):
+        self.session.active -= 1
+
+    async def read(self):
+        return self.body.encode() if isinstance(self.body, str) else self.body
+
+    async def text(self):
+        return self.body.decode() if isinstance(self.body, bytes) else self.body
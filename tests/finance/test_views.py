@@ -1,6 +1,7 @@
 import pytest
 from django.urls import reverse
 
+from mainframe.finance.models import Transaction
 from tests.factories.finance import (
     AccountFactory,
     CategoryFactory,
@@ -90,3 +91,72 @@ class TestPayments:
                 reverse("finance:payments-list"), HTTP_AUTHORIZATION=staff_session.token
             )
         assert response.status_code == 200
+
+
+@pytest.mark.django_db
+class TestTransactions:
+    def test_search_uses_stored_vector(self, client, staff_session):
+        match = TransactionFactory(description="Coffee shop", amount=-5)
+        TransactionFactory(description="Groceries", amount=-5)
+
+        response = client.get(
+            reverse("finance:transactions-list"),
+            {"search_term": "coffee"},
+            HTTP_AUTHORIZATION=staff_session.token,
+        )
+
+        assert response.status_code == 200
+        assert [t["id"] for t in response.json()["results"]] == [match.id]
+
+    def test_edits_refresh_search_vector(self):
+        transaction = TransactionFactory(description="Coffee shop")
+        transaction.description = "Bakery"
+        transaction.save()
+
+        assert list(Transaction.objects.filter(search_vector="bakery")) == [transaction]
+        assert not Transaction.objects.filter(search_vector="coffee").exists()
+
+        Transaction.objects.filter(pk=transaction.pk).update(search_vector=None)
+        transaction.save(update_fields=["state"])
+        assert not Transaction.objects.filter(search_vector="bakery").exists()
+
+    @pytest.mark.usefixtures("pg_trgm")
+    def test_similar_to_tolerates_typos(self, client, staff_session):
+        close = TransactionFactory(description="Starbucks Coffee")
+        TransactionFactory(description="Groceries")
+
+        response = client.get(
+            reverse("finance:transactions-list"),
+            {"similar_to": "Starbuks Cofee"},
+            HTTP_AUTHORIZATION=staff_session.token,
+        )
+
+        assert response.status_code == 200
+        assert [t["id"] for t in response.json()["results"]] == [close.id]
+
+    @pytest.mark.usefixtures("pg_trgm")
+    def test_autocomplete(self, client, staff_session):
+        TransactionFactory.create_batch(2, description="Starbucks Coffee")
+        TransactionFactory(description="Starbucks")
+        TransactionFactory(description="Groceries")
+
+        response = client.get(
+            reverse("finance:transactions-autocomplete"),
+            {"q": "starbuks", "limit": 5},
+            HTTP_AUTHORIZATION=staff_session.token,
+        )
+
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert sorted((r["description"], r["count"]) for r in results) == [
+            ("Starbucks", 1),
+            ("Starbucks Coffee", 2),
+        ]
+        assert results[0]["similarity"] >= results[1]["similarity"]
+
+    def test_autocomplete_requires_term(self, client, staff_session):
+        response = client.get(
+            reverse("finance:transactions-autocomplete"),
+            HTTP_AUTHORIZATION=staff_session.token,
+        )
+        assert response.status_code == 400
@@ -0,0 +1,392 @@
+import asyncio
+import json
+import time
+from datetime import UTC, datetime, timedelta
+from http import HTTPStatus
+from unittest import mock
+
+import pytest
+from freezegun import freeze_time
+
+from mainframe.watchers import batch
+from mainframe.watchers.models import (
+    Watcher,
+    WatcherElementsNotFound,
+    WatcherError,
+    WatcherRun,
+)
+from tests.factories.watchers import WatcherFactory
+from tests.fakes import FakeSession
+
+pytestmark = pytest.mark.usefixtures("fake_redis")
+
+HTML = b"<div><a class='link' href='/2'>Second</a><a class='link' href='/1'>First</a>"
+API = json.dumps({"items": [{"title": "Second", "url": "http://api/2"}]}).encode()
+
+
+@pytest.fixture(autouse=True)
+def inline_process_pool(settings):
+    settings.PROCESS_POOL_WORKERS = 0
+
+
+@pytest.fixture
+def log_status():
+    with mock.patch("mainframe.watchers.batch.log_status") as log_status:
+        yield log_status
+
+
+@pytest.mark.django_db
+class TestRunDueWatchers:
+    @freeze_time("2026-02-06 00:15:00")
+    def test_get_due_watchers(self):
+        due = WatcherFactory(cron="*/5 * * * *", is_active=True)
+        WatcherFactory(cron="*/7 * * * *", is_active=True)
+        WatcherFactory(cron="*/5 * * * *", is_active=False)
+        WatcherFactory(cron="", is_active=True)
+
+        assert batch.get_due_watchers(batch.timezone.now()) == [due]
+
+    def test_get_due_watchers_in_any_minute(self):
+        every_5 = WatcherFactory(cron="*/5 * * * *", is_active=True)
+        every_7 = WatcherFactory(cron="*/7 * * * *", is_active=True)
+        minutes = [datetime(2026, 2, 6, 0, m, tzinfo=UTC) for m in (13, 14, 15)]
+
+        assert batch.get_due_watchers(*minutes) == [every_5, every_7]
+        assert batch.get_due_watchers(*minutes[-1:]) == [every_5]
+
+    @freeze_time("2026-02-06 00:07:30")
+    def test_catches_up_on_missed_minutes(self, fake_redis):
+        now = batch.timezone.now()
+        minute = now.replace(second=0)
+
+        assert batch.get_pending_minutes(now) == [minute]
+
+        batch.set_last_minute(minute - timedelta(minutes=3))
+        assert batch.get_pending_minutes(now) == [
+            minute - timedelta(minutes=2),
+            minute - timedelta(minutes=1),
+            minute,
+        ]
+        assert fake_redis.ttls[batch.LAST_MINUTE_KEY] == 3600  # noqa: PLR2004
+
+        batch.set_last_minute(minute)
+        assert batch.get_pending_minutes(now) == []
+
+        batch.set_last_minute(minute - timedelta(days=1))
+        assert len(batch.get_pending_minutes(now)) == 60  # noqa: PLR2004
+
+    @freeze_time("2026-02-06 00:07:30")
+    def test_runs_each_minute_once(self):
+        minute = batch.timezone.now().replace(second=0)
+        batch.set_last_minute(minute - timedelta(minutes=2))
+
+        with mock.patch.object(batch, "get_due_watchers", return_value=[]) as due:
+            batch.run_due_watchers()  # late - the previous minute was skipped
+            batch.run_due_watchers()  # same minute again
+
+        due.assert_called_once_with(minute - timedelta(minutes=1), minute)
+        assert batch.get_pending_minutes(batch.timezone.now()) == []
+
+    @freeze_time("2026-02-06 00:15:00")
+    def test_fetches_concurrently_and_bulk_updates(self, log_status):
+        web = WatcherFactory(
+            cron="* * * * *",
+            is_active=True,
+            selector="a.link",
+            url="http://example.com/news",
+            latest={"title": "First", "url": "http://example.com/1", "timestamp": "x"},
+        )
+        api = WatcherFactory(
+            cron="* * * * *",
+            is_active=True,
+            selector="items title url",
+            type=Watcher.TYPE_API,
+            url="http://api/feed",
+            request={"headers": {"X-Token": "t"}, "timeout": 3},
+        )
+        session = FakeSession({web.url: HTML, api.url: API})
+
+        with (
+            mock.patch.object(batch.aiohttp, "ClientSession") as client_session,
+            mock.patch.object(Watcher, "send_notification") as send,
+            mock.patch.object(Watcher.objects, "bulk_update") as bulk_update,
+        ):
+            client_session.return_value.__aenter__.return_value = session
+            updated = batch.run_due_watchers()
+
+        assert updated == [web, api]
+        assert send.call_args_list == [
+            mock.call([{"title": "Second", "url": "http://example.com/2"}]),
+            mock.call([{"title": "Second", "url": "http://api/2"}]),
+        ]
+        bulk_update.assert_called_once_with(
+            [web, api], ["http_cache", "latest", "pending_data", "updated_at"]
+        )
+        assert updated[0].latest["url"] == "http://example.com/2"
+        assert session.calls[1] == (
+            "GET",
+            api.url,
+            {"raise_for_status": True, "headers": {"X-Token": "t"}},
+        )
+        assert log_status.call_count == 2  # noqa: PLR2004
+
+    def test_errors_are_isolated(self, log_status):
+        ok = WatcherFactory(
+            cron="* * * * *", is_active=True, selector="a.link", url="http://ok.com"
+        )
+        broken = WatcherFactory(cron="* * * * *", is_active=True, url="http://ko")
+        session = FakeSession(
+            {ok.url: HTML, broken.url: batch.aiohttp.ClientError("down")}
+        )
+
+        with (
+            mock.patch.object(batch.aiohttp, "ClientSession") as client_session,
+            mock.patch.object(Watcher, "send_notification"),
+        ):
+            client_session.return_value.__aenter__.return_value = session
+            updated = batch.run_due_watchers()
+
+        assert [w.pk for w in updated] == [ok.pk]
+        assert Watcher.objects.get(pk=ok.pk).latest["title"] == "Second"
+        assert Watcher.objects.get(pk=broken.pk).latest == {}
+        log_status.assert_any_call(broken.name, error="down", status="error")
+        assert len(session.calls) == 1 + 1 + batch.RETRIES
+
+    def test_records_runs(self, log_status):
+        ok = WatcherFactory(
+            cron="* * * * *", is_active=True, selector="a.link", url="http://ok.com"
+        )
+        empty = WatcherFactory(
+            cron="* * * * *", is_active=True, selector="p", url="http://ok.com"
+        )
+        broken = WatcherFactory(cron="* * * * *", is_active=True, url="http://ko")
+        session = FakeSession(
+            {ok.url: HTML, broken.url: batch.aiohttp.ClientError("down")}
+        )
+
+        with (
+            mock.patch.object(batch.aiohttp, "ClientSession") as client_session,
+            mock.patch.object(Watcher, "send_notification"),
+        ):
+            client_session.return_value.__aenter__.return_value = session
+            batch.run_due_watchers()
+
+        runs = {run.watcher_id: run for run in WatcherRun.objects.all()}
+        assert (runs[ok.pk].status, runs[ok.pk].output_size) == ("complete", 2)
+        assert (runs[empty.pk].status, runs[empty.pk].output_size) == ("complete", 0)
+        assert runs[broken.pk].status == "error"
+        assert "down" in runs[broken.pk].error
+        # ok and empty share their request
+        assert runs[ok.pk].started_at == runs[empty.pk].started_at
+        assert runs[ok.pk].started_at != runs[broken.pk].started_at
+
+    def test_runs_time_their_own_fetch_and_processing(self):
+        slow = WatcherFactory(is_active=True, selector="a", url="http://slow.com")
+        fast = WatcherFactory(is_active=True, selector="a", url="http://fast.com")
+        session = FakeSession({slow.url: HTML, fast.url: HTML}, delays={slow.url: 0.2})
+
+        def process(watcher, links):
+            if watcher == slow:
+                time.sleep(0.2)
+            return False, []
+
+        with (
+            mock.patch.object(batch.aiohttp, "ClientSession") as client_session,
+            mock.patch.object(batch, "get_due_watchers", return_value=[slow, fast]),
+            mock.patch.object(batch, "process", side_effect=process),
+        ):
+            client_session.return_value.__aenter__.return_value = session
+            batch.run_due_watchers()
+
+        runs = {run.watcher_id: run for run in WatcherRun.objects.all()}
+        assert runs[slow.pk].duration >= 0.4  # noqa: PLR2004
+        # neither the slow request nor the slow processing before it count
+        assert runs[fast.pk].duration < 0.2  # noqa: PLR2004
+        assert runs[fast.pk].finished_at < runs[slow.pk].finished_at
+
+
+class TestFetchAll:
+    def test_limits_requests_per_host(self):
+        watchers = [
+            Watcher(name=str(i), url=f"http://same.host/{i}", selector="a.link")
+            for i in range(5)
+        ]
+        session = FakeSession({w.url: HTML for w in watchers}, delay=0.01)
+
+        with mock.patch.object(batch.aiohttp, "ClientSession") as client_session:
+            client_session.return_value.__aenter__.return_value = session
+            results = asyncio.run(batch.fetch_all(watchers))
+
+        assert session.max_active == batch.HOST_CONCURRENCY
+        assert all(len(fetch.links) == 2 for fetch in results)  # noqa: PLR2004
+
+    def test_returns_exceptions(self):
+        watcher = Watcher(name="w", url="http://x", selector="a")
+        session = FakeSession({watcher.url: TimeoutError()})
+
+        with mock.patch.object(batch.aiohttp, "ClientSession") as client_session:
+            client_session.return_value.__aenter__.return_value = session
+            (fetch,) = asyncio.run(batch.fetch_all([watcher]))
+
+        assert isinstance(fetch.links, WatcherError)
+
+
+@pytest.mark.django_db
+class TestConditionalGet:
+    @pytest.fixture(autouse=True)
+    def clock(self):
+        with freeze_time("2026-02-06 00:00:00") as clock:
+            self.clock = clock
+            yield
+
+    def run(self, watcher, response):
+        self.clock.tick(timedelta(minutes=1))
+        session = FakeSession({watcher.url: response})
+        with (
+            mock.patch.object(batch.aiohttp, "ClientSession") as client_session,
+            mock.patch.object(
+                batch, "parse_responses", wraps=batch.parse_responses
+            ) as parse,
+            mock.patch.object(Watcher, "send_notification"),
+            mock.patch("mainframe.watchers.batch.log_status"),
+        ):
+            client_session.return_value.__aenter__.return_value = session
+            updated = batch.run_due_watchers()
+        watcher.refresh_from_db()
+        return session.calls[0][2].get("headers", {}), parse.call_count, updated
+
+    def test_stores_validators_and_sends_them(self):
+        watcher = WatcherFactory(
+            cron="* * * * *", is_active=True, selector="a.link", url="http://x.com"
+        )
+        validators = {"ETag": '"v1"', "Last-Modified": "Fri, 06 Feb 2026 00:00:00 GMT"}
+
+        headers, parsed, _ = self.run(watcher, (HTTPStatus.OK, HTML, validators))
+        assert headers == {}
+        assert parsed == 1
+        assert watcher.http_cache["etag"] == '"v1"'
+        assert watcher.latest["title"] == "Second"
+
+        headers, parsed, updated = self.run(watcher, (HTTPStatus.NOT_MODIFIED, b"", {}))
+        assert headers == {
+            "If-None-Match": '"v1"',
+            "If-Modified-Since": "Fri, 06 Feb 2026 00:00:00 GMT",
+        }
+        assert parsed == 0
+        assert updated == []
+
+    def test_skips_parsing_identical_body(self):
+        watcher = WatcherFactory(
+            cron="* * * * *", is_active=True, selector="a.link", url="http://x.com"
+        )
+        assert self.run(watcher, HTML)[1] == 1
+        assert self.run(watcher, HTML)[1] == 0
+        assert self.run(watcher, HTML + b" ")[1] == 1
+
+    def test_failed_parse_is_not_cached(self):
+        watcher = WatcherFactory(
+            cron="* * * * *", is_active=True, selector="a.link", url="http://x.com"
+        )
+        with mock.patch.object(
+            batch, "parse_responses", side_effect=RuntimeError("boom")
+        ):
+            assert self.run(watcher, HTML)[1] == 1
+        assert watcher.http_cache == {}
+
+        assert self.run(watcher, HTML)[1] == 1
+        assert watcher.latest["title"] == "Second"
+
+    def test_selector_change_invalidates_cache(self):
+        watcher = WatcherFactory(
+            cron="* * * * *", is_active=True, selector="a.link", url="http://x.com"
+        )
+        self.run(watcher, (HTTPStatus.OK, HTML, {"ETag": '"v1"'}))
+
+        Watcher.objects.filter(pk=watcher.pk).update(selector="a")
+        headers, parsed, _ = self.run(watcher, (HTTPStatus.OK, HTML, {"ETag": '"v1"'}))
+
+        assert headers == {}
+        assert parsed == 1
+
+
+@pytest.mark.django_db
+class TestSharedFetch:
+    def run(self, watchers, response):
+        session = FakeSession({watchers[0].url: response})
+        with (
+            mock.patch.object(batch.aiohttp, "ClientSession") as client_session,
+            mock.patch.object(
+                batch, "parse_responses", wraps=batch.parse_responses
+            ) as parse,
+        ):
+            client_session.return_value.__aenter__.return_value = session
+            results = asyncio.run(batch.fetch_all(watchers))
+        return [fetch.links for fetch in results], session.calls, parse
+
+    def test_fetches_and_parses_once_per_request(self):
+        url = "http://x.com"
+        watchers = [
+            Watcher(name="links", url=url, selector="a.link"),
+            Watcher(name="all", url=url, selector="a"),
+            Watcher(name="missing", url=url, selector="p"),
+            Watcher(name="other", url=url, selector="a", request={"params": {"p": 2}}),
+        ]
+        (links, everything, missing, other), calls, parse = self.run(watchers, HTML)
+
+        assert len(calls) == 2  # noqa: PLR2004
+        assert parse.call_count == 2  # noqa: PLR2004
+        assert parse.call_args_list[0].args[1] == [
+            (Watcher.TYPE_WEB, url, "a.link", None),
+            (Watcher.TYPE_WEB, url, "a", None),
+            (Watcher.TYPE_WEB, url, "p", None),
+        ]
+        assert links == everything == other
+        assert len(links) == 2  # noqa: PLR2004
+        assert isinstance(missing, WatcherElementsNotFound)
+        assert watchers[0].http_cache["hash"]
+        assert watchers[2].http_cache == {}
+
+    def test_shares_errors(self):
+        watchers = [
+            Watcher(name=name, url="http://x", selector=name) for name in ("a", "b")
+        ]
+        results, calls, _ = self.run(watchers, TimeoutError())
+
+        assert len(calls) == 1 + batch.RETRIES
+        assert all(isinstance(result, WatcherError) for result in results)
+
+    def test_sends_validators_only_if_shared(self):
+        cache = {"etag": '"v1"', "hash": "h"}
+        watchers = [
+            Watcher(name=name, url="http://x", selector="a.link") for name in "ab"
+        ]
+        for watcher in watchers:
+            watcher.http_cache = {**cache, "key": batch.get_cache_key(watcher)}
+
+        _, calls, _ = self.run(watchers, (HTTPStatus.NOT_MODIFIED, b"", {}))
+        assert calls[0][2]["headers"] == {"If-None-Match": '"v1"'}
+
+        watchers[1].http_cache = {}
+        _, calls, parse = self.run(watchers, HTML)
+        assert "headers" not in calls[0][2]
+        assert (
+            parse.call_args.args[1]
+            == [(Watcher.TYPE_WEB, "http://x", "a.link", None)] * 2
+        )
+
+    def test_isolates_selector_errors(self):
+        content = HTML + b"<a class='anchor' name='top'>Top</a>"
+        watchers = [
+            Watcher(name=name, url="http://x", selector=selector)
+            for name, selector in (
+                ("good", "a.link"),
+                ("invalid", "a[["),
+                ("no href", "a.anchor"),
+            )
+        ]
+        (good, invalid, no_href), _, parse = self.run(watchers, content)
+
+        assert parse.call_count == 1
+        assert [link["url"] for link in good] == ["http://x/2", "http://x/1"]
+        assert isinstance(invalid, WatcherError)
+        assert isinstance(no_href, WatcherError)
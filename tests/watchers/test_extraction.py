@@ -0,0 +1,109 @@
+from pathlib import Path
+from unittest import mock
+
+import lxml.html
+import pytest
+from bs4 import BeautifulSoup, Tag
+
+from mainframe.watchers import extraction
+from mainframe.watchers.extraction import (
+    compile_selector,
+    get_attrs,
+    select,
+    select_elements,
+    select_many,
+)
+from mainframe.watchers.models import Watcher, get_links, parse_responses
+
+PAGES = Path(__file__).parent / "pages"
+URL = "https://example.com/section"
+
+
+def hrefs(elements):
+    return [get_attrs(e)["href"] for e in elements]
+
+
+def reference_links(content, selector):
+    """What BeautifulSoup's html.parser full-tree parse extracts"""
+    soup = BeautifulSoup(content, features="html.parser")
+    return get_links(URL, soup.select(selector))
+
+
+def squashed(links):
+    """lxml and html.parser recover from broken markup with different
+    whitespace inside the elements"""
+    return [{**link, "title": " ".join(link["title"].split())} for link in links]
+
+
+@pytest.mark.parametrize(
+    ("page", "selector"),
+    [
+        ("news.html", "a.article-link"),
+        ("news.html", "section.latest h3 > a"),
+        ("news.html", "article.card:not(.sponsored) a"),
+        ("news.html", "a"),
+        ("news.html", "nav a, footer a"),
+        ("broken.html", "a.item"),
+        ("broken.html", "li a.item"),
+        ("broken.html", "#more a[data-kind='more']"),
+        ("listing.html", "a[data-cy='listing-ad-title']"),
+        ("listing.html", "#content .row:not(.promoted) a.offer-title"),
+        ("listing.html", "a.offer-title.promoted-title"),
+    ],
+)
+def test_parity_with_html_parser(page, selector):
+    content = (PAGES / page).read_bytes()
+    expected = reference_links(content, selector)
+
+    assert expected
+    (links,) = parse_responses(content, [(Watcher.TYPE_WEB, URL, selector, None)])
+    assert squashed(links) == squashed(expected)
+
+
+class TestSelectors:
+    def test_compiled_once(self):
+        compile_selector.cache_clear()
+        compile_selector("a.item")
+        compile_selector("a.item")
+        assert compile_selector.cache_info().hits == 1
+
+    def test_unsupported_selector(self):
+        selector = 'a:-soup-contains("First")'
+        assert compile_selector(selector) is None
+        assert select(b"<a href='/1'>First</a>", selector) == []
+        (element,) = select_elements(b"<a href='/1'>First</a>", selector)
+        assert isinstance(element, Tag)
+
+    def test_falls_back_to_html_parser(self):
+        content = b"<a href='/1'>First</a>"
+        with mock.patch(
+            "mainframe.watchers.extraction.select", return_value=[]
+        ) as select_lxml:
+            (element,) = select_elements(content, "a")
+
+        select_lxml.assert_called_once_with(content, "a")
+        assert isinstance(element, Tag)
+        assert element.text == "First"
+
+    def test_selects_with_lxml(self):
+        content = (PAGES / "news.html").read_bytes()
+        elements = select(content, "a.article-link")
+        assert len(elements) == 6  # noqa: PLR2004
+        assert all(isinstance(e, lxml.html.HtmlElement) for e in elements)
+
+
+def test_select_many_parses_once():
+    content = (PAGES / "broken.html").read_bytes()
+    selectors = ["a.item", "li a.item", "#more a[data-kind='more']", "a.item"]
+
+    with (
+        mock.patch.object(extraction, "parse", wraps=extraction.parse) as parse,
+        mock.patch.object(extraction, "BeautifulSoup") as soup,
+    ):
+        selected = select_many(content, selectors)
+
+    assert parse.call_count == 1
+    soup.assert_not_called()
+    assert {s: hrefs(elements) for s, elements in selected.items()} == {
+        s: hrefs(select_elements(content, s)) for s in selectors
+    }
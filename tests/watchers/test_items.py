@@ -0,0 +1,152 @@
+from datetime import timedelta
+from unittest import mock
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from freezegun import freeze_time
+
+from mainframe.watchers import batch
+from mainframe.watchers.models import NEW_ITEMS_LIMIT, Watcher, WatcherItem
+from tests.factories.watchers import WatcherFactory
+from tests.fakes import FakeSession
+from tests.watchers.test_batch import HTML
+
+
+def links(*names):
+    return [{"title": name, "url": f"http://x.com/{name}"} for name in names]
+
+
+@pytest.mark.django_db
+class TestFindNew:
+    def test_falls_back_to_latest_without_history(self):
+        watcher = WatcherFactory(
+            latest={"title": "b", "url": "http://x.com/b", "timestamp": "t"}
+        )
+        assert watcher.find_new(links("a", "b", "c")) == links("a")
+
+    def test_stops_at_first_seen_item(self):
+        watcher = WatcherFactory()
+        WatcherItem.remember(watcher.get_items(links("c", "d")))
+
+        assert watcher.find_new(links("a", "b", "c", "e")) == links("a", "b")
+
+    def test_skips_duplicates_and_limits(self):
+        watcher = WatcherFactory()
+        WatcherItem.remember(watcher.get_items(links("z")))
+        names = [str(i) for i in range(NEW_ITEMS_LIMIT + 2)]
+
+        assert watcher.find_new(links("a", "a", *names, "z")) == links(
+            "a", *names[: NEW_ITEMS_LIMIT - 1]
+        )
+
+    def test_history_is_per_watcher(self):
+        watcher, other = WatcherFactory(), WatcherFactory()
+        WatcherItem.remember(other.get_items(links("b")))
+
+        assert watcher.find_new(links("a", "b")) == links("a", "b")
+
+
+@pytest.mark.django_db
+class TestWatcherItem:
+    def test_remember_upserts(self):
+        watcher = WatcherFactory()
+        with freeze_time("2026-02-01"):
+            WatcherItem.remember(watcher.get_items(links("a", "b", "a")))
+        with freeze_time("2026-02-02"):
+            WatcherItem.remember(
+                watcher.get_items([{"title": "A!", "url": "http://x.com/a"}])
+            )
+
+        items = {item.url: item for item in watcher.items.all()}
+        assert len(items) == 2  # noqa: PLR2004
+        assert items["http://x.com/a"].title == "A!"
+        assert items["http://x.com/a"].updated_at.day == 2  # noqa: PLR2004
+        assert items["http://x.com/a"].created_at.day == 1
+
+    def test_prune(self):
+        watcher = WatcherFactory()
+        with freeze_time(timezone.now() - timedelta(days=31)):
+            WatcherItem.remember(watcher.get_items(links("old")))
+        WatcherItem.remember(watcher.get_items(links("new")))
+
+        assert WatcherItem.prune()[0] == 1
+        assert list(watcher.items.values_list("title", flat=True)) == ["new"]
+
+    @pytest.mark.usefixtures("fake_redis")
+    def test_batch_remembers_new_results(self):
+        watcher = WatcherFactory(
+            cron="* * * * *", is_active=True, selector="a.link", url="http://x.com"
+        )
+        session = FakeSession({watcher.url: HTML})
+        with (
+            mock.patch.object(batch.aiohttp, "ClientSession") as client_session,
+            mock.patch.object(Watcher, "send_notification") as send,
+            mock.patch("mainframe.watchers.batch.log_status"),
+        ):
+            client_session.return_value.__aenter__.return_value = session
+            now = timezone.now()
+            batch.run_due_watchers(now)
+            assert send.call_count == 1
+            Watcher.objects.filter(pk=watcher.pk).update(http_cache={}, latest={})
+            batch.run_due_watchers(now + timedelta(minutes=1))
+            assert send.call_count == 1
+
+        assert sorted(watcher.items.values_list("title", flat=True)) == [
+            "First",
+            "Second",
+        ]
+
+    @pytest.mark.usefixtures("fake_redis")
+    def test_batch_and_run_remember_the_same(self):
+        scheduled, manual = (
+            WatcherFactory(cron="* * * * *", is_active=True, selector="a.link", url=url)
+            for url in ("http://x.com", "http://y.com")
+        )
+        for watcher in (scheduled, manual):
+            second = {"title": "Second", "url": f"{watcher.url}/2"}
+            WatcherItem.remember(watcher.get_items([second]))
+        response = mock.Mock(content=HTML)
+        with (
+            mock.patch.object(batch.aiohttp, "ClientSession") as client_session,
+            mock.patch.object(batch, "get_due_watchers", return_value=[scheduled]),
+            mock.patch.object(Watcher, "send_notification"),
+            mock.patch(
+                "mainframe.watchers.models.fetch", return_value=(response, None)
+            ),
+            mock.patch("mainframe.watchers.batch.log_status"),
+        ):
+            client_session.return_value.__aenter__.return_value = FakeSession(
+                {scheduled.url: HTML}
+            )
+            batch.run_due_watchers()
+            manual.run()
+
+        # "First" is below the last seen result, so it is not new
+        for watcher in (scheduled, manual):
+            assert list(watcher.items.values_list("title", flat=True)) == ["Second"]
+
+
+@pytest.mark.django_db
+def test_items_view(client, staff_session):
+    watcher = WatcherFactory()
+    WatcherItem.remember(watcher.get_items(links("apple pie", "banana")))
+
+    response = client.get(
+        reverse("api:watchers-items", args=[watcher.id]),
+        {"search": "APPLE"},
+        HTTP_AUTHORIZATION=staff_session.token,
+    )
+
+    assert response.status_code == 200  # noqa: PLR2004
+    assert response.json() == {
+        "results": [
+            {
+                "id": mock.ANY,
+                "title": "apple pie",
+                "url": "http://x.com/apple pie",
+                "created_at": mock.ANY,
+                "updated_at": mock.ANY,
+            }
+        ]
+    }
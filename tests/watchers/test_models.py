@@ -1,3 +1,4 @@
+import json
 from types import SimpleNamespace
 from unittest import mock
 
@@ -8,11 +9,9 @@ from freezegun import freeze_time
 
 from mainframe.watchers.models import (
     Watcher,
-    WatcherElementsNotFound,
     WatcherError,
-    extract,
-    fetch_api,
-    fetch_web,
+    compile_api_selector,
+    extract_links,
 )
 from tests.factories.watchers import WatcherFactory
 
@@ -193,88 +192,61 @@ class TestWatcherRun:
         )
 
 
-class DummyResponse:
-    def __init__(self, payload):
-        self._payload = payload
-
-    def json(self):
-        return self._payload
-
-
-class DummyElement:
-    def __init__(self, text, href):
-        self.text = text
-        self.attrs = {"href": href}
-
-
-class DummySoup:
-    def __init__(self, elements):
-        self._elements = elements
-
-    def select(self, selector):
-        return self._elements
+def fake_fetch(content=b"", error=None):
+    response = SimpleNamespace(content=content)
+    return mock.patch(
+        "mainframe.watchers.models.fetch",
+        return_value=(None if error else response, error),
+    )
 
 
 @pytest.mark.django_db
 class TestWatcherHelpers:
-    def test_extract_nested(self):
-        data = {"a": {"b": {"c": 1}}}
-        assert extract(data, ["a", "b", "c"]) == 1
-
-    def test_fetch_api_success(self):
-        w = WatcherFactory(url="http://api", selector="items title url")
+    def test_fetch_api(self):
+        w = WatcherFactory(
+            url="http://api",
+            selector="items title url",
+            type=Watcher.TYPE_API,
+            request={"headers": {"X-Token": "t"}},
+        )
         payload = {"items": [{"title": "T1", "url": "http://u"}]}
 
-        def fake_fetch(url, logger, retries=1, soup=False, **kwargs):
-            return DummyResponse(payload), None
+        with fake_fetch(json.dumps(payload).encode()) as fetch:
+            assert w.fetch(None) == [{"title": "T1", "url": "http://u"}]
 
-        with mock.patch("mainframe.watchers.models.fetch", fake_fetch):
-            res = fetch_api(w, None)
-
-        assert isinstance(res, list)
-        assert res[0]["title"] == "T1"
+        fetch.assert_called_once_with(
+            "http://api", None, retries=1, soup=False, headers={"X-Token": "t"}
+        )
 
     def test_fetch_api_bad_selector_raises(self):
-        w = WatcherFactory(url="http://api", selector="one two")
+        w = WatcherFactory(url="http://api", selector="one two", type=Watcher.TYPE_API)
 
-        def fake_fetch(url, logger, retries=1, soup=False, **kwargs):
-            return DummyResponse({}), None
-
-        logger = SimpleNamespace(info=lambda *a, **k: None)
-        with (
-            mock.patch("mainframe.watchers.models.fetch", fake_fetch),
-            pytest.raises(WatcherError),
-        ):
-            fetch_api(w, logger)
+        with fake_fetch(b"{}"), pytest.raises(WatcherError, match="separated"):
+            w.fetch(None)
 
-    def test_fetch_web_success(self):
+    def test_fetch_web(self):
         w = WatcherFactory(url="http://example.com/path", selector="a.link")
+        content = b"<a class='link' href='/item/1'>Title</a><a href='/2'>Other</a>"
 
-        el = DummyElement("Title", "/item/1")
-        soup = DummySoup([el])
+        with fake_fetch(content):
+            assert w.fetch(None) == [
+                {"title": "Title", "url": "http://example.com/item/1"}
+            ]
 
-        def fake_fetch(url, logger, retries=1, **kwargs):
-            return soup, None
+    def test_fetch_web_no_elements(self):
+        w = WatcherFactory(url="http://example.com", selector="a")
+        logger = mock.Mock()
 
-        with mock.patch("mainframe.watchers.models.fetch", fake_fetch):
-            res = fetch_web(w, None)
+        with fake_fetch(b"<p>nothing</p>"):
+            assert w.fetch(logger) == []
 
-        assert isinstance(res, list)
-        assert res[0]["url"].startswith("http://example.com")
+        logger.warning.assert_called_once()
 
-    def test_fetch_web_no_elements_raises(self):
+    def test_fetch_error_raises(self):
         w = WatcherFactory(url="http://example.com", selector="a")
 
-        soup = DummySoup([])
-
-        def fake_fetch(url, logger, retries=1, **kwargs):
-            return soup, None
-
-        with (
-            mock.patch("mainframe.watchers.models.fetch", fake_fetch),
-            pytest.raises(WatcherElementsNotFound),
-        ):
-            fetch_web(w, None)
+        with fake_fetch(error=ValueError("down")), pytest.raises(WatcherError):
+            w.fetch(None)
 
     def test_send_notification_uses_telegram(self):
         w = WatcherFactory(url="http://example.com", selector="a")
@@ -292,3 +264,27 @@ class TestWatcherHelpers:
 
         assert called["args"] is not None
         assert w.name in called["args"][0]
+
+
+class TestExtractLinks:
+    def test_compiles_selector_once(self):
+        compile_api_selector.cache_clear()
+        data = {"data": {"items": [{"t": "a", "link": {"href": "http://a"}}]}}
+
+        for _ in range(3):
+            links = extract_links("data.items t link.href", data)
+
+        assert links == [{"title": "a", "url": "http://a"}]
+        assert compile_api_selector.cache_info().misses == 1
+
+    def test_stops_at_latest(self):
+        items = iter([{"t": n, "u": f"http://{n}"} for n in ("c", "b", "a")])
+
+        links = extract_links("items t u", {"items": items}, until="http://b")
+
+        assert [link["title"] for link in links] == ["c", "b"]
+        assert list(items) == [{"t": "a", "u": "http://a"}]
+
+    def test_invalid_selector(self):
+        with pytest.raises(WatcherError, match="separated by space"):
+            extract_links("items title", {})
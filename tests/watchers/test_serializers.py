@@ -6,11 +6,10 @@ from mainframe.watchers.serializers import WatcherSerializer
 from tests.factories.watchers import WatcherFactory
 
 
-@mock.patch("mainframe.watchers.serializers.get_redis_client", return_value={})
-@mock.patch("mainframe.watchers.models.schedule_task", return_value="{}")
+@mock.patch("mainframe.watchers.serializers.get_task_status", return_value={})
 @pytest.mark.django_db
 class TestWatcherSerializer:
-    def test_create(self, _, __):
+    def test_create(self, _):
         serializer = WatcherSerializer(
             data={
                 "cron": "0 10 31 2 *",
@@ -26,12 +25,11 @@ class TestWatcherSerializer:
         assert instance.name == "foo"
         assert instance.selector == ".foo-selector"
         assert instance.url == "https://example.com"
-        assert not getattr(instance, "is_renamed", None)
         assert instance.cron == "0 10 31 2 *"
         assert instance.latest == {}
         assert instance.request == {}
 
-    def test_renaming_clears_cron(self, schedule_task_mock, __):
+    def test_renaming_keeps_cron(self, _):
         instance = WatcherFactory(name="foo", cron="0 10 31 2 *")
         serializer = WatcherSerializer(
             instance=instance, data={"name": "renamed foo"}, partial=True
@@ -39,8 +37,6 @@ class TestWatcherSerializer:
         assert serializer.is_valid(), serializer.errors
 
         instance = serializer.save()
-        assert instance.cron == ""
+        assert instance.cron == "0 10 31 2 *"
         assert instance.chat_id is None
         assert instance.name == "renamed foo"
-        assert getattr(instance, "is_renamed", None) is True
-        assert schedule_task_mock.call_args_list == [mock.call(instance)]
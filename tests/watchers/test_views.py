@@ -7,14 +7,14 @@ from django.urls import reverse
 from tests.factories.watchers import WatcherFactory
 
 
-@mock.patch("mainframe.watchers.models.schedule_task", return_value="{}")
-@mock.patch("mainframe.watchers.serializers.get_redis_client", return_value={})
+@mock.patch("mainframe.watchers.serializers.get_task_status", return_value={})
 @pytest.mark.django_db
 class TestWatcherViews:
-    def test_create(self, _, __, client, staff_session):
+    def test_create(self, _, client, staff_session):
         response = client.post(
             "/watchers/",
             data={
+                "http_cache": '{"hash": "stale"}',
                 "name": "foo",
                 "selector": ".foo-selector",
                 "url": "https://example.com",
@@ -31,6 +31,7 @@ class TestWatcherViews:
             "cron_notification_description": "",
             "id": mock.ANY,
             "is_active": False,
+            "http_cache": {},
             "latest": {},
             "log_level": logging.WARNING,
             "name": "foo",
@@ -43,7 +44,7 @@ class TestWatcherViews:
             "url": "https://example.com",
         }
 
-    def test_detail(self, _, __, client, staff_session):
+    def test_detail(self, _, client, staff_session):
         watcher = WatcherFactory()
         response = client.get(
             reverse("api:watchers-detail", args=[watcher.id]),
@@ -60,6 +61,7 @@ class TestWatcherViews:
             "cron_notification_description": "",
             "id": watcher.id,
             "is_active": False,
+            "http_cache": {},
             "latest": {},
             "log_level": logging.WARNING,
             "name": mock.ANY,
@@ -72,7 +74,7 @@ class TestWatcherViews:
             "url": "",
         }
 
-    def test_list(self, _, __, client, staff_session):
+    def test_list(self, _, client, staff_session):
         watcher = WatcherFactory()
         response = client.get(
             reverse("api:watchers-list"),
@@ -95,6 +97,7 @@ class TestWatcherViews:
                     "cron_notification_description": "",
                     "id": watcher.id,
                     "is_active": False,
+                    "http_cache": {},
                     "latest": {},
                     "log_level": logging.WARNING,
                     "name": mock.ANY,